@@ -3,19 +3,122 @@ Aplicación Flask para Métodos Numéricos
 Proyecto final de Análisis Numérico
 """
 
-from flask import Flask, render_template, request, jsonify
+import time
+
+INICIO_ARRANQUE = time.perf_counter()
+
+from flask import Flask, Response, render_template, request, jsonify, g
 import numpy as np
+import importlib
 import sys
 import os
+import threading
 
 # Agregar directorio de métodos al path
 sys.path.append(os.path.dirname(__file__))
 
-from metodos import capitulo1, capitulo2, capitulo3
+from cache_resultados import CacheResultados, clave_solicitud
+from trabajadores import Tarea, ejecutar_en_flujo, ejecutar_en_paralelo, ejecutar_supervisado
+from reduccion_puntos import (ANCHO_OBJETIVO_MAXIMO, ANCHO_OBJETIVO_POR_DEFECTO, METODOS_REDUCCION,
+                              reducir_puntos_grafica, reducir_serie)
+
+
+class ModuloPerezoso:
+    """
+    Módulo que se importa la primera vez que se usa uno de sus atributos
+
+    Los métodos numéricos (sobre todo el capítulo 1, que usa sympy) tardan en
+    importarse; así el servidor arranca sin esperarlos y cada proceso paga la
+    importación solo cuando recibe una solicitud de ese capítulo o al precalentar.
+    """
+
+    def __init__(self, nombre):
+        self._nombre = nombre
+        self._modulo = None
+        self._lock = threading.Lock()
+
+        # Igual que en capitulo1.CacheExpresiones: un hijo creado con fork mientras
+        # otro hilo importa el módulo heredaría el lock tomado
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(before=self._lock.acquire, after_in_parent=self._lock.release,
+                                after_in_child=self._lock.release)
+
+    def cargar(self):
+        """Importa el módulo (una sola vez, aunque lo pidan varios hilos a la vez)"""
+        if self._modulo is None:
+            with self._lock:
+                if self._modulo is None:
+                    self._modulo = importlib.import_module(self._nombre)
+        return self._modulo
+
+    @property
+    def cargado(self):
+        return self._modulo is not None
+
+    def __getattr__(self, atributo):
+        return getattr(self.cargar(), atributo)
+
+
+capitulo1 = ModuloPerezoso('metodos.capitulo1')
+capitulo2 = ModuloPerezoso('metodos.capitulo2')
+capitulo3 = ModuloPerezoso('metodos.capitulo3')
+directos = ModuloPerezoso('metodos.directos')
 
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
 
+# Tamaño máximo del cuerpo de una solicitud (alcanza para los sistemas dispersos más grandes)
+MAX_MB_SOLICITUD = float(os.environ.get('MAX_MB_SOLICITUD', 256))
+app.config['MAX_CONTENT_LENGTH'] = int(MAX_MB_SOLICITUD * 1024 * 1024)
+
+# Máximo de intervalos/valores iniciales aceptados por /api/capitulo1/batch
+MAX_CARRILES_LOTE = 100000
+
+# Máximo de puntos que se pueden pedir a /api/capitulo1/grafica
+MAX_PUNTOS_GRAFICA_CAP1 = 20000
+
+# Máximo de incógnitas aceptadas por /api/capitulo2/dispersa
+MAX_INCOGNITAS_DISPERSA = 2000000
+
+# Máximo de incógnitas aceptadas por /api/capitulo2/directo (la factorización densa es O(n^3))
+MAX_INCOGNITAS_DIRECTO = int(os.environ.get('MAX_INCOGNITAS_DIRECTO', 2000))
+
+# Caché de resultados de /api/capitulo* (CACHE_RESULTADOS_DIR activa la persistencia en disco)
+cache_resultados = CacheResultados(
+    max_entradas=int(os.environ.get('CACHE_RESULTADOS_MAX_ENTRADAS', 1024)),
+    ttl=float(os.environ.get('CACHE_RESULTADOS_TTL', 300)),
+    directorio=os.environ.get('CACHE_RESULTADOS_DIR') or None
+)
+
+# Endpoints cuya respuesta no se guarda en el caché: los que dependen del estado del
+# servidor (el caché de factorizaciones decide 'desde_cache' en /directo) o lo modifican
+RUTAS_SIN_CACHE = {
+    '/api/capitulo2/directo',
+    '/api/capitulo2/directo/cache/limpiar',
+}
+
+# Tiempo límite (segundos) de cada método dentro de un informe; el cliente puede pedir menos
+TIMEOUT_INFORME = float(os.environ.get('TIMEOUT_INFORME', 30))
+
+# Límites de los cálculos del capítulo 1 (corren en un proceso aislado porque f(x) la escribe el usuario)
+LIMITE_TIEMPO_CAP1 = float(os.environ.get('LIMITE_TIEMPO_CAP1', 10))
+LIMITE_MEMORIA_CAP1_MB = float(os.environ.get('LIMITE_MEMORIA_CAP1_MB', 512))
+
+# Una función f(x) se compila también en el servidor solo si en el proceso de prueba
+# tardó menos que esto (segundos): compilar en el servidor retiene el GIL y frena a
+# los demás hilos. Las más lentas se compilan en cada proceso hijo
+MAX_TIEMPO_COMPILAR_SERVIDOR = float(os.environ.get('MAX_TIEMPO_COMPILAR_SERVIDOR', 0.5))
+
+# Funciones (normalizadas) que ya se sabe que compilan lento: no se repite la prueba
+MAX_COMPILACIONES_LENTAS = 256
+compilaciones_lentas = set()
+MAX_NITER_CAP1 = int(os.environ.get('MAX_NITER_CAP1', 1000000))
+MAX_EVALUACIONES_CAP1 = int(os.environ.get('MAX_EVALUACIONES_CAP1', 100000000))
+
+# Respuestas en flujo (filas de la tabla a medida que se calculan): ?formato=ndjson|sse o encabezado Accept
+FORMATOS_FLUJO = {'ndjson': 'application/x-ndjson', 'sse': 'text/event-stream'}
+LIMITE_TIEMPO_FLUJO = float(os.environ.get('LIMITE_TIEMPO_FLUJO', 300))
+
 
 # ===== FUNCIONES AUXILIARES =====
 
@@ -77,6 +180,333 @@ def parsear_matriz(matriz_str, b_str):
         raise ValueError(f"Error al parsear matriz: {str(e)}")
 
 
+def validar_estimador_radio(data):
+    """
+    Lee el campo opcional 'estimador' (cómo obtener el radio espectral en capítulo 2)
+
+    Retorna: tuple (estimador, error) - error es None si el valor es válido
+    """
+    estimador = str(data.get('estimador') or 'auto').strip().lower().replace('-', '_')
+    if estimador not in capitulo2.ESTIMADORES_RADIO:
+        return None, f"[ERROR] Estimador de radio espectral no válido. Opciones: {', '.join(capitulo2.ESTIMADORES_RADIO)}"
+    return estimador, None
+
+
+def validar_kernel(data):
+    """
+    Lee el campo opcional 'kernel' de Gauss-Seidel y SOR ('matricial',
+    'por_filas' o 'rojo_negro'; ver capitulo2.KERNELS_BARRIDO)
+
+    Retorna: tuple (kernel, error) - error es None si el valor es válido
+    """
+    kernel = str(data.get('kernel') or 'matricial').strip().lower().replace('-', '_')
+    if kernel not in capitulo2.KERNELS_BARRIDO:
+        return None, f"[ERROR] Kernel no válido. Opciones: {', '.join(capitulo2.KERNELS_BARRIDO)}"
+    return kernel, None
+
+
+def validar_w_sor(valor):
+    """
+    Valida el factor de relajación de SOR: un número con 0 < w < 2, o
+    'auto'/'adaptativo' para que capitulo2.sor lo elija
+
+    Retorna: tuple (w, error) - error es None si el valor es válido
+    """
+    if isinstance(valor, str) and valor.strip().lower() in capitulo2.MODOS_W_AUTOMATICO:
+        return valor.strip().lower(), None
+    try:
+        w = float(valor)
+    except (ValueError, TypeError):
+        return None, (f"[ERROR] El factor de relajación w debe ser un número válido o "
+                      f"{' / '.join(capitulo2.MODOS_W_AUTOMATICO)}")
+    if w <= 0 or w >= 2:
+        return None, "[ERROR] El factor de relajación w debe estar entre 0 y 2 (0 < w < 2)"
+    return w, None
+
+
+def validar_krylov(data):
+    """
+    Lee los campos opcionales de los métodos de Krylov: 'precondicionador'
+    ('ninguno', 'jacobi' o 'ssor') y 'reinicio' (pasos de GMRES entre reinicios)
+
+    Retorna: tuple (precondicionador, reinicio, error) - error es None si los valores son válidos
+    """
+    precondicionador = str(data.get('precondicionador') or 'jacobi').strip().lower()
+    if precondicionador not in capitulo2.PRECONDICIONADORES:
+        return None, None, f"[ERROR] Precondicionador no válido. Opciones: {', '.join(capitulo2.PRECONDICIONADORES)}"
+
+    try:
+        reinicio = data.get('reinicio')
+        reinicio = int(reinicio) if reinicio not in (None, '') else capitulo2.REINICIO_GMRES
+    except (ValueError, TypeError):
+        return None, None, "[ERROR] reinicio debe ser un número entero positivo"
+    if reinicio < 1:
+        return None, None, "[ERROR] reinicio debe ser un número entero positivo"
+    return precondicionador, reinicio, None
+
+
+def validar_reduccion(data):
+    """
+    Lee los campos opcionales de reducción de puntos de las gráficas:
+    'ancho_objetivo' (ancho de la gráfica en píxeles) y 'reduccion' ('lttb' o 'minmax')
+
+    Retorna: tuple (ancho_objetivo, metodo, error) - error es None si los valores son válidos
+    """
+    try:
+        ancho = int(data.get('ancho_objetivo') or ANCHO_OBJETIVO_POR_DEFECTO)
+    except (ValueError, TypeError):
+        return None, None, "[ERROR] ancho_objetivo debe ser un número entero (píxeles).\n💡 Ejemplo: 800"
+    if ancho < 10 or ancho > ANCHO_OBJETIVO_MAXIMO:
+        return None, None, f"[ERROR] ancho_objetivo debe estar entre 10 y {ANCHO_OBJETIVO_MAXIMO}."
+
+    metodo = str(data.get('reduccion') or 'lttb').strip().lower()
+    if metodo not in METODOS_REDUCCION:
+        return None, None, f"[ERROR] Método de reducción no válido. Opciones: {', '.join(METODOS_REDUCCION)}"
+    return ancho, metodo, None
+
+
+def validar_historial(data):
+    """
+    Lee los campos opcionales de la tabla de iteraciones del capítulo 2:
+    'cada_k' (guardar una de cada k iteraciones), 'ultimos_n' (guardar solo
+    las últimas n) y 'formato_tabla' ('filas', 'columnas' o 'base64')
+
+    Retorna: tuple (historial, error) - error es None si los valores son válidos
+    """
+    try:
+        cada_k = data.get('cada_k')
+        cada_k = int(cada_k) if cada_k not in (None, '') else 1
+        ultimos_n = data.get('ultimos_n')
+        ultimos_n = int(ultimos_n) if ultimos_n not in (None, '') else None
+    except (ValueError, TypeError):
+        return None, "[ERROR] cada_k y ultimos_n deben ser números enteros.\n💡 Ejemplo: cada_k = 10, ultimos_n = 50"
+
+    formato = str(data.get('formato_tabla') or 'filas').strip().lower()
+    try:
+        return capitulo2.HistorialIteraciones(cada_k, ultimos_n, formato), None
+    except ValueError as e:
+        return None, f"[ERROR] {e}"
+
+
+def precompilar_cap1(expresiones):
+    """
+    Compila en el servidor las funciones f(x) de una solicitud del capítulo 1
+
+    Así quedan en capitulo1.cache_expresiones para las siguientes solicitudes
+    y los procesos hijos (creados con fork) heredan las funciones ya compiladas
+    en lugar de volver a compilarlas. Como el texto lo escribe el usuario, una
+    función que todavía no está en el caché se compila primero en un proceso
+    supervisado con los límites del capítulo 1, y solo si termina bien en menos
+    de MAX_TIEMPO_COMPILAR_SERVIDOR segundos se compila en el servidor (si tarda
+    más, la compilan los procesos de los métodos). Si falla por otra causa
+    (p. ej. sintaxis) no se compila: el método la reporta con su mensaje habitual.
+
+    Parámetros:
+    expresiones: Lista de (funcion_str, derivadas) con las derivadas que usa el método
+
+    Retorna: tuple (resultado, estado_http) si se superó un límite, o None
+    """
+    for funcion, derivadas in expresiones:
+        if capitulo1.cache_expresiones.contiene(funcion, derivadas):
+            capitulo1.precompilar(funcion, derivadas)  # Cuenta el acierto y la marca como usada
+            continue
+
+        clave = (capitulo1.normalizar_expresion(funcion), derivadas)
+        if clave in compilaciones_lentas:
+            continue
+
+        ejecucion = ejecutar_supervisado(capitulo1.precompilar, (funcion, derivadas), timeout=LIMITE_TIEMPO_CAP1,
+                                         memoria_mb=LIMITE_MEMORIA_CAP1_MB)
+        if ejecucion['timeout'] or ejecucion['memoria']:
+            return resultado_supervisado(ejecucion, LIMITE_TIEMPO_CAP1, LIMITE_MEMORIA_CAP1_MB)
+        if ejecucion['exito'] and ejecucion['tiempo'] >= MAX_TIEMPO_COMPILAR_SERVIDOR:
+            if len(compilaciones_lentas) >= MAX_COMPILACIONES_LENTAS:
+                compilaciones_lentas.clear()
+            compilaciones_lentas.add(clave)
+        elif ejecucion['exito']:
+            try:
+                capitulo1.precompilar(funcion, derivadas)
+            except Exception:
+                pass
+    return None
+
+
+def resolver_cap1(metodo, *args, expresiones=(), **kwargs):
+    """
+    Ejecuta un método del capítulo 1 en un proceso supervisado
+
+    El proceso se termina si supera LIMITE_TIEMPO_CAP1 segundos o intenta usar
+    más de LIMITE_MEMORIA_CAP1_MB de memoria adicional, de modo que una función
+    patológica (exponentes enormes, anidamiento profundo) no bloquea al servidor.
+    'expresiones' son las funciones (y derivadas) que usa el método: se compilan
+    antes en el servidor (ver precompilar_cap1).
+
+    Retorna: tuple (resultado, estado_http)
+    """
+    limite_superado = precompilar_cap1(expresiones)
+    if limite_superado is not None:
+        return limite_superado
+
+    ejecucion = ejecutar_supervisado(metodo, args, kwargs, timeout=LIMITE_TIEMPO_CAP1,
+                                     memoria_mb=LIMITE_MEMORIA_CAP1_MB)
+    return resultado_supervisado(ejecucion, LIMITE_TIEMPO_CAP1, LIMITE_MEMORIA_CAP1_MB)
+
+
+def resultado_supervisado(ejecucion, limite_tiempo, limite_memoria_mb=None):
+    """
+    Convierte el resultado de un proceso supervisado en la respuesta del endpoint
+
+    Retorna: tuple (resultado, estado_http)
+    """
+    if ejecucion['exito']:
+        return ejecucion['resultado'], 200
+
+    if ejecucion['timeout']:
+        return {"exito": False, "mensaje": f"[ERROR] El cálculo superó el tiempo límite de {limite_tiempo:g} s.\n💡 Simplifica la función o reduce el número de iteraciones."}, 408
+
+    if ejecucion['memoria']:
+        return {"exito": False, "mensaje": f"[ERROR] El cálculo superó el límite de memoria de {limite_memoria_mb:g} MB.\n💡 Simplifica la función o reduce el tamaño del problema."}, 413
+
+    return {"exito": False, "mensaje": f"[ERROR] Error inesperado: {ejecucion['error']}"}, 400
+
+
+def formato_flujo():
+    """Formato de flujo pedido por el cliente ('ndjson' o 'sse'), o None para la respuesta JSON completa"""
+    formato = request.args.get('formato')
+    if formato in FORMATOS_FLUJO:
+        return formato
+
+    aceptados = request.headers.get('Accept', '')
+    for formato, tipo_contenido in FORMATOS_FLUJO.items():
+        if tipo_contenido in aceptados:
+            return formato
+    return None
+
+
+def respuesta_flujo(formato, metodo, args=(), kwargs=None, memoria_mb=None):
+    """
+    Respuesta que envía las filas de la tabla de iteraciones a medida que se calculan
+
+    El método corre en un proceso aislado con parámetro 'emitir'; las filas no
+    se acumulan en el servidor. Cada evento es {"tipo": "fila", "fila": ...} y
+    el último es {"tipo": "resultado", "resultado": ...} con el dict final del
+    método (sin la tabla). En NDJSON va un evento por línea; en SSE el tipo se
+    envía como nombre del evento.
+    """
+    def serializar(tipo, valor):
+        if formato == 'sse':
+            return f"event: {tipo}\ndata: {app.json.dumps(valor)}\n\n"
+        return app.json.dumps({"tipo": tipo, tipo: valor}) + "\n"
+
+    def generar():
+        for tipo, valor in ejecutar_en_flujo(metodo, args, kwargs, timeout=LIMITE_TIEMPO_FLUJO,
+                                             memoria_mb=memoria_mb):
+            if tipo == 'parcial':
+                yield serializar('fila', valor)
+            else:
+                resultado, _ = resultado_supervisado(valor, LIMITE_TIEMPO_FLUJO, memoria_mb)
+                resultado.pop('tabla', None)  # Sus filas ya se enviaron
+                yield serializar('resultado', resultado)
+
+    respuesta = Response(generar(), mimetype=FORMATOS_FLUJO[formato])
+    respuesta.headers['Cache-Control'] = 'no-cache'
+    respuesta.headers['X-Accel-Buffering'] = 'no'  # Que un proxy (nginx) no retenga las filas
+    return respuesta
+
+
+def responder_cap1(metodo, *args, expresiones=(), **kwargs):
+    """Respuesta de un método del capítulo 1: JSON completo o, si el cliente lo pide, en flujo"""
+    formato = formato_flujo()
+    if formato:
+        limite_superado = precompilar_cap1(expresiones)
+        if limite_superado is not None:
+            return jsonify(limite_superado[0]), limite_superado[1]
+        return respuesta_flujo(formato, metodo, args, kwargs, LIMITE_MEMORIA_CAP1_MB)
+
+    resultado, estado = resolver_cap1(metodo, *args, expresiones=expresiones, **kwargs)
+    return jsonify(resultado), estado
+
+
+def validar_presupuesto_cap1(niter, carriles=1):
+    """
+    Verifica que niter (por cada intervalo o valor inicial) quepa en el presupuesto del capítulo 1
+
+    Retorna: mensaje de error o None
+    """
+    if niter > MAX_NITER_CAP1:
+        return f"[ERROR] El número de iteraciones no puede superar {MAX_NITER_CAP1}.\n💡 Ejemplo: 100"
+    if niter * carriles > MAX_EVALUACIONES_CAP1:
+        return f"[ERROR] El producto iteraciones x intervalos no puede superar {MAX_EVALUACIONES_CAP1}.\n💡 Reduce niter o la cantidad de intervalos."
+    return None
+
+
+def timeout_informe(data):
+    """Tiempo límite por método de un informe: el campo 'timeout' (si es válido) acotado por TIMEOUT_INFORME"""
+    try:
+        timeout = float(data.get('timeout') or TIMEOUT_INFORME)
+    except (TypeError, ValueError):
+        return TIMEOUT_INFORME
+    return min(timeout, TIMEOUT_INFORME) if timeout > 0 else TIMEOUT_INFORME
+
+
+# ===== CACHÉ DE RESULTADOS =====
+
+@app.before_request
+def consultar_cache_resultados():
+    """Responde desde el caché si ya se calculó un POST idéntico a /api/capitulo*"""
+    g.clave_cache = None
+
+    if (request.method != 'POST' or not request.path.startswith('/api/capitulo')
+            or request.path in RUTAS_SIN_CACHE or formato_flujo()
+            or 'no-cache' in request.headers.get('Cache-Control', '')):
+        return None
+
+    if request.is_json:
+        g.clave_cache = clave_solicitud(request.path, request.get_json(silent=True), request.get_data())
+    elif request.files:
+        # Multipart: el separador cambia en cada envío, así que se usan los campos y el contenido de los archivos
+        archivos = {}
+        for nombre, archivo in request.files.items():
+            archivos[nombre] = archivo.read().decode('latin-1')
+            archivo.seek(0)
+        g.clave_cache = clave_solicitud(request.path, {"form": request.form.to_dict(flat=False), "archivos": archivos})
+    else:
+        g.clave_cache = clave_solicitud(request.path, None, request.get_data())
+
+    guardado = cache_resultados.obtener(g.clave_cache)
+    if guardado is None:
+        return None
+
+    estado, cuerpo, tipo_contenido = guardado
+    g.clave_cache = None
+    respuesta = app.response_class(cuerpo, status=estado, content_type=tipo_contenido)
+    respuesta.headers['X-Cache'] = 'HIT'
+    return respuesta
+
+
+@app.after_request
+def guardar_cache_resultados(respuesta):
+    """Guarda las respuestas exitosas (200) de los POST a /api/capitulo*"""
+    clave = g.get('clave_cache')
+    if clave and respuesta.status_code == 200 and not respuesta.is_streamed:
+        cache_resultados.guardar(clave, respuesta.status_code, respuesta.get_data(), respuesta.content_type)
+        respuesta.headers['X-Cache'] = 'MISS'
+    return respuesta
+
+
+@app.route('/api/cache-resultados', methods=['GET'])
+def api_cache_resultados():
+    """Estadísticas del caché de resultados (aciertos, fallos, desalojos, memoria)"""
+    return jsonify({"exito": True, "cache": cache_resultados.estadisticas()})
+
+
+@app.route('/api/cache-resultados/limpiar', methods=['POST'])
+def api_limpiar_cache_resultados():
+    """Vacía el caché de resultados"""
+    cache_resultados.limpiar()
+    return jsonify({"exito": True, "mensaje": "Caché de resultados vaciado"})
+
+
 # ===== RUTAS PRINCIPALES =====
 
 @app.route('/')
@@ -138,12 +568,16 @@ def api_biseccion():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
 
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
         if xi == xs:
             return jsonify({"exito": False, "mensaje": "[ERROR] Los valores xi y xs deben ser diferentes.\n💡 Necesitas un intervalo [xi, xs] válido."}), 400
 
         tol_str = str(data['tol'])  # Mantener string original
-        resultado = capitulo1.biseccion(xi, xs, tol, niter, data['funcion'], tol_str)
-        return jsonify(resultado)
+        return responder_cap1(capitulo1.biseccion, xi, xs, tol, niter, data['funcion'], tol_str,
+                              expresiones=[(data['funcion'], 0)])
     except Exception as e:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
 
@@ -175,12 +609,62 @@ def api_regla_falsa():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
 
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
         if xi == xs:
             return jsonify({"exito": False, "mensaje": "[ERROR] Los valores xi y xs deben ser diferentes.\n💡 Necesitas un intervalo [xi, xs] válido."}), 400
 
         tol_str = str(data['tol'])
-        resultado = capitulo1.regla_falsa(xi, xs, tol, niter, data['funcion'], tol_str)
-        return jsonify(resultado)
+        return responder_cap1(capitulo1.regla_falsa, xi, xs, tol, niter, data['funcion'], tol_str,
+                              expresiones=[(data['funcion'], 0)])
+    except Exception as e:
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
+
+
+@app.route('/api/capitulo1/brent', methods=['POST'])
+def api_brent():
+    try:
+        data = request.json
+
+        # Validar campos requeridos
+        required_fields = ['xi', 'xs', 'tol', 'niter', 'funcion']
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(missing_fields)}"}), 400
+
+        # Validar tipos
+        try:
+            xi = float(data['xi'])
+            xs = float(data['xs'])
+            tol = float(data['tol'])
+            niter = int(data['niter'])
+        except (ValueError, TypeError):
+            return jsonify({"exito": False, "mensaje": "[ERROR] Los valores numéricos no son válidos.\n💡 Asegúrate de que xi, xs, tol y niter sean números."}), 400
+
+        variante = data.get('variante', 'brent')
+        if variante not in ('brent', 'illinois'):
+            return jsonify({"exito": False, "mensaje": "[ERROR] La variante debe ser 'brent' o 'illinois'."}), 400
+
+        # Validar rangos
+        if tol <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia debe ser un número positivo.\n💡 Ejemplo: 1e-5"}), 400
+
+        if niter <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
+
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        if xi == xs:
+            return jsonify({"exito": False, "mensaje": "[ERROR] Los valores xi y xs deben ser diferentes.\n💡 Necesitas un intervalo [xi, xs] válido."}), 400
+
+        tol_str = str(data['tol'])
+        metodo = capitulo1.regla_falsa_illinois if variante == 'illinois' else capitulo1.brent
+        return responder_cap1(metodo, xi, xs, tol, niter, data['funcion'], tol_str,
+                              expresiones=[(data['funcion'], 0)])
     except Exception as e:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
 
@@ -189,14 +673,20 @@ def api_regla_falsa():
 def api_punto_fijo():
     try:
         data = request.json
-        resultado = capitulo1.punto_fijo(
+        niter = int(data['niter'])
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        return responder_cap1(
+            capitulo1.punto_fijo,
             data['funcion_g'],
             float(data['x0']),
             float(data['tol']),
-            int(data['niter']),
-            data['funcion_f']
+            niter,
+            data['funcion_f'],
+            expresiones=[(data['funcion_g'], 0), (data['funcion_f'], 0)]
         )
-        return jsonify(resultado)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
 
@@ -227,8 +717,12 @@ def api_newton():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
 
-        resultado = capitulo1.newton_raphson(x0, tol, niter, data['funcion'])
-        return jsonify(resultado)
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        return responder_cap1(capitulo1.newton_raphson, x0, tol, niter, data['funcion'],
+                              expresiones=[(data['funcion'], 1)])
     except Exception as e:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
 
@@ -260,12 +754,16 @@ def api_secante():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
 
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
         if x0 == x1:
             return jsonify({"exito": False, "mensaje": "[ERROR] Los valores x0 y x1 deben ser diferentes.\n💡 Necesitas dos puntos iniciales distintos."}), 400
 
         tol_str = str(data['tol'])
-        resultado = capitulo1.secante(x0, x1, tol, niter, data['funcion'], tol_str)
-        return jsonify(resultado)
+        return responder_cap1(capitulo1.secante, x0, x1, tol, niter, data['funcion'], tol_str,
+                              expresiones=[(data['funcion'], 0)])
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
 
@@ -298,6 +796,10 @@ def api_raices_multiples():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
 
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
         if metodo not in [1, 2]:
             return jsonify({"exito": False, "mensaje": "[ERROR] El método debe ser 1 (con multiplicidad) o 2 (con segunda derivada)."}), 400
 
@@ -305,8 +807,8 @@ def api_raices_multiples():
             return jsonify({"exito": False, "mensaje": "[ERROR] Para el método 1 debes especificar la multiplicidad.\n💡 Ejemplo: 2 para raíz doble, 3 para raíz triple."}), 400
 
         tol_str = str(data['tol'])
-        resultado = capitulo1.raices_multiples(x0, tol, niter, data['funcion'], metodo, multiplicidad, tol_str)
-        return jsonify(resultado)
+        return responder_cap1(capitulo1.raices_multiples, x0, tol, niter, data['funcion'], metodo, multiplicidad, tol_str,
+                              expresiones=[(data['funcion'], 2)])
     except Exception as e:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
 
@@ -317,16 +819,35 @@ def api_grafica_cap1():
         data = request.json
         raiz = data.get('raiz', None)
 
-        x_vals, y_vals = capitulo1.generar_puntos_grafica(
+        try:
+            num_puntos = int(data.get('num_puntos', 500))
+        except (ValueError, TypeError):
+            return jsonify({"exito": False, "mensaje": "[ERROR] num_puntos debe ser un número entero."}), 400
+        if num_puntos < 10 or num_puntos > MAX_PUNTOS_GRAFICA_CAP1:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] num_puntos debe estar entre 10 y {MAX_PUNTOS_GRAFICA_CAP1}."}), 400
+
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        puntos, estado = resolver_cap1(
+            capitulo1.generar_puntos_grafica,
             data['funcion'],
             x_min=data.get('x_min', None),
             x_max=data.get('x_max', None),
-            raiz=raiz
+            raiz=raiz,
+            num_puntos=num_puntos,
+            adaptativo=bool(data.get('adaptativo', False)),
+            expresiones=[(data['funcion'], 0)]
         )
+        if estado != 200:
+            return jsonify(puntos), estado
+        x_vals, y_vals = puntos
 
         if x_vals is None:
             return jsonify({"exito": False, "mensaje": "Error al generar gráfica"}), 400
 
+        x_vals, y_vals = reducir_serie(x_vals, y_vals, ancho, reduccion)
         return jsonify({
             "exito": True,
             "x": x_vals,
@@ -336,6 +857,129 @@ def api_grafica_cap1():
         return jsonify({"exito": False, "mensaje": str(e)}), 400
 
 
+@app.route('/api/capitulo1/batch', methods=['POST'])
+def api_batch_cap1():
+    """Resuelve una misma f(x) para muchos intervalos o valores iniciales a la vez"""
+    try:
+        data = request.json
+
+        if not data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] No se recibieron datos"}), 400
+
+        metodo = data.get('metodo', 'biseccion')
+        campos_por_metodo = {
+            'biseccion': ['xi', 'xs'],
+            'regla-falsa': ['xi', 'xs'],
+            'newton': ['x0'],
+            'secante': ['x0', 'x1']
+        }
+        if metodo not in campos_por_metodo:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Método no válido para lotes. Opciones: {', '.join(campos_por_metodo)}"}), 400
+
+        # Validar campos requeridos
+        required_fields = ['tol', 'niter', 'funcion'] + campos_por_metodo[metodo]
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(missing_fields)}"}), 400
+
+        # Validar tipos
+        try:
+            tol = float(data['tol'])
+            niter = int(data['niter'])
+            arreglos = {campo: np.atleast_1d(np.asarray(data[campo], dtype=float)) for campo in campos_por_metodo[metodo]}
+        except (ValueError, TypeError):
+            return jsonify({"exito": False, "mensaje": "[ERROR] Los valores numéricos no son válidos.\n💡 Los valores iniciales deben ser listas de números."}), 400
+
+        # Validar rangos
+        if tol <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia debe ser un número positivo.\n💡 Ejemplo: 1e-5"}), 400
+
+        if niter <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
+
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        tamanos = {arr.size for arr in arreglos.values()} - {1}
+        if len(tamanos) > 1:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Las listas de {', '.join(arreglos)} deben tener la misma longitud."}), 400
+
+        if max(arr.size for arr in arreglos.values()) > MAX_CARRILES_LOTE:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Máximo {MAX_CARRILES_LOTE} intervalos por solicitud."}), 400
+
+        error = validar_presupuesto_cap1(niter, max(arr.size for arr in arreglos.values()))
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        tol_str = str(data['tol'])
+        resultado, estado = resolver_cap1(capitulo1.resolver_lote, metodo, data['funcion'], tol, niter, tol_str=tol_str,
+                                         expresiones=[(data['funcion'], 1 if metodo == 'newton' else 0)], **arreglos)
+        return jsonify(resultado), estado
+    except Exception as e:
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
+
+
+@app.route('/api/capitulo1/buscar-raices', methods=['POST'])
+def api_buscar_raices():
+    """Detecta los intervalos con cambio de signo en un rango y resuelve todas las raíces"""
+    try:
+        data = request.json
+
+        if not data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] No se recibieron datos"}), 400
+
+        # Validar campos requeridos
+        required_fields = ['x_min', 'x_max', 'tol', 'niter', 'funcion']
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(missing_fields)}"}), 400
+
+        # Validar tipos
+        try:
+            x_min = float(data['x_min'])
+            x_max = float(data['x_max'])
+            tol = float(data['tol'])
+            niter = int(data['niter'])
+            num_puntos = int(data.get('num_puntos', 1000))
+        except (ValueError, TypeError):
+            return jsonify({"exito": False, "mensaje": "[ERROR] Los valores numéricos no son válidos.\n💡 Asegúrate de que x_min, x_max, tol, niter y num_puntos sean números."}), 400
+
+        metodo = data.get('metodo', 'biseccion')
+        if metodo not in ('biseccion', 'regla-falsa'):
+            return jsonify({"exito": False, "mensaje": "[ERROR] El método debe ser 'biseccion' o 'regla-falsa'."}), 400
+
+        # Validar rangos
+        if tol <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia debe ser un número positivo.\n💡 Ejemplo: 1e-5"}), 400
+
+        if niter <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser positivo.\n💡 Ejemplo: 100"}), 400
+
+        if x_min >= x_max:
+            return jsonify({"exito": False, "mensaje": "[ERROR] x_min debe ser menor que x_max.\n💡 Ejemplo: x_min = -10, x_max = 10"}), 400
+
+        if num_puntos < 3 or num_puntos > MAX_CARRILES_LOTE:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] El número de puntos de la malla debe estar entre 3 y {MAX_CARRILES_LOTE}."}), 400
+
+        error = validar_presupuesto_cap1(niter, num_puntos)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        tol_str = str(data['tol'])
+        resultado, estado = resolver_cap1(capitulo1.buscar_todas_raices, data['funcion'], x_min, x_max, tol, niter, metodo, num_puntos,
+                                         tol_str, expresiones=[(data['funcion'], 0)])
+        return jsonify(resultado), estado
+    except Exception as e:
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 400
+
+
+@app.route('/api/capitulo1/cache', methods=['GET'])
+def api_cache_cap1():
+    """Estadísticas del caché de expresiones compiladas (aciertos, fallos, memoria)"""
+    return jsonify({"exito": True, "cache": capitulo1.estadisticas_cache()})
+
+
 @app.route('/api/capitulo1/comparar', methods=['POST'])
 def api_comparar_cap1():
     """Compara todos los métodos del capítulo 1 con los mismos parámetros"""
@@ -349,23 +993,33 @@ def api_comparar_cap1():
         tol_str = str(data['tol'])  # Mantener string original
         niter = int(data['niter'])
 
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
         resultados = {}
 
+        # Compilar f, f' (Newton) y g una sola vez para los cinco métodos
+        expresiones = [(funcion, 1)] + ([(data['funcion_g'], 0)] if 'funcion_g' in data else [])
+        limite_superado = precompilar_cap1(expresiones)
+        if limite_superado is not None:
+            return jsonify(limite_superado[0]), limite_superado[1]
+
         # Bisección
-        resultados['biseccion'] = capitulo1.biseccion(xi, xs, tol, niter, funcion, tol_str)
+        resultados['biseccion'], _ = resolver_cap1(capitulo1.biseccion, xi, xs, tol, niter, funcion, tol_str)
 
         # Regla falsa
-        resultados['regla_falsa'] = capitulo1.regla_falsa(xi, xs, tol, niter, funcion, tol_str)
+        resultados['regla_falsa'], _ = resolver_cap1(capitulo1.regla_falsa, xi, xs, tol, niter, funcion, tol_str)
 
         # Newton-Raphson
-        resultados['newton'] = capitulo1.newton_raphson(x0, tol, niter, funcion)
+        resultados['newton'], _ = resolver_cap1(capitulo1.newton_raphson, x0, tol, niter, funcion)
 
         # Secante
-        resultados['secante'] = capitulo1.secante(xi, xs, tol, niter, funcion, tol_str)
+        resultados['secante'], _ = resolver_cap1(capitulo1.secante, xi, xs, tol, niter, funcion, tol_str)
 
         # Punto fijo (requiere función g, usar solo si se proporciona)
         if 'funcion_g' in data:
-            resultados['punto_fijo'] = capitulo1.punto_fijo(x0, tol, niter, funcion, data['funcion_g'])
+            resultados['punto_fijo'], _ = resolver_cap1(capitulo1.punto_fijo, x0, tol, niter, funcion, data['funcion_g'])
 
         # Análisis comparativo
         metodos_exitosos = []
@@ -383,20 +1037,81 @@ def api_comparar_cap1():
 
         mejor_metodo = metodos_exitosos[0]['nombre'] if metodos_exitosos else "Ninguno"
 
-        return jsonify({
-            "exito": True,
-            "resultados": resultados,
-            "mejor_metodo": mejor_metodo,
-            "metodos_exitosos": metodos_exitosos
-        })
+        return jsonify({
+            "exito": True,
+            "resultados": resultados,
+            "mejor_metodo": mejor_metodo,
+            "metodos_exitosos": metodos_exitosos
+        })
+    except Exception as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+
+
+# ===== API ENDPOINTS - CAPÍTULO 2 =====
+
+@app.route('/api/capitulo2/jacobi', methods=['POST'])
+def api_jacobi():
+    try:
+        data = request.json
+
+        # Validar que se recibió JSON
+        if not data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] No se recibieron datos"}), 400
+
+        # Validar campos obligatorios
+        if 'matriz' not in data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'matriz'"}), 400
+        if 'vector_b' not in data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'vector_b'"}), 400
+        if 'tol' not in data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'tol' (tolerancia)"}), 400
+        if 'niter' not in data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'niter' (iteraciones)"}), 400
+
+        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'], permitir_bloque=True)
+
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        x0 = parsear_vector_x0(data.get('x0', ''), len(A))
+
+        # Validar tolerancia y niter
+        try:
+            tol = float(data['tol'])
+            niter = int(data['niter'])
+        except ValueError:
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia y el número de iteraciones deben ser números válidos"}), 400
+
+        if tol <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia debe ser mayor que 0"}), 400
+
+        if niter <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser mayor que 0"}), 400
+
+        estimador, error = validar_estimador_radio(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        formato = formato_flujo()
+        if formato:
+            if b.ndim == 2:
+                return jsonify({"exito": False, "mensaje": "[ERROR] Las respuestas en flujo no están disponibles con varios lados derechos"}), 400
+            return respuesta_flujo(formato, capitulo2.jacobi, (A, b, x0, tol, niter, estimador))
+
+        historial, error = validar_historial(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = capitulo2.jacobi(A, b, x0, tol, niter, estimador, historial=historial)
+        return jsonify(resultado)
+    except KeyError as ke:
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Falta el campo obligatorio: {str(ke)}"}), 400
     except Exception as e:
-        return jsonify({"exito": False, "mensaje": str(e)}), 400
-
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 500
 
-# ===== API ENDPOINTS - CAPÍTULO 2 =====
 
-@app.route('/api/capitulo2/jacobi', methods=['POST'])
-def api_jacobi():
+@app.route('/api/capitulo2/gauss-seidel', methods=['POST'])
+def api_gauss_seidel():
     try:
         data = request.json
 
@@ -414,7 +1129,7 @@ def api_jacobi():
         if 'niter' not in data:
             return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'niter' (iteraciones)"}), 400
 
-        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'])
+        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'], permitir_bloque=True)
 
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
@@ -434,7 +1149,26 @@ def api_jacobi():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser mayor que 0"}), 400
 
-        resultado = capitulo2.jacobi(A, b, x0, tol, niter)
+        estimador, error = validar_estimador_radio(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        kernel, error = validar_kernel(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        formato = formato_flujo()
+        if formato:
+            if b.ndim == 2:
+                return jsonify({"exito": False, "mensaje": "[ERROR] Las respuestas en flujo no están disponibles con varios lados derechos"}), 400
+            return respuesta_flujo(formato, capitulo2.gauss_seidel, (A, b, x0, tol, niter, estimador),
+                                   {'kernel': kernel})
+
+        historial, error = validar_historial(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = capitulo2.gauss_seidel(A, b, x0, tol, niter, estimador, historial=historial, kernel=kernel)
         return jsonify(resultado)
     except KeyError as ke:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Falta el campo obligatorio: {str(ke)}"}), 400
@@ -442,8 +1176,8 @@ def api_jacobi():
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 500
 
 
-@app.route('/api/capitulo2/gauss-seidel', methods=['POST'])
-def api_gauss_seidel():
+@app.route('/api/capitulo2/sor', methods=['POST'])
+def api_sor():
     try:
         data = request.json
 
@@ -460,8 +1194,10 @@ def api_gauss_seidel():
             return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'tol' (tolerancia)"}), 400
         if 'niter' not in data:
             return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'niter' (iteraciones)"}), 400
+        if 'w' not in data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'w' (factor de relajación)"}), 400
 
-        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'])
+        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'], permitir_bloque=True)
 
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
@@ -481,7 +1217,30 @@ def api_gauss_seidel():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser mayor que 0"}), 400
 
-        resultado = capitulo2.gauss_seidel(A, b, x0, tol, niter)
+        # w: número entre 0 y 2, o 'auto'/'adaptativo'
+        w, error = validar_w_sor(data['w'])
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        estimador, error = validar_estimador_radio(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        kernel, error = validar_kernel(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        formato = formato_flujo()
+        if formato:
+            if b.ndim == 2:
+                return jsonify({"exito": False, "mensaje": "[ERROR] Las respuestas en flujo no están disponibles con varios lados derechos"}), 400
+            return respuesta_flujo(formato, capitulo2.sor, (A, b, x0, tol, niter, w, estimador), {'kernel': kernel})
+
+        historial, error = validar_historial(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = capitulo2.sor(A, b, x0, tol, niter, w, estimador, historial=historial, kernel=kernel)
         return jsonify(resultado)
     except KeyError as ke:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Falta el campo obligatorio: {str(ke)}"}), 400
@@ -489,8 +1248,9 @@ def api_gauss_seidel():
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 500
 
 
-@app.route('/api/capitulo2/sor', methods=['POST'])
-def api_sor():
+@app.route('/api/capitulo2/krylov', methods=['POST'])
+def api_krylov():
+    """Gradiente conjugado, BiCGSTAB o GMRES reiniciado, con precondicionador Jacobi o SSOR"""
     try:
         data = request.json
 
@@ -499,30 +1259,26 @@ def api_sor():
             return jsonify({"exito": False, "mensaje": "[ERROR] No se recibieron datos"}), 400
 
         # Validar campos obligatorios
-        if 'matriz' not in data:
-            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'matriz'"}), 400
-        if 'vector_b' not in data:
-            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'vector_b'"}), 400
-        if 'tol' not in data:
-            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'tol' (tolerancia)"}), 400
-        if 'niter' not in data:
-            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'niter' (iteraciones)"}), 400
-        if 'w' not in data:
-            return jsonify({"exito": False, "mensaje": "[ERROR] Falta el campo 'w' (factor de relajación)"}), 400
+        faltantes = [campo for campo in ('matriz', 'vector_b', 'tol', 'niter') if campo not in data]
+        if faltantes:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(faltantes)}"}), 400
 
-        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'])
+        metodo = str(data.get('metodo') or 'cg').strip().lower()
+        if metodo not in capitulo2.METODOS_KRYLOV:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Método no válido. Opciones: {', '.join(capitulo2.METODOS_KRYLOV)}"}), 400
 
+        A, b, error = capitulo2.validar_matriz(data['matriz'], data['vector_b'])
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
         x0 = parsear_vector_x0(data.get('x0', ''), len(A))
 
-        # Validar tolerancia, niter y w
+        # Validar tolerancia, niter y w (w solo lo usa el precondicionador SSOR)
         try:
             tol = float(data['tol'])
             niter = int(data['niter'])
-            w = float(data['w'])
-        except ValueError:
+            w = float(data.get('w', 1.0))
+        except (ValueError, TypeError):
             return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia, iteraciones y factor w deben ser números válidos"}), 400
 
         if tol <= 0:
@@ -534,10 +1290,21 @@ def api_sor():
         if w <= 0 or w >= 2:
             return jsonify({"exito": False, "mensaje": "[ERROR] El factor de relajación w debe estar entre 0 y 2 (0 < w < 2)"}), 400
 
-        resultado = capitulo2.sor(A, b, x0, tol, niter, w)
+        precondicionador, reinicio, error = validar_krylov(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        argumentos = (A, b, x0, tol, niter, metodo, precondicionador, w, reinicio)
+        formato = formato_flujo()
+        if formato:
+            return respuesta_flujo(formato, capitulo2.krylov, argumentos)
+
+        historial, error = validar_historial(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = capitulo2.krylov(*argumentos, historial=historial)
         return jsonify(resultado)
-    except KeyError as ke:
-        return jsonify({"exito": False, "mensaje": f"[ERROR] Falta el campo obligatorio: {str(ke)}"}), 400
     except Exception as e:
         return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 500
 
@@ -553,15 +1320,154 @@ def api_comparar_cap2():
             return jsonify({"exito": False, "mensaje": error}), 400
 
         x0 = parsear_vector_x0(data.get('x0', ''), len(A))
-        w = float(data.get('w', 1.5))
+        w, error = validar_w_sor(data.get('w', 1.5))
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        precondicionador, _, error = validar_krylov(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
 
         tol_str = str(data['tol'])  # Mantener string original
-        resultados = capitulo2.comparar_metodos_cap2(A, b, x0, float(data['tol']), int(data['niter']), w, tol_str)
+        resultados = capitulo2.comparar_metodos_cap2(A, b, x0, float(data['tol']), int(data['niter']), w, tol_str,
+                                                     precondicionador)
         return jsonify(resultados)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
 
 
+@app.route('/api/capitulo2/dispersa', methods=['POST'])
+def api_dispersa_cap2():
+    """
+    Jacobi, Gauss-Seidel o SOR sobre sistemas dispersos grandes (sin límite de 7x7)
+
+    La matriz llega como tripletas COO en JSON ('filas', 'columnas', 'valores'
+    con índices desde 0 y 'n' opcional) o como archivo Matrix Market en el
+    campo 'archivo' de un formulario multipart.
+    """
+    try:
+        if request.files.get('archivo'):
+            data = request.form.to_dict()
+            texto = request.files['archivo'].read().decode('utf-8', errors='replace')
+            try:
+                A = capitulo2.MatrizCSR.desde_matrix_market(texto)
+            except ValueError as ve:
+                return jsonify({"exito": False, "mensaje": f"[ERROR] Archivo Matrix Market inválido: {str(ve)}"}), 400
+        else:
+            data = request.get_json(silent=True)
+            if not data:
+                return jsonify({"exito": False, "mensaje": "[ERROR] No se recibieron datos"}), 400
+
+            faltantes = [campo for campo in ('filas', 'columnas', 'valores') if campo not in data]
+            if faltantes:
+                return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(faltantes)}"}), 400
+
+            try:
+                A = capitulo2.MatrizCSR.desde_coo(data['filas'], data['columnas'], data['valores'], data.get('n'))
+            except (ValueError, TypeError) as ve:
+                return jsonify({"exito": False, "mensaje": f"[ERROR] Tripletas COO inválidas: {str(ve)}"}), 400
+
+        # Validar campos obligatorios
+        faltantes = [campo for campo in ('vector_b', 'tol', 'niter') if campo not in data]
+        if faltantes:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(faltantes)}"}), 400
+
+        if A.n > MAX_INCOGNITAS_DISPERSA:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Máximo {MAX_INCOGNITAS_DISPERSA} incógnitas por solicitud."}), 400
+
+        b, error = capitulo2.validar_dispersa(A, data['vector_b'])
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        metodo = str(data.get('metodo', 'jacobi')).replace('-', '_')
+        if metodo not in ('jacobi', 'gauss_seidel', 'sor'):
+            return jsonify({"exito": False, "mensaje": "[ERROR] Método no válido. Opciones: jacobi, gauss-seidel, sor"}), 400
+
+        # Validar tolerancia, niter y w
+        try:
+            tol = float(data['tol'])
+            niter = int(data['niter'])
+            w = float(data.get('w', 1.0))
+            x0_datos = data.get('x0')
+            if isinstance(x0_datos, list):
+                x0 = np.asarray(x0_datos, dtype=float)
+            elif x0_datos and str(x0_datos).strip():
+                x0 = np.asarray(str(x0_datos).replace(',', ' ').split(), dtype=float)
+            else:
+                x0 = np.zeros(A.n)
+        except (ValueError, TypeError):
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia, iteraciones, factor w y x0 deben ser números válidos"}), 400
+
+        if len(x0) != A.n:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] El vector x0 debe tener {A.n} elementos"}), 400
+
+        if tol <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] La tolerancia debe ser mayor que 0"}), 400
+
+        if niter <= 0:
+            return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser mayor que 0"}), 400
+
+        if metodo == 'sor' and (w <= 0 or w >= 2):
+            return jsonify({"exito": False, "mensaje": "[ERROR] El factor de relajación w debe estar entre 0 y 2 (0 < w < 2)"}), 400
+
+        estimador, error = validar_estimador_radio(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+        if estimador == 'exacto':
+            return jsonify({"exito": False, "mensaje": "[ERROR] El estimador 'exacto' no está disponible en modo disperso"}), 400
+
+        resultado = capitulo2.resolver_disperso(A, b, x0, tol, niter, metodo, w, estimador)
+        return jsonify(resultado)
+    except Exception as e:
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 500
+
+
+@app.route('/api/capitulo2/directo', methods=['POST'])
+def api_directo_cap2():
+    """
+    Resuelve A x = b con un método directo: LU con pivoteo parcial o total,
+    Cholesky o LU de banda
+
+    'vector_b' puede traer varios lados derechos (una columna por cada uno).
+    La factorización de A queda en caché: otra solicitud con la misma matriz
+    y un b nuevo solo hace las sustituciones (O(n^2)).
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"exito": False, "mensaje": "[ERROR] No se recibieron datos"}), 400
+
+        faltantes = [campo for campo in ('matriz', 'vector_b') if campo not in data]
+        if faltantes:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Faltan campos requeridos: {', '.join(faltantes)}"}), 400
+
+        metodo = str(data.get('metodo') or 'lu_parcial').strip().lower().replace('-', '_')
+        if metodo not in directos.METODOS_DIRECTOS:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Método no válido. Opciones: {', '.join(directos.METODOS_DIRECTOS)}"}), 400
+
+        A, b, error = directos.validar_sistema(data['matriz'], data['vector_b'], MAX_INCOGNITAS_DIRECTO)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = directos.resolver_directo(A, b, metodo, usar_cache=data.get('usar_cache', True) is not False)
+        return jsonify(resultado), 200 if resultado['exito'] else 400
+    except Exception as e:
+        return jsonify({"exito": False, "mensaje": f"[ERROR] Error inesperado: {str(e)}"}), 500
+
+
+@app.route('/api/capitulo2/directo/cache', methods=['GET'])
+def api_cache_directo_cap2():
+    """Estadísticas del caché de factorizaciones (aciertos, fallos, memoria)"""
+    return jsonify({"exito": True, "cache": directos.estadisticas_cache()})
+
+
+@app.route('/api/capitulo2/directo/cache/limpiar', methods=['POST'])
+def api_limpiar_cache_directo_cap2():
+    """Vacía el caché de factorizaciones"""
+    directos.cache_factorizaciones.limpiar()
+    return jsonify({"exito": True, "mensaje": "Caché de factorizaciones vaciado"})
+
+
 @app.route('/api/capitulo2/grafica-convergencia', methods=['POST'])
 def api_grafica_convergencia_cap2():
     """Genera puntos para graficar la convergencia de un método iterativo"""
@@ -573,7 +1479,13 @@ def api_grafica_convergencia_cap2():
         if not tabla_datos:
             return jsonify({"exito": False, "mensaje": "No hay datos para graficar"}), 400
 
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
         iteraciones, errores = capitulo2.generar_puntos_grafica_convergencia(tabla_datos, tipo_error)
+        # Los errores se grafican en escala logarítmica
+        iteraciones, errores = reducir_serie(iteraciones, errores, ancho, reduccion, escala_log=True)
 
         return jsonify({
             "exito": True,
@@ -596,7 +1508,11 @@ def api_vandermonde():
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
-        resultado = capitulo3.vandermonde(x, y)
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = reducir_puntos_grafica(capitulo3.vandermonde(x, y), ancho, reduccion)
         return jsonify(resultado)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
@@ -606,12 +1522,20 @@ def api_vandermonde():
 def api_newton_interpolante():
     try:
         data = request.json
-        x, y, error = capitulo3.validar_puntos(data['puntos'])
+
+        # Sin la tabla completa (memoria O(n)) se aceptan miles de nodos
+        tabla_completa = str(data.get('tabla_completa', True)).strip().lower() not in ('false', '0', 'no')
+        max_puntos = 8 if tabla_completa else capitulo3.MAX_PUNTOS_NEWTON
+        x, y, error = capitulo3.validar_puntos(data['puntos'], max_puntos)
 
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
-        resultado = capitulo3.newton_interpolante(x, y)
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = reducir_puntos_grafica(capitulo3.newton_interpolante(x, y, tabla_completa), ancho, reduccion)
         return jsonify(resultado)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
@@ -621,12 +1545,21 @@ def api_newton_interpolante():
 def api_lagrange():
     try:
         data = request.json
-        x, y, error = capitulo3.validar_puntos(data['puntos'])
+        forma = data.get('forma') or 'monomial'
+        if forma not in capitulo3.FORMAS_LAGRANGE:
+            return jsonify({"exito": False, "mensaje": f"[ERROR] Forma no válida. Opciones: {', '.join(capitulo3.FORMAS_LAGRANGE)}"}), 400
 
+        max_puntos = capitulo3.MAX_PUNTOS_BARICENTRICO if forma == 'baricentrica' else 8
+        x, y, error = capitulo3.validar_puntos(data['puntos'], max_puntos)
+
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        ancho, reduccion, error = validar_reduccion(data)
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
-        resultado = capitulo3.lagrange(x, y)
+        resultado = reducir_puntos_grafica(capitulo3.lagrange(x, y, forma), ancho, reduccion)
         return jsonify(resultado)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
@@ -641,7 +1574,11 @@ def api_spline_lineal():
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
-        resultado = capitulo3.spline_lineal(x, y)
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = reducir_puntos_grafica(capitulo3.spline_lineal(x, y), ancho, reduccion)
         return jsonify(resultado)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
@@ -651,12 +1588,16 @@ def api_spline_lineal():
 def api_spline_cubico():
     try:
         data = request.json
-        x, y, error = capitulo3.validar_puntos(data['puntos'])
+        x, y, error = capitulo3.validar_puntos(data['puntos'], capitulo3.MAX_PUNTOS_SPLINE)
 
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
-        resultado = capitulo3.spline_cubico(x, y)
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultado = reducir_puntos_grafica(capitulo3.spline_cubico(x, y), ancho, reduccion)
         return jsonify(resultado)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
@@ -672,12 +1613,104 @@ def api_comparar_cap3():
         if error:
             return jsonify({"exito": False, "mensaje": error}), 400
 
-        resultados = capitulo3.comparar_metodos_cap3(x, y)
+        ancho, reduccion, error = validar_reduccion(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
+
+        resultados = reducir_puntos_grafica(capitulo3.comparar_metodos_cap3(x, y), ancho, reduccion)
         return jsonify(resultados)
     except Exception as e:
         return jsonify({"exito": False, "mensaje": str(e)}), 400
 
 
+# ===== ARRANQUE Y PRECALENTAMIENTO =====
+
+# Expresiones que se compilan al precalentar (las de los ejemplos de la interfaz)
+EXPRESIONES_PRECALENTAR = ['x**3 - 2*x - 5', 'x**3 - x - 2', '(x + 2)**(1/3)', '(x - 1)**3',
+                           'x**2 - 4', 'sin(x) - x/2', 'exp(x) - 3*x', 'cos(x) - x']
+
+
+def precalentar():
+    """
+    Deja el proceso listo para atender sin demoras en la primera solicitud
+
+    Importa los módulos de los tres capítulos, compila las expresiones de
+    EXPRESIONES_PRECALENTAR (con sus derivadas) en el caché del capítulo 1 y
+    ejecuta una vez cada ruta numérica con datos pequeños, para que numpy cargue
+    sus submódulos (linalg, etc.) antes de la primera solicitud real. Los
+    procesos de trabajo creados después (fork) heredan todo esto.
+
+    Retorna: dict con los segundos de cada etapa
+    """
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    for modulo in (capitulo1, capitulo2, capitulo3, directos):
+        modulo.cargar()
+    tiempos['importar'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for expresion in EXPRESIONES_PRECALENTAR:
+        capitulo1.obtener_expresion(expresion, derivadas=2)
+    tiempos['expresiones'] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    funcion = EXPRESIONES_PRECALENTAR[0]
+    capitulo1.biseccion(2, 3, 1e-6, 50, funcion)
+    capitulo1.newton_raphson(2.0, 1e-6, 50, funcion)
+    capitulo1.resolver_lote('biseccion', funcion, 1e-6, 50, xi=np.array([2.0]), xs=np.array([3.0]))
+    capitulo1.generar_puntos_grafica(funcion, adaptativo=True)
+
+    A = np.array([[4.0, 1.0, 0.0], [1.0, 4.0, 1.0], [0.0, 1.0, 4.0]])
+    b = np.ones(3)
+    capitulo2.jacobi(A, b, np.zeros(3), 1e-8, 50)
+    capitulo2.gauss_seidel(A, b, np.zeros(3), 1e-8, 50)
+    capitulo2.sor(A, b, np.zeros(3), 1e-8, 50, 1.2)
+
+    x = np.array([0.0, 1.0, 2.0, 3.0])
+    y = x ** 3 - 2 * x
+    for metodo in (capitulo3.vandermonde, capitulo3.newton_interpolante, capitulo3.spline_lineal,
+                   capitulo3.spline_cubico):
+        reducir_puntos_grafica(metodo(x, y))
+    capitulo3.lagrange(x, y, 'baricentrica')
+    tiempos['rutas_numericas'] = time.perf_counter() - inicio
+
+    return tiempos
+
+
+# Estado del arranque de este proceso (se consulta en /api/estado)
+estado_arranque = {"precalentado": False, "tiempos_precalentamiento": None}
+
+# PRECALENTAR=1: precalentar al importar la aplicación, antes de aceptar solicitudes
+# (con gunicorn --preload, los workers nacen ya precalentados)
+if os.environ.get('PRECALENTAR', '').strip().lower() in ('1', 'true', 'si', 'sí'):
+    estado_arranque['tiempos_precalentamiento'] = precalentar()
+    estado_arranque['precalentado'] = True
+
+estado_arranque['tiempo_arranque'] = time.perf_counter() - INICIO_ARRANQUE
+
+if estado_arranque['precalentado']:
+    print(f"Aplicación precalentada y lista en {estado_arranque['tiempo_arranque']:.2f} s "
+          f"({', '.join(f'{etapa}: {segundos:.2f} s' for etapa, segundos in estado_arranque['tiempos_precalentamiento'].items())})")
+
+
+@app.route('/api/estado', methods=['GET'])
+def api_estado():
+    """Tiempo de arranque del proceso y módulos ya cargados (útil como sonda de disponibilidad)"""
+    return jsonify({
+        "exito": True,
+        "tiempo_arranque": estado_arranque['tiempo_arranque'],
+        "precalentado": estado_arranque['precalentado'],
+        "tiempos_precalentamiento": estado_arranque['tiempos_precalentamiento'],
+        "modulos_cargados": {
+            "capitulo1": capitulo1.cargado,
+            "capitulo2": capitulo2.cargado,
+            "capitulo3": capitulo3.cargado,
+            "directos": directos.cargado
+        }
+    })
+
+
 # ===== MANEJO DE ERRORES =====
 
 @app.errorhandler(404)
@@ -685,6 +1718,11 @@ def not_found(error):
     return render_template('404.html'), 404
 
 
+@app.errorhandler(413)
+def solicitud_muy_grande(error):
+    return jsonify({"exito": False, "mensaje": f"[ERROR] La solicitud supera el tamaño máximo de {MAX_MB_SOLICITUD:g} MB."}), 413
+
+
 @app.errorhandler(500)
 def internal_error(error):
     return render_template('500.html'), 500
@@ -695,7 +1733,6 @@ def internal_error(error):
 @app.route('/api/capitulo1/informe', methods=['POST'])
 def informe_capitulo1():
     """Genera informe comparativo de todos los métodos del Capítulo 1"""
-    import time
     try:
         data = request.get_json()
         funcion = data['funcion']
@@ -707,111 +1744,49 @@ def informe_capitulo1():
         tol_str = str(data['tol'])  # Mantener string original
         niter = int(data['niter'])
 
-        resultados = []
-
-        # 1. Bisección
-        try:
-            inicio = time.time()
-            res = capitulo1.biseccion(xi, xs, tol, niter, funcion, tol_str)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Bisección',
-                    'raiz': res['raiz'],
-                    'iteraciones': res['iteraciones'],
-                    'error': res['error_final'],
-                    'tiempo': tiempo,
-                    'exito': True
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Bisección', 'exito': False, 'error_msg': str(e)})
-
-        # 2. Regla Falsa
-        try:
-            inicio = time.time()
-            res = capitulo1.regla_falsa(xi, xs, tol, niter, funcion, tol_str)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Regla Falsa',
-                    'raiz': res['raiz'],
-                    'iteraciones': res['iteraciones'],
-                    'error': res['error_final'],
-                    'tiempo': tiempo,
-                    'exito': True
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Regla Falsa', 'exito': False, 'error_msg': str(e)})
-
-        # 3. Punto Fijo (usar g(x) = x - f(x)/3 como ejemplo)
-        try:
-            inicio = time.time()
-            # Para punto fijo, usar una transformación simple
-            g_funcion = f"x - ({funcion})/3"
-            res = capitulo1.punto_fijo(g_funcion, x0, tol, niter, funcion)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Punto Fijo',
-                    'raiz': res['raiz'],
-                    'iteraciones': res['iteraciones'],
-                    'error': res['error_final'],
-                    'tiempo': tiempo,
-                    'exito': True
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Punto Fijo', 'exito': False, 'error_msg': str(e)})
-
-        # 4. Newton-Raphson
-        try:
-            inicio = time.time()
-            res = capitulo1.newton_raphson(x0, tol, niter, funcion)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Newton-Raphson',
-                    'raiz': res['raiz'],
-                    'iteraciones': res['iteraciones'],
-                    'error': res['error_final'],
-                    'tiempo': tiempo,
-                    'exito': True
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Newton-Raphson', 'exito': False, 'error_msg': str(e)})
+        error = validar_presupuesto_cap1(niter)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
 
-        # 5. Secante
-        try:
-            inicio = time.time()
-            res = capitulo1.secante(x0, x1, tol, niter, funcion, tol_str)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Secante',
-                    'raiz': res['raiz'],
-                    'iteraciones': res['iteraciones'],
-                    'error': res['error_final'],
-                    'tiempo': tiempo,
-                    'exito': True
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Secante', 'exito': False, 'error_msg': str(e)})
+        resultados = []
 
-        # 6. Raíces Múltiples
-        try:
-            inicio = time.time()
-            res = capitulo1.raices_multiples(x0, tol, niter, funcion, 2, None, tol_str)
-            tiempo = time.time() - inicio
-            if res['exito']:
+        # Para punto fijo, usar una transformación simple
+        g_funcion = f"x - ({funcion})/3"
+
+        # Compilar f, f', f'' y g una sola vez en el servidor (si compilan rápido): los procesos de los métodos las heredan
+        limite_superado = precompilar_cap1([(funcion, 2), (g_funcion, 0)])
+        if limite_superado is not None:
+            return jsonify(limite_superado[0]), limite_superado[1]
+
+        # Los métodos son independientes: se ejecutan en paralelo, cada uno en su proceso
+        tareas = [
+            Tarea('Bisección', capitulo1.biseccion, (xi, xs, tol, niter, funcion, tol_str)),
+            Tarea('Regla Falsa', capitulo1.regla_falsa, (xi, xs, tol, niter, funcion, tol_str)),
+            Tarea('Punto Fijo', capitulo1.punto_fijo, (g_funcion, x0, tol, niter, funcion)),
+            Tarea('Newton-Raphson', capitulo1.newton_raphson, (x0, tol, niter, funcion)),
+            Tarea('Secante', capitulo1.secante, (x0, x1, tol, niter, funcion, tol_str)),
+            Tarea('Raíces Múltiples', capitulo1.raices_multiples, (x0, tol, niter, funcion, 2, None, tol_str)),
+            Tarea('Brent', capitulo1.brent, (xi, xs, tol, niter, funcion, tol_str)),
+            Tarea('Regla Falsa (Illinois)', capitulo1.regla_falsa_illinois, (xi, xs, tol, niter, funcion, tol_str))
+        ]
+
+        # f(x) la escribe el usuario: cada método corre con el límite de memoria del capítulo
+        for tarea in tareas:
+            tarea.memoria_mb = LIMITE_MEMORIA_CAP1_MB
+
+        for ejecucion in ejecutar_en_paralelo(tareas, timeout_informe(data)):
+            res = ejecucion['resultado']
+            if not ejecucion['exito']:
+                resultados.append({'metodo': ejecucion['nombre'], 'exito': False, 'error_msg': ejecucion['error']})
+            elif res['exito']:
                 resultados.append({
-                    'metodo': 'Raíces Múltiples',
+                    'metodo': ejecucion['nombre'],
                     'raiz': res['raiz'],
                     'iteraciones': res['iteraciones'],
                     'error': res['error_final'],
-                    'tiempo': tiempo,
+                    'tiempo': ejecucion['tiempo'],
                     'exito': True
                 })
-        except Exception as e:
-            resultados.append({'metodo': 'Raíces Múltiples', 'exito': False, 'error_msg': str(e)})
 
         # Filtrar solo métodos exitosos
         exitosos = [r for r in resultados if r.get('exito', False)]
@@ -846,7 +1821,6 @@ def informe_capitulo1():
 @app.route('/api/capitulo2/informe', methods=['POST'])
 def informe_capitulo2():
     """Genera informe comparativo de todos los métodos del Capítulo 2"""
-    import time
     try:
         data = request.get_json()
 
@@ -885,70 +1859,62 @@ def informe_capitulo2():
         if niter <= 0:
             return jsonify({"exito": False, "mensaje": "[ERROR] El número de iteraciones debe ser mayor que 0"}), 400
 
-        # Validar w (opcional, valor por defecto 1.5)
-        try:
-            w = float(data.get('w', 1.5))
-        except ValueError:
-            return jsonify({"exito": False, "mensaje": "[ERROR] El factor de relajación w debe ser un número válido"}), 400
+        # Validar w (opcional, valor por defecto 1.5; 'auto'/'adaptativo' lo elige SOR)
+        w, error = validar_w_sor(data.get('w', 1.5))
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
 
-        if w <= 0 or w >= 2:
-            return jsonify({"exito": False, "mensaje": "[ERROR] El factor de relajación w debe estar entre 0 y 2 (0 < w < 2)"}), 400
+        # Con w automático el SSOR de los métodos de Krylov usa w = 1 (las tareas corren en paralelo)
+        w_ssor = 1.0 if isinstance(w, str) else w
 
-        resultados = []
+        estimador, error = validar_estimador_radio(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
 
-        # 1. Jacobi
-        try:
-            inicio = time.time()
-            res = capitulo2.jacobi(A.copy(), b.copy(), x0.copy(), tol, niter)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Jacobi',
-                    'exito': True,
-                    'iteraciones': res['iteraciones'],
-                    'error_final': res['error_final'],
-                    'radio_espectral': res['radio_espectral'],
-                    'converge': res['converge'],
-                    'tiempo': tiempo
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Jacobi', 'exito': False, 'error_msg': str(e)})
+        precondicionador, reinicio, error = validar_krylov(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
 
-        # 2. Gauss-Seidel
-        try:
-            inicio = time.time()
-            res = capitulo2.gauss_seidel(A.copy(), b.copy(), x0.copy(), tol, niter)
-            tiempo = time.time() - inicio
-            if res['exito']:
-                resultados.append({
-                    'metodo': 'Gauss-Seidel',
-                    'exito': True,
-                    'iteraciones': res['iteraciones'],
-                    'error_final': res['error_final'],
-                    'radio_espectral': res['radio_espectral'],
-                    'converge': res['converge'],
-                    'tiempo': tiempo
-                })
-        except Exception as e:
-            resultados.append({'metodo': 'Gauss-Seidel', 'exito': False, 'error_msg': str(e)})
+        kernel, error = validar_kernel(data)
+        if error:
+            return jsonify({"exito": False, "mensaje": error}), 400
 
-        # 3. SOR
-        try:
-            inicio = time.time()
-            res = capitulo2.sor(A.copy(), b.copy(), x0.copy(), tol, niter, w)
-            tiempo = time.time() - inicio
-            if res['exito']:
+        resultados = []
+
+        # Los métodos son independientes: se ejecutan en paralelo, cada uno en su proceso.
+        # En los de Krylov no hay matriz de iteración T, así que no tienen radio espectral.
+        tareas = [
+            Tarea('Jacobi', capitulo2.jacobi, (A, b, x0, tol, niter, estimador)),
+            Tarea('Gauss-Seidel', capitulo2.gauss_seidel, (A, b, x0, tol, niter, estimador), {'kernel': kernel}),
+            Tarea(f'SOR (w={w})', capitulo2.sor, (A, b, x0, tol, niter, w, estimador), {'kernel': kernel}),
+            Tarea(f'CG ({precondicionador})', capitulo2.krylov, (A, b, x0, tol, niter, 'cg', precondicionador, w_ssor)),
+            Tarea(f'BiCGSTAB ({precondicionador})', capitulo2.krylov,
+                  (A, b, x0, tol, niter, 'bicgstab', precondicionador, w_ssor)),
+            Tarea(f'GMRES({min(reinicio, n)}) ({precondicionador})', capitulo2.krylov,
+                  (A, b, x0, tol, niter, 'gmres', precondicionador, w_ssor, reinicio))
+        ]
+
+        for ejecucion in ejecutar_en_paralelo(tareas, timeout_informe(data)):
+            res = ejecucion['resultado']
+            if not ejecucion['exito']:
+                nombre = 'SOR' if ejecucion['nombre'].startswith('SOR') else ejecucion['nombre']
+                resultados.append({'metodo': nombre, 'exito': False, 'error_msg': ejecucion['error']})
+            elif res['exito']:
+                nombre = ejecucion['nombre']
+                if res.get('w_automatico'):
+                    # Mostrar el w que eligió SOR
+                    nombre = f"SOR (w={res['w']}, {res['w_automatico']})"
                 resultados.append({
-                    'metodo': f'SOR (w={w})',
+                    'metodo': nombre,
                     'exito': True,
                     'iteraciones': res['iteraciones'],
                     'error_final': res['error_final'],
-                    'radio_espectral': res['radio_espectral'],
-                    'converge': res['converge'],
-                    'tiempo': tiempo
+                    'radio_espectral': res.get('radio_espectral'),
+                    'converge': res.get('converge'),
+                    'tiempo': ejecucion['tiempo']
                 })
-        except Exception as e:
-            resultados.append({'metodo': 'SOR', 'exito': False, 'error_msg': str(e)})
+            else:
+                resultados.append({'metodo': ejecucion['nombre'], 'exito': False, 'error_msg': res.get('mensaje')})
 
         # Filtrar solo métodos exitosos
         exitosos = [r for r in resultados if r.get('exito', False)]
@@ -983,7 +1949,6 @@ def informe_capitulo2():
 @app.route('/api/capitulo3/informe', methods=['POST'])
 def informe_capitulo3():
     """Genera informe comparativo de todos los métodos del Capítulo 3"""
-    import time
     import numpy as np
     try:
         data = request.get_json()
@@ -993,28 +1958,28 @@ def informe_capitulo3():
         metodos = ['vandermonde', 'newton', 'lagrange', 'spline-lineal', 'spline-cubico']
         nombres = ['Vandermonde', 'Newton Interpolante', 'Lagrange', 'Spline Lineal', 'Spline Cúbico']
 
-        for metodo, nombre in zip(metodos, nombres):
-            try:
-                inicio = time.time()
-                res = capitulo3.ejecutar_metodo(metodo, puntos_str)
-                tiempo = time.time() - inicio
-
-                if res['exito']:
-                    # Calcular error promedio si está disponible
-                    error_promedio = None
-                    if 'errores' in res and res['errores']:
-                        error_promedio = float(np.mean(res['errores']))
-
-                    resultados.append({
-                        'metodo': nombre,
-                        'exito': True,
-                        'polinomio': res.get('polinomio', 'N/A'),
-                        'tiempo': tiempo,
-                        'error_promedio': error_promedio,
-                        'errores': res.get('errores', [])
-                    })
-            except Exception as e:
-                resultados.append({'metodo': nombre, 'exito': False, 'error_msg': str(e)})
+        # Los métodos son independientes: se ejecutan en paralelo, cada uno en su proceso
+        tareas = [Tarea(nombre, capitulo3.ejecutar_metodo, (metodo, puntos_str))
+                  for metodo, nombre in zip(metodos, nombres)]
+
+        for ejecucion in ejecutar_en_paralelo(tareas, timeout_informe(data)):
+            res = ejecucion['resultado']
+            if not ejecucion['exito']:
+                resultados.append({'metodo': ejecucion['nombre'], 'exito': False, 'error_msg': ejecucion['error']})
+            elif res['exito']:
+                # Calcular error promedio si está disponible
+                error_promedio = res.get('error_promedio')
+                if error_promedio is None and res.get('errores'):
+                    error_promedio = float(np.mean(res['errores']))
+
+                resultados.append({
+                    'metodo': ejecucion['nombre'],
+                    'exito': True,
+                    'polinomio': res.get('polinomio', 'N/A'),
+                    'tiempo': ejecucion['tiempo'],
+                    'error_promedio': error_promedio,
+                    'errores': res.get('errores', [])
+                })
 
         exitosos = [r for r in resultados if r.get('exito', False)]
 
@@ -1076,6 +2041,8 @@ if __name__ == '__main__':
     print("  - Capítulo 1: http://localhost:5000/capitulo1")
     print("  - Capítulo 2: http://localhost:5000/capitulo2")
     print("  - Capítulo 3: http://localhost:5000/capitulo3")
+    print(f"\nArranque: {estado_arranque['tiempo_arranque']:.2f} s"
+          + (" (precalentado)" if estado_arranque['precalentado'] else " (PRECALENTAR=1 para precalentar)"))
     print("\nPresiona Ctrl+C para detener el servidor")
     print("="*60)
 
@@ -0,0 +1,281 @@
+"""
+Caché de resultados de los endpoints /api/capitulo*
+
+La clave es el hash SHA-256 de la ruta y del cuerpo de la solicitud en forma
+canónica (JSON con claves ordenadas), así que dos POST con el mismo contenido
+comparten la respuesta ya serializada aunque el orden de los campos cambie.
+
+En disco cada respuesta es un archivo '<clave>.cache': una primera línea JSON
+con la expiración, el estado y el tipo de contenido, y a continuación el
+cuerpo tal cual (bytes). No se usa pickle: leer el directorio nunca ejecuta
+código aunque otro usuario pueda escribir en él.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+EXTENSION_DISCO = ".cache"
+
+# Largo máximo de la línea de metadatos de un archivo del caché en disco
+MAX_BYTES_METADATOS = 1024
+
+_NOMBRE_CLAVE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def clave_solicitud(ruta, datos_json=None, cuerpo=b""):
+    """
+    Calcula la clave de caché de una solicitud
+
+    Parámetros:
+    ruta: Ruta del endpoint (ej: '/api/capitulo1/biseccion')
+    datos_json: Cuerpo ya interpretado como JSON (None si no es JSON)
+    cuerpo: Cuerpo crudo en bytes (se usa cuando no es JSON, p. ej. multipart)
+
+    Retorna: string hexadecimal de 64 caracteres
+    """
+    if datos_json is not None:
+        canonico = json.dumps(datos_json, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        contenido = b"json:" + canonico.encode('utf-8')
+    else:
+        contenido = b"raw:" + cuerpo
+
+    return hashlib.sha256(ruta.encode('utf-8') + b"\0" + contenido).hexdigest()
+
+
+class CacheResultados:
+    """
+    Caché LRU de respuestas serializadas con expiración (TTL)
+
+    Parámetros:
+    max_entradas: Número máximo de respuestas guardadas
+    max_bytes: Memoria máxima aproximada (en bytes) de las respuestas guardadas
+    ttl: Segundos que una respuesta sigue siendo válida
+    directorio: Si se indica, cada respuesta también se guarda en disco y
+                sobrevive a los reinicios del servidor (al arrancar se cargan las
+                vigentes respetando max_entradas y max_bytes y se borra el resto)
+
+    Es seguro usarlo desde varios hilos (el servidor Flask atiende en paralelo).
+    """
+
+    def __init__(self, max_entradas=1024, max_bytes=64 * 1024 * 1024, ttl=300, directorio=None):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.directorio = directorio
+        self._entradas = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.expirados = 0
+
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+            self._cargar_disco()
+
+    def obtener(self, clave):
+        """
+        Retorna (estado, cuerpo, tipo_contenido) de la respuesta guardada, o None
+        si no está o ya expiró
+        """
+        ahora = time.time()
+        quitadas = []
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[0] <= ahora:
+                quitadas.append(self._quitar(clave))
+                self.expirados += 1
+                entrada = None
+
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[1:]
+
+        if quitadas:
+            self._borrar_disco(quitadas)
+            return self._fallo()
+
+        # En disco puede estar una respuesta escrita por otro proceso
+        entrada = self._leer_disco(clave)
+        if entrada is not None and entrada[0] > ahora:
+            with self._lock:
+                self.aciertos += 1
+                quitadas = self._insertar(clave, entrada)
+            self._borrar_disco(quitadas)
+            return entrada[1:]
+
+        return self._fallo()
+
+    def _fallo(self):
+        with self._lock:
+            self.fallos += 1
+        return None
+
+    def guardar(self, clave, estado, cuerpo, tipo_contenido):
+        """Guarda una respuesta serializada (bytes) y desaloja las menos usadas si hace falta"""
+        if len(cuerpo) > self.max_bytes:
+            return
+
+        entrada = (time.time() + self.ttl, estado, cuerpo, tipo_contenido)
+        self._escribir_disco(clave, entrada)
+        with self._lock:
+            quitadas = self._insertar(clave, entrada)
+        self._borrar_disco(quitadas)
+
+    def _insertar(self, clave, entrada):
+        """
+        Inserta con el lock tomado y aplica los límites de entradas y memoria
+
+        Retorna: lista de claves desalojadas (sus archivos se borran fuera del lock)
+        """
+        if clave in self._entradas:
+            self._total_bytes -= len(self._entradas[clave][2])
+        self._entradas[clave] = entrada
+        self._entradas.move_to_end(clave)
+        self._total_bytes += len(entrada[2])
+
+        quitadas = []
+        while self._entradas and (len(self._entradas) > self.max_entradas
+                                  or self._total_bytes > self.max_bytes):
+            quitadas.append(self._quitar(next(iter(self._entradas))))
+            self.desalojos += 1
+        return quitadas
+
+    def _quitar(self, clave):
+        """Quita una entrada de memoria (con el lock tomado) y retorna su clave"""
+        entrada = self._entradas.pop(clave)
+        self._total_bytes -= len(entrada[2])
+        return clave
+
+    def _ruta_disco(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION_DISCO)
+
+    def _borrar_disco(self, claves):
+        """Borra los archivos de esas claves (sin el lock: es E/S)"""
+        if not self.directorio:
+            return
+        for clave in claves:
+            try:
+                os.remove(self._ruta_disco(clave))
+            except OSError:
+                pass
+
+    def _leer_disco(self, clave):
+        """Retorna (expira, estado, cuerpo, tipo_contenido) desde disco, o None si no está o es inválida"""
+        if not self.directorio:
+            return None
+        try:
+            with open(self._ruta_disco(clave), 'rb') as archivo:
+                metadatos = json.loads(archivo.readline(MAX_BYTES_METADATOS))
+                cuerpo = archivo.read()
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(metadatos, dict):
+            return None
+        expira, estado, tipo_contenido = (metadatos.get('expira'), metadatos.get('estado'),
+                                          metadatos.get('tipo_contenido'))
+        if (not isinstance(expira, (int, float)) or not isinstance(estado, int)
+                or not isinstance(tipo_contenido, str) or len(cuerpo) != metadatos.get('bytes')):
+            return None
+        return (float(expira), estado, cuerpo, tipo_contenido)
+
+    def _escribir_disco(self, clave, entrada):
+        if not self.directorio:
+            return
+        expira, estado, cuerpo, tipo_contenido = entrada
+        metadatos = json.dumps({"expira": expira, "estado": estado,
+                                "tipo_contenido": tipo_contenido, "bytes": len(cuerpo)})
+
+        # Escritura atómica: otro proceso nunca lee un archivo a medias
+        ruta = self._ruta_disco(clave)
+        temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporal, 'wb') as archivo:
+                archivo.write(metadatos.encode('utf-8') + b"\n")
+                archivo.write(cuerpo)
+            os.replace(temporal, ruta)
+        except OSError:
+            pass
+
+    def _cargar_disco(self):
+        """
+        Carga las respuestas vigentes del directorio (de la más vieja a la más
+        reciente, así las que no caben en max_entradas/max_bytes son las viejas)
+        y borra las expiradas, las inválidas, los temporales que quedaron de
+        escrituras interrumpidas y los archivos de versiones anteriores
+        """
+        ahora = time.time()
+        vigentes = []
+        sobrantes = []
+        for nombre in os.listdir(self.directorio):
+            ruta = os.path.join(self.directorio, nombre)
+            clave, extension = os.path.splitext(nombre)
+            if extension == EXTENSION_DISCO and _NOMBRE_CLAVE.match(clave):
+                entrada = self._leer_disco(clave)
+                if entrada is not None and entrada[0] > ahora:
+                    vigentes.append((entrada[0], clave, entrada))
+                    continue
+            elif not (nombre.endswith(".tmp") or extension == ".pkl"):
+                continue
+            sobrantes.append(ruta)
+
+        quitadas = []
+        with self._lock:
+            for _, clave, entrada in sorted(vigentes):
+                quitadas.extend(self._insertar(clave, entrada))
+            self.desalojos = 0
+        self._borrar_disco(quitadas)
+
+        for ruta in sobrantes:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    def limpiar(self):
+        """Vacía el caché (también en disco) y reinicia los contadores"""
+        with self._lock:
+            claves = list(self._entradas)
+            self._entradas.clear()
+            self._total_bytes = 0
+            self.aciertos = 0
+            self.fallos = 0
+            self.desalojos = 0
+            self.expirados = 0
+
+        self._borrar_disco(claves)
+        if self.directorio:
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith(EXTENSION_DISCO):
+                    try:
+                        os.remove(os.path.join(self.directorio, nombre))
+                    except OSError:
+                        pass
+
+    def estadisticas(self):
+        """Retorna dict con aciertos, fallos, desalojos, expirados, entradas y memoria usada"""
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+                "desalojos": self.desalojos,
+                "expirados": self.expirados,
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "persistente": bool(self.directorio)
+            }
@@ -5,43 +5,286 @@ Incluye: Bisección, Regla Falsa, Punto Fijo, Newton-Raphson, Secante y Raíces
 
 import numpy as np
 import sympy as sp
-from sympy import symbols, sympify, diff, lambdify
 import math
+import linecache
+import os
+import threading
+from collections import OrderedDict, deque
 
 
-def biseccion(xi, xs, tol, niter, funcion_str, tol_str=None):
+# ===== CACHÉ DE EXPRESIONES COMPILADAS =====
+
+X_SIMBOLO = sp.Symbol('x')
+
+
+def normalizar_expresion(funcion_str):
     """
-    Método de Bisección para encontrar raíces de funciones
+    Normaliza el string de una función para usarlo como clave del caché
+    (elimina espacios sobrantes al inicio, al final y repetidos)
+    """
+    return " ".join(str(funcion_str).split())
 
-    Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones', 'tipo_error'
+
+def _bytes_funcion(func):
+    """Tamaño aproximado del código fuente que lambdify guarda para una función"""
+    entrada = linecache.cache.get(func.__code__.co_filename)
+    if entrada and entrada[2]:
+        return sum(len(linea) for linea in entrada[2])
+    return 0
+
+
+class ExpresionCompilada:
     """
-    # Detectar tipo de error usando el string original de tolerancia
-    if tol_str is None:
-        tol_str = str(tol)
+    Función f(x) ya procesada por sympy junto con sus funciones compiladas
+
+    Atributos:
+    texto: String normalizado de la función
+    expr: Expresión simbólica de f(x)
+    f: Función compilada (lambdify) de f(x)
 
-    # Detectar el tipo de error
+    Las derivadas se guardan por orden en el diccionario 'derivadas' como
+    tuplas (expresión, función compilada).
+    """
+
+    def __init__(self, texto):
+        self.texto = texto
+        self.expr = sp.sympify(texto)
+        self.f = sp.lambdify(X_SIMBOLO, self.expr, modules=['numpy', 'math'])
+        self.derivadas = {}
+
+    def derivada(self, orden=1):
+        """
+        Retorna (expresión, función compilada) de la derivada del orden pedido,
+        calculándola solo la primera vez
+        """
+        if orden not in self.derivadas:
+            previa = self.expr if orden == 1 else self.derivada(orden - 1)[0]
+            d_expr = sp.diff(previa, X_SIMBOLO)
+            d_f = sp.lambdify(X_SIMBOLO, d_expr, modules=['numpy', 'math'])
+            self.derivadas[orden] = (d_expr, d_f)
+        return self.derivadas[orden]
+
+    def funciones(self):
+        """Lista con todas las funciones compiladas de la entrada"""
+        return [self.f] + [d_f for _, d_f in self.derivadas.values()]
+
+    def bytes_estimados(self):
+        """Memoria aproximada ocupada por la entrada (expresiones y código generado)"""
+        total = len(self.texto) + len(str(self.expr))
+        total += sum(len(str(d_expr)) for d_expr, _ in self.derivadas.values())
+        total += sum(_bytes_funcion(func) for func in self.funciones())
+        # Costo fijo por objeto compilado (función, código y diccionario de globals)
+        return total + 2048 * len(self.funciones())
+
+    def liberar(self):
+        """Elimina de linecache el código fuente generado por lambdify"""
+        for func in self.funciones():
+            linecache.cache.pop(func.__code__.co_filename, None)
+
+
+class CacheExpresiones:
+    """
+    Caché LRU de expresiones compiladas, acotado por número de entradas y por memoria
+
+    Parámetros:
+    max_entradas: Número máximo de funciones guardadas
+    max_bytes: Memoria máxima aproximada (en bytes) del caché
+
+    Es seguro usarlo desde varios hilos (el servidor Flask atiende en paralelo).
+    """
+
+    def __init__(self, max_entradas=256, max_bytes=16 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+        # Los métodos corren en procesos hijos creados con fork desde los hilos del
+        # servidor: tomar el lock durante el fork evita que un hijo herede el caché
+        # a medio modificar con el lock tomado por otro hilo (y se bloquee al usarlo)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(before=self._lock.acquire, after_in_parent=self._lock.release,
+                                after_in_child=self._lock.release)
+
+    def contiene(self, funcion_str, derivadas=0):
+        """Indica si funcion_str ya está compilada con sus primeras 'derivadas' derivadas (no cuenta como consulta)"""
+        with self._lock:
+            entrada = self._entradas.get(normalizar_expresion(funcion_str))
+        return entrada is not None and all(orden in entrada.derivadas for orden in range(1, derivadas + 1))
+
+    def obtener(self, funcion_str, derivadas=0):
+        """
+        Retorna la ExpresionCompilada de funcion_str, compilándola si no está en caché
+
+        Parámetros:
+        funcion_str: String de la función f(x)
+        derivadas: Cantidad de derivadas que se necesitan ya calculadas (0, 1 o 2)
+
+        Lanza las mismas excepciones que sp.sympify si la función no es válida.
+        """
+        clave = normalizar_expresion(funcion_str)
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+
+        # La compilación se hace fuera del lock para no bloquear otros hilos
+        if entrada is None:
+            entrada = ExpresionCompilada(clave)
+
+        faltan_derivadas = any(orden not in entrada.derivadas for orden in range(1, derivadas + 1))
+        if faltan_derivadas:
+            entrada.derivada(derivadas)
+
+        if faltan_derivadas or clave not in self._entradas:
+            self._guardar(clave, entrada)
+
+        return entrada
+
+    def _guardar(self, clave, entrada):
+        """Guarda (o actualiza) una entrada y desaloja las menos usadas si hace falta"""
+        tamano = entrada.bytes_estimados()
+
+        with self._lock:
+            actual = self._entradas.get(clave)
+            if actual is not None and actual is not entrada:
+                # Otro hilo guardó la misma función primero: conservar la suya
+                if len(actual.derivadas) >= len(entrada.derivadas):
+                    return
+                actual.liberar()
+
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+            self._total_bytes += tamano - self._bytes.get(clave, 0)
+            self._bytes[clave] = tamano
+
+            while self._entradas and (len(self._entradas) > self.max_entradas
+                                      or self._total_bytes > self.max_bytes):
+                clave_vieja, vieja = self._entradas.popitem(last=False)
+                self._total_bytes -= self._bytes.pop(clave_vieja, 0)
+                vieja.liberar()
+                self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía el caché y reinicia los contadores"""
+        with self._lock:
+            for entrada in self._entradas.values():
+                entrada.liberar()
+            self._entradas.clear()
+            self._bytes.clear()
+            self._total_bytes = 0
+            self.aciertos = 0
+            self.fallos = 0
+            self.desalojos = 0
+
+    def estadisticas(self):
+        """Retorna dict con aciertos, fallos, desalojos, entradas y memoria usada"""
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+                "desalojos": self.desalojos,
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+# Caché compartido por todos los métodos del capítulo
+cache_expresiones = CacheExpresiones()
+
+
+def obtener_expresion(funcion_str, derivadas=0):
+    """Atajo para consultar el caché compartido de expresiones compiladas"""
+    return cache_expresiones.obtener(funcion_str, derivadas)
+
+
+def precompilar(funcion_str, derivadas=0):
+    """
+    Compila funcion_str (y sus derivadas) en el caché compartido sin retornarla
+
+    La expresión compilada no se puede enviar entre procesos; así se puede
+    probar la compilación en un proceso aparte.
+    """
+    obtener_expresion(funcion_str, derivadas)
+
+
+def estadisticas_cache():
+    """Estadísticas del caché compartido de expresiones compiladas"""
+    return cache_expresiones.estadisticas()
+
+
+# ===== TABLA DE ITERACIONES =====
+
+def detectar_tipo_error(tol_str):
+    """
+    Detecta el tipo de error a partir del string original de la tolerancia:
+    "5e-k" son cifras significativas (error relativo), "0.5e-k" decimales
+    correctos (error absoluto); cualquier otro valor no es de ninguno de los dos
+    """
     if tol_str.startswith(("5e", "5E", "5.0e", "5.0E")):
-        tipo_error = "relativo"  # Cifras Significativas
+        return "relativo"  # Cifras Significativas
     elif tol_str.startswith(("0.5e", "0.5E")):
-        tipo_error = "absoluto"  # Decimales Correctos
-    else:
-        tipo_error = "ninguno"  # No es ninguno de los dos tipos específicos
+        return "absoluto"  # Decimales Correctos
+    return "ninguno"
+
+
+class TablaIteraciones:
+    """
+    Tabla de iteraciones de los métodos de una variable (Iteracion, Xm, f(Xm), Error)
+
+    Sin 'emitir', las filas se guardan en 'columnas' y se retornan como 'tabla'.
+    Con 'emitir', cada fila se entrega a esa función apenas se calcula y no se
+    guarda (modo flujo): la memoria no crece con el número de iteraciones.
+    """
+
+    def __init__(self, emitir=None):
+        self.emitir = emitir
+        self.columnas = {"Iteracion": [], "Xm": [], "f(Xm)": [], "Error": []}
+        self.ultima = None  # (iteracion, xm, f(xm), error) de la última fila
+
+    def agregar(self, iteracion, xm, fxm, error):
+        self.ultima = (iteracion, xm, fxm, error)
+        if self.emitir is not None:
+            self.emitir({"Iteracion": iteracion, "Xm": xm, "f(Xm)": fxm, "Error": error})
+            return
+        self.columnas["Iteracion"].append(iteracion)
+        self.columnas["Xm"].append(xm)
+        self.columnas["f(Xm)"].append(fxm)
+        self.columnas["Error"].append(error)
+
+
+def biseccion(xi, xs, tol, niter, funcion_str, tol_str=None, emitir=None):
+    """
+    Método de Bisección para encontrar raíces de funciones
+
+    Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones', 'tipo_error'
+    """
+    # Detectar tipo de error usando el string original de tolerancia
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
 
     # Preparar función
-    x_sym = sp.Symbol('x')
     try:
-        f_expr = sp.sympify(funcion_str)
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
+        f = obtener_expresion(funcion_str).f
     except SyntaxError:
         return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error al procesar la función: Asegúrate de usar 'x' como variable.\n💡 Ejemplos: x**2-4, sin(x)-x/2, exp(x)-3*x"}
 
     # Listas para la tabla
-    iteraciones = []
-    valores_xm = []
-    valores_fm = []
-    errores = []
+    tabla = TablaIteraciones(emitir)
 
     # Evaluar en los extremos
     try:
@@ -67,10 +310,7 @@ def biseccion(xi, xs, tol, niter, funcion_str, tol_str=None):
     xm = (xi + xs) / 2
     fe = f(xm)
 
-    iteraciones.append(c)
-    valores_xm.append(xm)
-    valores_fm.append(fe)
-    errores.append(None)
+    tabla.agregar(c, xm, fe, None)
 
     while c < niter:
         if fi * fe < 0:
@@ -91,21 +331,11 @@ def biseccion(xi, xs, tol, niter, funcion_str, tol_str=None):
             error = abs(xm - xa)
 
         c += 1
-        iteraciones.append(c)
-        valores_xm.append(xm)
-        valores_fm.append(fe)
-        errores.append(error)
+        tabla.agregar(c, xm, fe, error)
 
         if error < tol or fe == 0:
             break
 
-    tabla = {
-        "Iteracion": iteraciones,
-        "Xm": valores_xm,
-        "f(Xm)": valores_fm,
-        "Error": errores
-    }
-
     mensaje = f"Raíz aproximada: {xm:.10f} con error {error:.2e}" if c < niter else f"Se alcanzó el número máximo de iteraciones ({niter})"
 
     return {
@@ -113,45 +343,31 @@ def biseccion(xi, xs, tol, niter, funcion_str, tol_str=None):
         "raiz": xm,
         "mensaje": mensaje,
         "iteraciones": c,
-        "tabla": tabla,
+        "tabla": tabla.columnas,
         "tipo_error": tipo_error,
-        "error_final": errores[-1] if errores[-1] is not None else 0
+        "error_final": tabla.ultima[3] if tabla.ultima[3] is not None else 0
     }
 
 
-def regla_falsa(xi, xs, tol, niter, funcion_str, tol_str=None):
+def regla_falsa(xi, xs, tol, niter, funcion_str, tol_str=None, emitir=None):
     """
     Método de Regla Falsa (Falsa Posición) para encontrar raíces
 
     Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones', 'tipo_error'
     """
     # Detectar tipo de error usando el string original de tolerancia
-    if tol_str is None:
-        tol_str = str(tol)
-
-    # Detectar el tipo de error
-    if tol_str.startswith(("5e", "5E", "5.0e", "5.0E")):
-        tipo_error = "relativo"  # Cifras Significativas
-    elif tol_str.startswith(("0.5e", "0.5E")):
-        tipo_error = "absoluto"  # Decimales Correctos
-    else:
-        tipo_error = "ninguno"  # No es ninguno de los dos tipos específicos
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
 
     # Preparar función
-    x_sym = sp.Symbol('x')
     try:
-        f_expr = sp.sympify(funcion_str)
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
+        f = obtener_expresion(funcion_str).f
     except SyntaxError:
         return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error al procesar la función: Asegúrate de usar 'x' como variable.\n💡 Ejemplos: x**2-4, sin(x)-x/2, exp(x)-3*x"}
 
     # Listas para la tabla
-    iteraciones = []
-    valores_xm = []
-    valores_fm = []
-    errores = []
+    tabla = TablaIteraciones(emitir)
 
     # Evaluar en los extremos
     try:
@@ -177,10 +393,7 @@ def regla_falsa(xi, xs, tol, niter, funcion_str, tol_str=None):
     xm = xi - fi * (xs - xi) / (fs - fi)
     fe = f(xm)
 
-    iteraciones.append(c)
-    valores_xm.append(xm)
-    valores_fm.append(fe)
-    errores.append(None)
+    tabla.agregar(c, xm, fe, None)
 
     while c < niter:
         if fi * fe < 0:
@@ -201,21 +414,11 @@ def regla_falsa(xi, xs, tol, niter, funcion_str, tol_str=None):
             error = abs(xm - xa)
 
         c += 1
-        iteraciones.append(c)
-        valores_xm.append(xm)
-        valores_fm.append(fe)
-        errores.append(error)
+        tabla.agregar(c, xm, fe, error)
 
         if error < tol or fe == 0:
             break
 
-    tabla = {
-        "Iteracion": iteraciones,
-        "Xm": valores_xm,
-        "f(Xm)": valores_fm,
-        "Error": errores
-    }
-
     mensaje = f"Raíz aproximada: {xm:.10f} con error {error:.2e}" if c < niter else f"Se alcanzó el número máximo de iteraciones ({niter})"
 
     return {
@@ -223,13 +426,13 @@ def regla_falsa(xi, xs, tol, niter, funcion_str, tol_str=None):
         "raiz": xm,
         "mensaje": mensaje,
         "iteraciones": c,
-        "tabla": tabla,
+        "tabla": tabla.columnas,
         "tipo_error": tipo_error,
-        "error_final": errores[-1] if errores[-1] is not None else 0
+        "error_final": tabla.ultima[3] if tabla.ultima[3] is not None else 0
     }
 
 
-def punto_fijo(g_str, x0, tol, niter, funcion_f):
+def punto_fijo(g_str, x0, tol, niter, funcion_f, emitir=None):
     """
     Método de Punto Fijo
 
@@ -239,27 +442,20 @@ def punto_fijo(g_str, x0, tol, niter, funcion_f):
     tol: Tolerancia
     niter: Número máximo de iteraciones
     funcion_f: Función original f(x) = 0 (para referencia)
+    emitir: Si se indica, recibe cada fila de la tabla en vez de guardarla (modo flujo)
 
     Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones'
     """
-    x_sym = sp.Symbol('x')
-
     # Validar funciones
     try:
-        f_expr = sp.sympify(funcion_f)
-        g_expr = sp.sympify(g_str)
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
-        g = sp.lambdify(x_sym, g_expr, modules=['numpy', 'math'])
+        f = obtener_expresion(funcion_f).f
+        g = obtener_expresion(g_str).f
     except SyntaxError:
         return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita. Ejemplo: x**2 - 4"}
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error al procesar las funciones: Asegúrate de usar 'x' como variable. Ejemplo: g(x) = (x+2)**(1/3)"}
 
-    iteraciones = []
-    xn_vals = []
-    gxn_vals = []
-    fxn_vals = []
-    errores = []
+    tabla = TablaIteraciones(emitir)
 
     xn = x0
     c = 0
@@ -303,11 +499,7 @@ def punto_fijo(g_str, x0, tol, niter, funcion_f):
 
         error = abs(xn1 - xn)
 
-        iteraciones.append(c)
-        xn_vals.append(xn)
-        gxn_vals.append(xn1)
-        fxn_vals.append(fxn)
-        errores.append(error)
+        tabla.agregar(c, xn, fxn, error)
 
         if c > 0 and error <= tol:
             break
@@ -315,52 +507,38 @@ def punto_fijo(g_str, x0, tol, niter, funcion_f):
         xn = xn1
         c += 1
 
-    tabla = {
-        "Iteracion": iteraciones,
-        "Xm": xn_vals,
-        "f(Xm)": fxn_vals,
-        "Error": errores
-    }
-
     if error <= tol:
         mensaje = f"✅ Punto fijo encontrado: {xn1:.10f} con error {error:.2e}"
     else:
         mensaje = f"⚠️ No convergió en {niter} iteraciones (error final: {error:.2e}).\n💡 Posibles causas:\n   • g(x) no cumple la condición de convergencia |g'(x)| < 1\n   • Necesitas más iteraciones\n   • x0 está muy lejos de la raíz\n\n🔧 Soluciones:\n   1. Aumenta el número de iteraciones\n   2. Prueba con otro x0\n   3. Reformula g(x)\n   4. Usa otro método"
 
     return {
-        "exito": error <= tol,
+        "exito": bool(error <= tol),
         "raiz": xn1,
         "mensaje": mensaje,
         "iteraciones": c,
-        "tabla": tabla,
+        "tabla": tabla.columnas,
         "error_final": error
     }
 
 
-def newton_raphson(x0, tol, niter, funcion_str):
+def newton_raphson(x0, tol, niter, funcion_str, emitir=None):
     """
     Método de Newton-Raphson
 
     Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones'
     """
-    x_sym = sp.Symbol('x')
-
     try:
-        f_expr = sp.sympify(funcion_str)
-        df_expr = sp.diff(f_expr, x_sym)
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
-        df = sp.lambdify(x_sym, df_expr, modules=['numpy', 'math'])
+        expresion = obtener_expresion(funcion_str, derivadas=1)
+        f = expresion.f
+        df_expr, df = expresion.derivada(1)
         derivada_str = str(df_expr)  # Guardar derivada como string
     except SyntaxError:
         return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error al procesar la función.\n💡 Asegúrate de usar 'x' como variable."}
 
-    iteraciones = []
-    xn_vals = []
-    fn_vals = []
-    dfn_vals = []
-    errores = []
+    tabla = TablaIteraciones(emitir)
 
     xn = x0
     c = 0
@@ -378,11 +556,7 @@ def newton_raphson(x0, tol, niter, funcion_str):
     if math.isnan(fn) or math.isnan(dfn):
         return {"exito": False, "mensaje": f"❌ f(x0) o f'(x0) no están definidas en x0={x0}\n\n🔧 Solución: Cambia x0"}
 
-    iteraciones.append(c)
-    xn_vals.append(xn)
-    fn_vals.append(fn)
-    dfn_vals.append(dfn)
-    errores.append(error)
+    tabla.agregar(c, xn, fn, error)
 
     while error > tol and fn != 0 and c < niter:
         # Verificar derivada antes de dividir
@@ -419,20 +593,9 @@ def newton_raphson(x0, tol, niter, funcion_str):
             return {"exito": False, "mensaje": f"❌ Error inesperado en iteración {c+1}: {str(e)}"}
 
         c += 1
-        error = abs(xn - xn_vals[-1])
-
-        iteraciones.append(c)
-        xn_vals.append(xn)
-        fn_vals.append(fn)
-        dfn_vals.append(dfn)
-        errores.append(error)
-
-    tabla = {
-        "Iteracion": iteraciones,
-        "Xm": xn_vals,
-        "f(Xm)": fn_vals,
-        "Error": errores
-    }
+        error = abs(xn - tabla.ultima[1])
+
+        tabla.agregar(c, xn, fn, error)
 
     if fn == 0:
         mensaje = f"{xn:.10f} es raíz exacta de f(x)"
@@ -442,47 +605,33 @@ def newton_raphson(x0, tol, niter, funcion_str):
         mensaje = f"Fracaso en {niter} iteraciones"
 
     return {
-        "exito": fn == 0 or error < tol,
+        "exito": bool(fn == 0 or error < tol),
         "raiz": xn,
         "mensaje": mensaje,
         "iteraciones": c,
-        "tabla": tabla,
+        "tabla": tabla.columnas,
         "error_final": error,
         "derivada": derivada_str  # Mostrar derivada calculada
     }
 
 
-def secante(x0, x1, tol, niter, funcion_str, tol_str=None):
+def secante(x0, x1, tol, niter, funcion_str, tol_str=None, emitir=None):
     """
     Método de la Secante
 
     Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones'
     """
     # Detectar tipo de error usando el string original de tolerancia
-    if tol_str is None:
-        tol_str = str(tol)
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
 
-    # Detectar el tipo de error
-    if tol_str.startswith(("5e", "5E", "5.0e", "5.0E")):
-        tipo_error = "relativo"  # Cifras Significativas
-    elif tol_str.startswith(("0.5e", "0.5E")):
-        tipo_error = "absoluto"  # Decimales Correctos
-    else:
-        tipo_error = "ninguno"  # No es ninguno de los dos tipos específicos
-
-    x_sym = sp.Symbol('x')
     try:
-        f_expr = sp.sympify(funcion_str)
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
+        f = obtener_expresion(funcion_str).f
     except SyntaxError:
         return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - x - 2"}
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error al procesar la función.\n💡 Asegúrate de usar 'x' como variable."}
 
-    iteraciones = []
-    xn_vals = []
-    fn_vals = []
-    errores = []
+    tabla = TablaIteraciones(emitir)
 
     # Evaluar f en los puntos iniciales con manejo de errores
     try:
@@ -506,10 +655,7 @@ def secante(x0, x1, tol, niter, funcion_str, tol_str=None):
 
     k = 0
     error = tol + 1  # Inicializar error
-    iteraciones.append(k)
-    xn_vals.append(x1)
-    fn_vals.append(f1)
-    errores.append(None)
+    tabla.agregar(k, x1, f1, None)
 
     if f0 == 0:
         return {"exito": True, "raiz": x0, "mensaje": f"{x0} es raíz exacta",
@@ -526,7 +672,7 @@ def secante(x0, x1, tol, niter, funcion_str, tol_str=None):
         # Validar que la recta secante no sea horizontal
         if abs(denom) < 1e-15:
             return {"exito": False,
-                   "mensaje": f"⚠️ Los valores de f(x) son muy similares en las dos últimas iteraciones.\n💡 El problema:\n   • f({xn_vals[-1]:.4f}) ≈ f({x0:.4f})\n   • La recta secante es casi horizontal\n   • No se puede calcular la siguiente aproximación\n\n🔧 Soluciones:\n   1. Cambia los valores iniciales x0 y x1 (que estén más separados)\n   2. Usa otro método (Newton-Raphson, Bisección)"}
+                   "mensaje": f"⚠️ Los valores de f(x) son muy similares en las dos últimas iteraciones.\n💡 El problema:\n   • f({tabla.ultima[1]:.4f}) ≈ f({x0:.4f})\n   • La recta secante es casi horizontal\n   • No se puede calcular la siguiente aproximación\n\n🔧 Soluciones:\n   1. Cambia los valores iniciales x0 y x1 (que estén más separados)\n   2. Usa otro método (Newton-Raphson, Bisección)"}
 
         try:
             x2 = x1 - f1 * (x1 - x0) / denom
@@ -574,21 +720,11 @@ def secante(x0, x1, tol, niter, funcion_str, tol_str=None):
             return {"exito": False, "mensaje": f"❌ Error inesperado en iteración {k+1}: {str(e)}"}
 
         k += 1
-        iteraciones.append(k)
-        xn_vals.append(x1)
-        fn_vals.append(f1)
-        errores.append(error)
+        tabla.agregar(k, x1, f1, error)
 
         if f1 == 0 or error < tol:
             break
 
-    tabla = {
-        "Iteracion": iteraciones,
-        "Xm": xn_vals,
-        "f(Xm)": fn_vals,
-        "Error": errores
-    }
-
     if f1 == 0:
         mensaje = f"{x1:.10f} es raíz exacta"
     elif error < tol:
@@ -597,17 +733,17 @@ def secante(x0, x1, tol, niter, funcion_str, tol_str=None):
         mensaje = f"❌ No se alcanzó la tolerancia en {niter} iteraciones.\n💡 Error actual: {error:.2e} > Tolerancia: {tol:.2e}\n\n🔧 Soluciones:\n   1. Aumenta el número de iteraciones\n   2. Cambia x0 y x1 a valores más cercanos a la raíz\n   3. Aumenta la tolerancia"
 
     return {
-        "exito": f1 == 0 or error < tol,
+        "exito": bool(f1 == 0 or error < tol),
         "raiz": x1,
         "mensaje": mensaje,
         "iteraciones": k,
-        "tabla": tabla,
+        "tabla": tabla.columnas,
         "tipo_error": tipo_error,
         "error_final": error
     }
 
 
-def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None, tol_str=None):
+def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None, tol_str=None, emitir=None):
     """
     Método de Newton-Raphson para Raíces Múltiples
 
@@ -615,26 +751,13 @@ def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None,
     Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones'
     """
     # Detectar tipo de error usando el string original de tolerancia
-    if tol_str is None:
-        tol_str = str(tol)
-
-    # Detectar el tipo de error
-    if tol_str.startswith(("5e", "5E", "5.0e", "5.0E")):
-        tipo_error = "relativo"  # Cifras Significativas
-    elif tol_str.startswith(("0.5e", "0.5E")):
-        tipo_error = "absoluto"  # Decimales Correctos
-    else:
-        tipo_error = "ninguno"  # No es ninguno de los dos tipos específicos
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
 
-    x_sym = sp.Symbol('x')
     try:
-        f_expr = sp.sympify(funcion_str)
-        df_expr = sp.diff(f_expr, x_sym)
-        ddf_expr = sp.diff(df_expr, x_sym)
-
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
-        df = sp.lambdify(x_sym, df_expr, modules=['numpy', 'math'])
-        ddf = sp.lambdify(x_sym, ddf_expr, modules=['numpy', 'math'])
+        expresion = obtener_expresion(funcion_str, derivadas=2)
+        f = expresion.f
+        df_expr, df = expresion.derivada(1)
+        ddf_expr, ddf = expresion.derivada(2)
 
         derivada_str = str(df_expr)  # Guardar derivadas como string
         derivada2_str = str(ddf_expr)
@@ -643,11 +766,7 @@ def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None,
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error al procesar la función.\n💡 Asegúrate de usar 'x' como variable."}
 
-    iteraciones = []
-    xn_vals = []
-    fn_vals = []
-    dfn_vals = []
-    errores = []
+    tabla = TablaIteraciones(emitir)
 
     c = 0
     xn = x0
@@ -672,11 +791,7 @@ def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None,
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error inesperado: {str(e)}"}
 
-    iteraciones.append(c)
-    xn_vals.append(xn)
-    fn_vals.append(fn)
-    dfn_vals.append(dfn)
-    errores.append(None)
+    tabla.agregar(c, xn, fn, None)
 
     error = tol + 1
     valores_grandes_consecutivos = 0
@@ -758,24 +873,13 @@ def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None,
         except Exception as e:
             return {"exito": False, "mensaje": f"❌ Error inesperado en iteración {c+1}: {str(e)}"}
 
-        iteraciones.append(c)
-        xn_vals.append(xn)
-        fn_vals.append(fn)
-        dfn_vals.append(dfn)
-        errores.append(error)
+        tabla.agregar(c, xn, fn, error)
 
         if error < tol or abs(fn) < 1e-15:
             break
 
-    tabla = {
-        "Iteracion": iteraciones,
-        "Xm": xn_vals,
-        "f(Xm)": fn_vals,
-        "Error": errores
-    }
-
     # Verificar si encontramos la raíz
-    exito = (error < tol) or (abs(fn) < 1e-15)
+    exito = bool((error < tol) or (abs(fn) < 1e-15))
 
     if exito:
         mensaje = f"Raíz aproximada: {xn:.10f} con error {error:.2e}"
@@ -783,14 +887,14 @@ def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None,
         mensaje = f"❌ No se alcanzó la tolerancia en {niter} iteraciones.\n💡 Error actual: {error:.2e} > Tolerancia: {tol:.2e}\n\n🔧 Soluciones:\n   1. Aumenta el número de iteraciones\n   2. Cambia x0 a un valor más cercano a la raíz\n   3. Verifica que la función tenga una raíz múltiple\n   4. Si la raíz es simple, usa Newton-Raphson normal"
 
     # Detectar si es raíz múltiple
-    es_multiple = abs(fn) < 1e-10 and abs(dfn) < 1e-6
+    es_multiple = bool(abs(fn) < 1e-10 and abs(dfn) < 1e-6)
 
     return {
         "exito": exito,
         "raiz": xn,
         "mensaje": mensaje,
         "iteraciones": c,
-        "tabla": tabla,
+        "tabla": tabla.columnas,
         "tipo_error": tipo_error,
         "error_final": error,
         "es_raiz_multiple": es_multiple,
@@ -799,15 +903,350 @@ def raices_multiples(x0, tol, niter, funcion_str, metodo=2, multiplicidad=None,
     }
 
 
-def generar_puntos_grafica(funcion_str, x_min=None, x_max=None, raiz=None, num_puntos=500):
+def _evaluar_extremos(f, xi, xs, nombre_metodo, tipo_error):
+    """
+    Evalúa f en los extremos de un intervalo y valida el cambio de signo
+
+    Retorna: (fi, fs, resultado) donde resultado es None si el intervalo es
+    adecuado, o el dict que debe retornar el método (error o raíz exacta)
+    """
+    try:
+        fi = f(xi)
+        fs = f(xs)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None, None, {"exito": False,
+                            "mensaje": f"❌ Error al evaluar la función en el intervalo [{xi}, {xs}]\n💡 La función no está definida en este intervalo.\n\n🔧 Solución: Cambia el intervalo [Xi, Xs]"}
+    except Exception as e:
+        return None, None, {"exito": False, "mensaje": f"❌ Error inesperado al evaluar f(x): {str(e)}"}
+
+    if math.isnan(fi) or math.isnan(fs):
+        return fi, fs, {"exito": False,
+                        "mensaje": f"❌ La función no está definida en xi={xi} o xs={xs}\n\n🔧 Solución: Cambia el intervalo [Xi, Xs]"}
+
+    if fi == 0:
+        return fi, fs, {"exito": True, "raiz": xi, "mensaje": f"✅ {xi} es raíz exacta de f(x)",
+                        "iteraciones": 0, "tabla": [], "tipo_error": tipo_error, "error_final": 0, "evaluaciones": 2}
+    elif fs == 0:
+        return fi, fs, {"exito": True, "raiz": xs, "mensaje": f"✅ {xs} es raíz exacta de f(x)",
+                        "iteraciones": 0, "tabla": [], "tipo_error": tipo_error, "error_final": 0, "evaluaciones": 2}
+    elif fs * fi > 0:
+        return fi, fs, {"exito": False,
+                        "mensaje": f"❌ Intervalo inadecuado: f({xi}) = {fi:.4f} y f({xs}) = {fs:.4f} tienen el mismo signo.\n\n💡 Para que {nombre_metodo} funcione:\n   • f(Xi) y f(Xs) deben tener SIGNOS OPUESTOS\n\n🔧 Soluciones:\n   1. Usa la búsqueda automática de raíces para encontrar intervalos válidos\n   2. Prueba con otros valores de Xi y Xs\n\n📊 Valores actuales:\n   • f({xi}) = {fi:.6f} {'(+)' if fi > 0 else '(-)'}\n   • f({xs}) = {fs:.6f} {'(+)' if fs > 0 else '(-)'}"}
+
+    return fi, fs, None
+
+
+def brent(xi, xs, tol, niter, funcion_str, tol_str=None, emitir=None):
+    """
+    Método de Brent (interpolación cuadrática inversa + secante con respaldo de bisección)
+
+    En cada iteración intenta un paso de interpolación y solo lo acepta si cae
+    dentro del intervalo y reduce lo suficiente el intervalo; si no, hace un
+    paso de bisección. Así conserva la garantía de convergencia de bisección
+    con convergencia superlineal cerca de la raíz.
+
+    El error de cada iteración es la mitad del intervalo que encierra la raíz
+    (relativo a |x| si la tolerancia es de cifras significativas).
+
+    Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones', 'tipo_error', 'evaluaciones'
+    """
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
+
+    try:
+        f = obtener_expresion(funcion_str).f
+    except SyntaxError:
+        return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
+    except Exception:
+        return {"exito": False, "mensaje": "❌ Error al procesar la función: Asegúrate de usar 'x' como variable.\n💡 Ejemplos: x**2-4, sin(x)-x/2, exp(x)-3*x"}
+
+    fa, fb, resultado = _evaluar_extremos(f, xi, xs, "Brent", tipo_error)
+    if resultado is not None:
+        return resultado
+
+    eps = np.finfo(float).eps
+    a, b = xi, xs
+    c, fc = b, fb
+    d = e = b - a
+    evaluaciones = 2
+    anchos = deque(maxlen=3)  # Ancho del intervalo en las tres últimas iteraciones
+    ancho_inicial = abs(b - a)
+
+    tabla = TablaIteraciones(emitir)
+
+    c_iter = 0
+    error = abs(b - a)
+
+    try:
+        while True:
+            # c es el extremo que mantiene el cambio de signo con b
+            if (fb > 0 and fc > 0) or (fb < 0 and fc < 0):
+                c, fc = a, fa
+                d = e = b - a
+
+            # b siempre es la mejor aproximación (menor |f|)
+            if abs(fc) < abs(fb):
+                a, b, c = b, c, b
+                fa, fb, fc = fb, fc, fb
+
+            xm = 0.5 * (c - b)
+            if tipo_error == "relativo":
+                error = abs(xm) / abs(b) if b != 0 else abs(xm)
+                tol_abs = tol * abs(b) if b != 0 else tol
+            else:
+                error = abs(xm)
+                tol_abs = tol
+            tol1 = 2 * eps * abs(b) + 0.5 * tol_abs
+
+            tabla.agregar(c_iter, b, fb, error)
+
+            if abs(xm) <= tol1 or fb == 0 or c_iter >= niter:
+                break
+
+            # Forzar bisección si el intervalo no se redujo a la mitad en las dos últimas
+            # iteraciones (evita el avance lento por un solo lado en raíces múltiples) o si
+            # es más ancho que el que dejaría bisección en la mitad de las iteraciones. La
+            # ventana no se vacía y la cota acota el total: Brent no tarda más de unas dos
+            # veces lo que tarda bisección
+            anchos.append(abs(c - b))
+            forzar_biseccion = ((len(anchos) == anchos.maxlen and anchos[-1] > 0.5 * anchos[0])
+                                or anchos[-1] > ancho_inicial * 0.5 ** ((c_iter - 2) / 2))
+
+            if not forzar_biseccion and abs(e) >= tol1 and abs(fa) > abs(fb):
+                s = fb / fa
+                if a == c:
+                    # Secante (solo hay dos puntos distintos)
+                    p = 2 * xm * s
+                    q = 1 - s
+                else:
+                    # Interpolación cuadrática inversa
+                    q = fa / fc
+                    r = fb / fc
+                    p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                    q = (q - 1) * (r - 1) * (s - 1)
+                if p > 0:
+                    q = -q
+                p = abs(p)
+
+                # Aceptar la interpolación solo si cae dentro del intervalo y converge rápido
+                if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                    e = d
+                    d = p / q
+                else:
+                    d = xm
+                    e = d
+            else:
+                d = xm
+                e = d
+
+            a, fa = b, fb
+            b = b + d if abs(d) > tol1 else b + math.copysign(tol1, xm)
+            fb = f(b)
+            evaluaciones += 1
+            c_iter += 1
+
+            if math.isnan(fb) or math.isinf(fb):
+                return {"exito": False,
+                        "mensaje": f"⚠️ f({b:.6f}) no está definida en la iteración {c_iter}.\n💡 La función tiene una discontinuidad dentro del intervalo.\n\n🔧 Solución: Cambia el intervalo [Xi, Xs]"}
+    except (ValueError, ZeroDivisionError, OverflowError) as error_numerico:
+        return {"exito": False,
+                "mensaje": f"⚠️ Error numérico en iteración {c_iter + 1}: {str(error_numerico)}\n\n🔧 Solución: Cambia el intervalo [Xi, Xs]"}
+
+    if fb == 0:
+        error = 0
+        mensaje = f"✅ {b:.10f} es raíz exacta de f(x)"
+    elif c_iter < niter:
+        mensaje = f"Raíz aproximada: {b:.10f} con error {error:.2e}"
+    else:
+        mensaje = f"Se alcanzó el número máximo de iteraciones ({niter})"
+
+    return {
+        "exito": True,
+        "raiz": b,
+        "mensaje": mensaje,
+        "iteraciones": c_iter,
+        "tabla": tabla.columnas,
+        "tipo_error": tipo_error,
+        "error_final": error,
+        "evaluaciones": evaluaciones
+    }
+
+
+def regla_falsa_illinois(xi, xs, tol, niter, funcion_str, tol_str=None, emitir=None):
+    """
+    Regla Falsa modificada (Illinois)
+
+    Igual que Regla Falsa, pero cuando un mismo extremo queda fijo dos
+    iteraciones seguidas se divide a la mitad su valor de f. Esto evita el
+    estancamiento de Regla Falsa en funciones convexas y da convergencia
+    superlineal.
+
+    Retorna: dict con 'tabla', 'exito', 'raiz', 'mensaje', 'iteraciones', 'tipo_error', 'evaluaciones'
+    """
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
+
+    try:
+        f = obtener_expresion(funcion_str).f
+    except SyntaxError:
+        return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
+    except Exception:
+        return {"exito": False, "mensaje": "❌ Error al procesar la función: Asegúrate de usar 'x' como variable.\n💡 Ejemplos: x**2-4, sin(x)-x/2, exp(x)-3*x"}
+
+    fi, fs, resultado = _evaluar_extremos(f, xi, xs, "Regla Falsa (Illinois)", tipo_error)
+    if resultado is not None:
+        return resultado
+
+    tabla = TablaIteraciones(emitir)
+
+    # lado = -1 si el último extremo reemplazado fue xs, +1 si fue xi
+    lado = 0
+    c = 0
+    error = abs(xs - xi)
+
+    try:
+        xm = xi - fi * (xs - xi) / (fs - fi)
+        fe = f(xm)
+        evaluaciones = 3
+
+        tabla.agregar(c, xm, fe, None)
+
+        while c < niter and fe != 0:
+            if fi * fe < 0:
+                xs, fs = xm, fe
+                if lado == -1:
+                    fi /= 2
+                lado = -1
+            else:
+                xi, fi = xm, fe
+                if lado == 1:
+                    fs /= 2
+                lado = 1
+
+            xa = xm
+            xm = xi - fi * (xs - xi) / (fs - fi)
+            fe = f(xm)
+            evaluaciones += 1
+
+            if math.isnan(fe) or math.isinf(fe):
+                return {"exito": False,
+                        "mensaje": f"⚠️ f({xm:.6f}) no está definida en la iteración {c + 1}.\n💡 La función tiene una discontinuidad dentro del intervalo.\n\n🔧 Solución: Cambia el intervalo [Xi, Xs]"}
+
+            # Calcular error
+            if tipo_error == "relativo":
+                error = abs(xm - xa) / abs(xm) if xm != 0 else abs(xm - xa)
+            else:
+                error = abs(xm - xa)
+
+            c += 1
+            tabla.agregar(c, xm, fe, error)
+
+            if error < tol:
+                break
+    except (ValueError, ZeroDivisionError, OverflowError) as e:
+        return {"exito": False,
+                "mensaje": f"⚠️ Error numérico en iteración {c + 1}: {str(e)}\n\n🔧 Solución: Cambia el intervalo [Xi, Xs]"}
+
+    if fe == 0:
+        error = 0
+        mensaje = f"✅ {xm:.10f} es raíz exacta de f(x)"
+    elif c < niter:
+        mensaje = f"Raíz aproximada: {xm:.10f} con error {error:.2e}"
+    else:
+        mensaje = f"Se alcanzó el número máximo de iteraciones ({niter})"
+
+    return {
+        "exito": True,
+        "raiz": xm,
+        "mensaje": mensaje,
+        "iteraciones": c,
+        "tabla": tabla.columnas,
+        "tipo_error": tipo_error,
+        "error_final": error,
+        "evaluaciones": evaluaciones
+    }
+
+
+# Valores de |f(x)| mayores que esto no se grafican (se envían como None)
+LIMITE_Y_GRAFICA = 1e6
+
+
+def _evaluar_para_grafica(f, x):
+    """Evalúa f en x (vectorizado) y deja en NaN los puntos no definidos o fuera de LIMITE_Y_GRAFICA"""
+    y = evaluar_vectorial(f, x)
+    with np.errstate(invalid='ignore'):
+        y[~(np.abs(y) <= LIMITE_Y_GRAFICA)] = np.nan
+    return y
+
+
+def _muestreo_adaptativo(f, x_min, x_max, max_puntos, puntos_iniciales=65, max_niveles=12, tolerancia=2e-3):
+    """
+    Muestrea f en [x_min, x_max] refinando solo donde hace falta
+
+    Parte de una malla gruesa y en cada nivel evalúa (en una sola llamada
+    vectorizada) los puntos medios de los intervalos que:
+    - tienen un cambio de signo (raíz o polo),
+    - tienen un extremo definido y el otro no (borde del dominio o asíntota),
+    - tienen mucha pendiente (salto mayor al 5% del rango de y), o
+    - están junto a un punto que se aparta de la recta entre sus vecinos más
+      de 'tolerancia' veces el rango de y (curvatura).
+    Las regiones planas se quedan con la malla gruesa. Si hay más candidatos
+    que puntos disponibles (max_puntos), se refinan primero los de mayor
+    puntaje; las raíces y discontinuidades van antes que la curvatura.
+
+    Retorna: (x, y) numpy arrays ordenados (y con NaN donde no se grafica)
+    """
+    x = np.linspace(x_min, x_max, min(puntos_iniciales, max_puntos))
+    y = _evaluar_para_grafica(f, x)
+    ancho_minimo = (x_max - x_min) / (len(x) - 1) / 2 ** max_niveles
+
+    for _ in range(max_niveles):
+        finitos = np.isfinite(y)
+        if not finitos.any():
+            break
+        escala = float(np.ptp(y[finitos])) or 1.0
+
+        y0, y1 = y[:-1], y[1:]
+        puntaje = np.zeros(len(x) - 1)
+        with np.errstate(invalid='ignore'):
+            # Curvatura: desviación de cada punto interior respecto a la cuerda de sus vecinos
+            t = (x[1:-1] - x[:-2]) / (x[2:] - x[:-2])
+            desviacion = np.abs(y[1:-1] - (y[:-2] + t * (y[2:] - y[:-2]))) / escala
+            desviacion = np.where(np.isfinite(desviacion), desviacion, 0.0)
+            curvo = np.zeros(len(x))
+            curvo[1:-1] = desviacion / tolerancia
+            puntaje = np.maximum(curvo[:-1], curvo[1:])
+
+            pendiente = np.abs(y1 - y0) / escala / 0.05
+            puntaje = np.maximum(puntaje, np.where(np.isfinite(pendiente), pendiente, 0.0))
+            puntaje[(y0 * y1) < 0] = np.inf
+        puntaje[np.isfinite(y0) != np.isfinite(y1)] = np.inf
+
+        candidatos = np.flatnonzero((puntaje > 1) & (np.diff(x) > ancho_minimo))
+        disponibles = max_puntos - len(x)
+        if len(candidatos) == 0 or disponibles <= 0:
+            break
+        if len(candidatos) > disponibles:
+            candidatos = candidatos[np.argsort(-puntaje[candidatos], kind='stable')[:disponibles]]
+
+        x_medio = (x[candidatos] + x[candidatos + 1]) / 2
+        y_medio = _evaluar_para_grafica(f, x_medio)
+        posiciones = candidatos + 1
+        x = np.insert(x, posiciones, x_medio)
+        y = np.insert(y, posiciones, y_medio)
+
+    return x, y
+
+
+def generar_puntos_grafica(funcion_str, x_min=None, x_max=None, raiz=None, num_puntos=500, adaptativo=False):
     """
     Genera puntos para graficar una función
     Si se proporciona raiz, centra la gráfica alrededor de ella
+
+    Con adaptativo=True, num_puntos es el máximo de puntos y se concentran cerca
+    de raíces, pendientes fuertes y discontinuidades (ver _muestreo_adaptativo);
+    si no, se usan num_puntos puntos equiespaciados.
     """
-    x_sym = sp.Symbol('x')
     try:
-        f_expr = sp.sympify(funcion_str)
-        f = sp.lambdify(x_sym, f_expr, modules=['numpy', 'math'])
+        f = obtener_expresion(funcion_str).f
 
         # Si hay raíz, centrar la gráfica alrededor de ella
         if raiz is not None and (x_min is None or x_max is None):
@@ -820,23 +1259,448 @@ def generar_puntos_grafica(funcion_str, x_min=None, x_max=None, raiz=None, num_p
             x_min = -10
             x_max = 10
 
-        x_vals = np.linspace(x_min, x_max, num_puntos)
-        y_vals = []
-
-        for x in x_vals:
-            try:
-                y = f(x)
-                # Limitar valores muy grandes para mejor visualización
-                if np.isfinite(y):
-                    if abs(y) > 1e6:
-                        y_vals.append(None)
-                    else:
-                        y_vals.append(y)
-                else:
-                    y_vals.append(None)
-            except:
-                y_vals.append(None)
+        if adaptativo:
+            x_vals, y_vals = _muestreo_adaptativo(f, float(x_min), float(x_max), num_puntos)
+        else:
+            x_vals = np.linspace(x_min, x_max, num_puntos)
+            y_vals = _evaluar_para_grafica(f, x_vals)
 
-        return x_vals.tolist(), y_vals
+        return x_vals.tolist(), _lista_json(y_vals)
     except Exception as e:
         return None, None
+
+
+# ===== MODO POR LOTES (VECTORIZADO) =====
+
+METODOS_LOTE = ('biseccion', 'regla-falsa', 'newton', 'secante')
+
+
+def evaluar_vectorial(f, x):
+    """
+    Evalúa una función compilada sobre un array completo
+
+    Si la función no acepta arrays (por ejemplo usa funciones de 'math'), se
+    evalúa punto por punto. Los puntos donde f no está definida quedan en NaN.
+
+    Retorna: numpy array de floats con la misma forma que x
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(all='ignore'):
+        try:
+            y = np.asarray(f(x), dtype=float)
+            return np.array(np.broadcast_to(y, x.shape), dtype=float)
+        except Exception:
+            pass
+
+        y = np.empty(x.shape)
+        for i, xi in np.ndenumerate(x):
+            try:
+                y[i] = float(f(xi))
+            except Exception:
+                y[i] = np.nan
+        return y
+
+
+def _error_carriles(x_nuevo, x_anterior, tipo_error):
+    """Error de cada carril con la misma regla que los métodos individuales"""
+    error = np.abs(x_nuevo - x_anterior)
+    if tipo_error == "relativo":
+        con_division = x_nuevo != 0
+        error[con_division] = error[con_division] / np.abs(x_nuevo[con_division])
+    return error
+
+
+def _lista_json(valores):
+    """Convierte un array a lista reemplazando NaN/infinito por None (JSON válido)"""
+    return [float(v) if np.isfinite(v) else None for v in valores]
+
+
+def _iterar_carriles(estado, paso, activos, tol, niter, tipo_error):
+    """
+    Ciclo común del modo por lotes: aplica 'paso' solo sobre los carriles activos
+
+    Parámetros:
+    estado: dict de arrays (todos de largo n) que incluye 'x' y 'fx'
+    paso: función que recibe el estado de los carriles activos y retorna
+          (estado_nuevo, fallo) donde fallo es una máscara booleana
+    activos: Máscara de carriles que todavía iteran (se modifica en el lugar)
+
+    Retorna: (iteraciones, errores, convergio, fallo, ciclos)
+    """
+    n = len(activos)
+    iteraciones = np.zeros(n, dtype=int)
+    errores = np.full(n, np.nan)
+    convergio = np.zeros(n, dtype=bool)
+    fallo = np.zeros(n, dtype=bool)
+    ciclos = 0
+
+    while ciclos < niter and activos.any():
+        idx = np.flatnonzero(activos)
+        sub = {clave: valores[idx] for clave, valores in estado.items()}
+        x_anterior = sub['x']
+
+        with np.errstate(all='ignore'):
+            sub, fallo_sub = paso(sub)
+            error = _error_carriles(sub['x'], x_anterior, tipo_error)
+
+        fallo_sub = fallo_sub | ~np.isfinite(sub['x']) | ~np.isfinite(sub['fx'])
+        ok = ~fallo_sub
+
+        # Solo se guardan los carriles que siguen siendo válidos
+        for clave, valores in sub.items():
+            estado[clave][idx[ok]] = valores[ok]
+        iteraciones[idx[ok]] += 1
+        errores[idx[ok]] = error[ok]
+
+        termino = ok & ((error < tol) | (sub['fx'] == 0))
+        convergio[idx[termino]] = True
+        fallo[idx[fallo_sub]] = True
+        activos[idx[termino | fallo_sub]] = False
+        ciclos += 1
+
+    return iteraciones, errores, convergio, fallo, ciclos
+
+
+def resolver_lote(metodo, funcion_str, tol, niter, xi=None, xs=None, x0=None, x1=None, tol_str=None):
+    """
+    Resuelve f(x) = 0 para muchos intervalos o valores iniciales a la vez
+
+    Todos los carriles avanzan juntos en un único ciclo de operaciones NumPy;
+    cada carril lleva su propia máscara de convergencia y su propio conteo
+    de iteraciones, y deja de iterar apenas converge o falla.
+
+    Parámetros:
+    metodo: 'biseccion', 'regla-falsa', 'newton' o 'secante'
+    funcion_str: String de la función f(x)
+    tol: Tolerancia
+    niter: Número máximo de iteraciones por carril
+    xi, xs: Arrays con los extremos de cada intervalo (bisección y regla falsa)
+    x0: Array de valores iniciales (Newton) o primeros puntos (secante)
+    x1: Array con los segundos puntos (secante)
+    tol_str: String original de la tolerancia (para detectar el tipo de error)
+
+    Retorna: dict con 'raices', 'iteraciones', 'convergio', 'validos', 'errores' por carril
+    """
+    if metodo not in METODOS_LOTE:
+        return {"exito": False, "mensaje": f"❌ Método '{metodo}' no disponible en modo por lotes.\n💡 Opciones: {', '.join(METODOS_LOTE)}"}
+
+    tipo_error = detectar_tipo_error(tol_str if tol_str is not None else str(tol))
+
+    try:
+        expresion = obtener_expresion(funcion_str, derivadas=1 if metodo == 'newton' else 0)
+        f = expresion.f
+    except SyntaxError:
+        return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
+    except Exception:
+        return {"exito": False, "mensaje": "❌ Error al procesar la función: Asegúrate de usar 'x' como variable.\n💡 Ejemplos: x**2-4, sin(x)-x/2, exp(x)-3*x"}
+
+    try:
+        if metodo in ('biseccion', 'regla-falsa'):
+            a, b = np.broadcast_arrays(np.asarray(xi, dtype=float), np.asarray(xs, dtype=float))
+            a, b = a.ravel().copy(), b.ravel().copy()
+        elif metodo == 'newton':
+            a = np.asarray(x0, dtype=float).ravel().copy()
+        else:
+            a, b = np.broadcast_arrays(np.asarray(x0, dtype=float), np.asarray(x1, dtype=float))
+            a, b = a.ravel().copy(), b.ravel().copy()
+    except (TypeError, ValueError):
+        return {"exito": False, "mensaje": "❌ Los valores iniciales deben ser listas de números de igual longitud"}
+
+    n = len(a)
+    raices = np.full(n, np.nan)
+    exactas = np.zeros(n, dtype=bool)
+
+    if metodo in ('biseccion', 'regla-falsa'):
+        fa = evaluar_vectorial(f, a)
+        fb = evaluar_vectorial(f, b)
+        validos = np.isfinite(fa) & np.isfinite(fb) & (fa * fb <= 0) & (a != b)
+
+        # Extremos que ya son raíz exacta
+        exacta_a = validos & (fa == 0)
+        exacta_b = validos & ~exacta_a & (fb == 0)
+        raices[exacta_a] = a[exacta_a]
+        raices[exacta_b] = b[exacta_b]
+        exactas = exacta_a | exacta_b
+
+        with np.errstate(all='ignore'):
+            if metodo == 'biseccion':
+                xm = (a + b) / 2
+            else:
+                xm = a - fa * (b - a) / (fb - fa)
+        fm = evaluar_vectorial(f, xm)
+
+        # El primer punto medio también puede caer justo en la raíz
+        exacta_m = validos & ~exactas & (fm == 0)
+        raices[exacta_m] = xm[exacta_m]
+        exactas = exactas | exacta_m
+        estado = {'a': a, 'b': b, 'fa': fa, 'fb': fb, 'x': xm, 'fx': fm}
+
+        def paso(s):
+            izquierda = s['fa'] * s['fx'] < 0
+            s['b'] = np.where(izquierda, s['x'], s['b'])
+            s['fb'] = np.where(izquierda, s['fx'], s['fb'])
+            s['a'] = np.where(izquierda, s['a'], s['x'])
+            s['fa'] = np.where(izquierda, s['fa'], s['fx'])
+            if metodo == 'biseccion':
+                s['x'] = (s['a'] + s['b']) / 2
+            else:
+                s['x'] = s['a'] - s['fa'] * (s['b'] - s['a']) / (s['fb'] - s['fa'])
+            s['fx'] = evaluar_vectorial(f, s['x'])
+            return s, np.zeros(len(s['x']), dtype=bool)
+
+    elif metodo == 'newton':
+        df = expresion.derivada(1)[1]
+        fx = evaluar_vectorial(f, a)
+        dfx = evaluar_vectorial(df, a)
+        validos = np.isfinite(fx) & np.isfinite(dfx)
+        exactas = validos & (fx == 0)
+        raices[exactas] = a[exactas]
+        estado = {'x': a, 'fx': fx, 'dfx': dfx}
+        # Newton usa error absoluto, igual que newton_raphson
+        tipo_error = "absoluto"
+
+        def paso(s):
+            fallo = np.abs(s['dfx']) < 1e-15
+            s['x'] = s['x'] - s['fx'] / s['dfx']
+            s['fx'] = evaluar_vectorial(f, s['x'])
+            s['dfx'] = evaluar_vectorial(df, s['x'])
+            fallo |= ~np.isfinite(s['dfx']) | (np.abs(s['x']) > 1e10)
+            return s, fallo
+
+    else:
+        f0 = evaluar_vectorial(f, a)
+        f1 = evaluar_vectorial(f, b)
+        validos = np.isfinite(f0) & np.isfinite(f1) & (a != b)
+        exacta_0 = validos & (f0 == 0)
+        exacta_1 = validos & ~exacta_0 & (f1 == 0)
+        raices[exacta_0] = a[exacta_0]
+        raices[exacta_1] = b[exacta_1]
+        exactas = exacta_0 | exacta_1
+        estado = {'x_ant': a, 'f_ant': f0, 'x': b, 'fx': f1, 'grandes': np.zeros(n)}
+
+        def paso(s):
+            denom = s['fx'] - s['f_ant']
+            fallo = np.abs(denom) < 1e-15
+            x2 = s['x'] - s['fx'] * (s['x'] - s['x_ant']) / denom
+            s['grandes'] = np.where(np.abs(x2) > 1e10, s['grandes'] + 1, 0)
+            fallo |= s['grandes'] >= 3
+            s['x_ant'], s['f_ant'] = s['x'], s['fx']
+            s['x'] = x2
+            s['fx'] = evaluar_vectorial(f, x2)
+            return s, fallo
+
+    activos = validos & ~exactas
+    iteraciones, errores, convergio, fallo, ciclos = _iterar_carriles(
+        estado, paso, activos, tol, niter, tipo_error)
+
+    convergio |= exactas
+    errores[exactas] = 0.0
+    con_raiz = validos & ~exactas & ~fallo
+    raices[con_raiz] = estado['x'][con_raiz]
+    valores_f = evaluar_vectorial(f, raices)
+
+    convergidos = int(convergio.sum())
+
+    return {
+        "exito": True,
+        "metodo": metodo,
+        "carriles": n,
+        "raices": _lista_json(raices),
+        "valores_f": _lista_json(valores_f),
+        "iteraciones": iteraciones.tolist(),
+        "errores": _lista_json(errores),
+        "convergio": convergio.tolist(),
+        "validos": validos.tolist(),
+        "fallo": fallo.tolist(),
+        "convergidos": convergidos,
+        "ciclos": int(ciclos),
+        "tipo_error": tipo_error,
+        "mensaje": f"{convergidos} de {n} carriles convergieron en {ciclos} ciclos vectorizados"
+    }
+
+
+# ===== BÚSQUEDA AUTOMÁTICA DE INTERVALOS Y DE TODAS LAS RAÍCES =====
+
+RAZON_AUREA = (math.sqrt(5) - 1) / 2
+
+
+def buscar_intervalos(funcion_str, x_min, x_max, num_puntos=1000):
+    """
+    Evalúa f(x) en una malla uniforme sobre [x_min, x_max] y detecta dónde puede haber raíces
+
+    Se buscan:
+    - Cambios de signo entre dos puntos consecutivos de la malla
+    - Puntos de la malla donde f(x) es exactamente cero
+    - Mínimos locales de |f(x)| sin cambio de signo (candidatos a raíces de
+      multiplicidad par, como (x-1)**2, que bisección no puede acotar)
+
+    Retorna: dict con 'intervalos', 'raices_exactas', 'minimos' (ventanas [a, b]), 'x', 'y'
+    """
+    f = obtener_expresion(funcion_str).f
+
+    x = np.linspace(x_min, x_max, num_puntos)
+    y = evaluar_vectorial(f, x)
+    finitos = np.isfinite(y)
+
+    # Cambios de signo estrictos entre vecinos con valores definidos
+    vecinos_finitos = finitos[:-1] & finitos[1:]
+    cambio = vecinos_finitos & (np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+    idx_cambio = np.flatnonzero(cambio)
+
+    raices_exactas = x[finitos & (y == 0)]
+
+    # Mínimos locales de |f| donde los tres puntos tienen el mismo signo
+    abs_y = np.abs(y)
+    centro = slice(1, -1)
+    mismo_signo = (np.sign(y[:-2]) == np.sign(y[1:-1])) & (np.sign(y[1:-1]) == np.sign(y[2:]))
+    es_minimo = (finitos[:-2] & finitos[1:-1] & finitos[2:] & mismo_signo & (y[centro] != 0)
+                 & (abs_y[centro] <= abs_y[:-2]) & (abs_y[centro] <= abs_y[2:])
+                 & ((abs_y[centro] < abs_y[:-2]) | (abs_y[centro] < abs_y[2:])))
+    idx_minimo = np.flatnonzero(es_minimo) + 1
+
+    return {
+        "intervalos": np.column_stack((x[idx_cambio], x[idx_cambio + 1])),
+        "raices_exactas": raices_exactas,
+        "minimos": np.column_stack((x[idx_minimo - 1], x[idx_minimo + 1])),
+        "x": x,
+        "y": y
+    }
+
+
+def _minimizar_abs_lote(f, a, b, max_iter=200):
+    """
+    Sección áurea vectorizada: minimiza |f(x)| en cada ventana [a_i, b_i] a la vez
+
+    Retorna: (x_min, iteraciones) con el punto encontrado en cada ventana
+    """
+    a = a.astype(float).copy()
+    b = b.astype(float).copy()
+    iteraciones = 0
+
+    c = b - RAZON_AUREA * (b - a)
+    d = a + RAZON_AUREA * (b - a)
+    fc = np.abs(evaluar_vectorial(f, c))
+    fd = np.abs(evaluar_vectorial(f, d))
+
+    while iteraciones < max_iter and np.any(b - a > 4 * np.finfo(float).eps * np.maximum(1.0, np.abs(a))):
+        izquierda = fc < fd
+        # Mínimo en [a, d]: el nuevo d es el antiguo c
+        b = np.where(izquierda, d, b)
+        a = np.where(izquierda, a, c)
+        nuevo_c = b - RAZON_AUREA * (b - a)
+        nuevo_d = a + RAZON_AUREA * (b - a)
+        c_eval = np.where(izquierda, nuevo_c, d)
+        d_eval = np.where(izquierda, c, nuevo_d)
+        fc_nuevo = np.where(izquierda, np.abs(evaluar_vectorial(f, nuevo_c)), fd)
+        fd_nuevo = np.where(izquierda, fc, np.abs(evaluar_vectorial(f, nuevo_d)))
+        c, d, fc, fd = c_eval, d_eval, fc_nuevo, fd_nuevo
+        iteraciones += 1
+
+    return (a + b) / 2, iteraciones
+
+
+def buscar_todas_raices(funcion_str, x_min, x_max, tol, niter, metodo='biseccion',
+                        num_puntos=1000, tol_str=None, tol_f=None):
+    """
+    Encuentra todas las raíces de f(x) en [x_min, x_max] en una sola llamada
+
+    Primero detecta los intervalos con cambio de signo (buscar_intervalos) y
+    luego los resuelve todos juntos con el modo por lotes de bisección o regla
+    falsa. Los mínimos de |f| sin cambio de signo se refinan con sección áurea
+    y se aceptan como raíces de multiplicidad par si |f| es prácticamente cero.
+
+    Parámetros:
+    funcion_str: String de la función f(x)
+    x_min, x_max: Rango donde buscar
+    tol, niter: Tolerancia e iteraciones máximas para refinar cada raíz
+    metodo: 'biseccion' o 'regla-falsa'
+    num_puntos: Puntos de la malla de búsqueda
+    tol_str: String original de la tolerancia (para detectar el tipo de error)
+    tol_f: Umbral para aceptar |f(x)| ≈ 0 en raíces sin cambio de signo
+
+    Retorna: dict con 'raices' ordenadas y 'detalle' por raíz
+    """
+    if metodo not in ('biseccion', 'regla-falsa'):
+        return {"exito": False, "mensaje": "❌ La búsqueda de raíces usa 'biseccion' o 'regla-falsa'"}
+
+    try:
+        f = obtener_expresion(funcion_str).f
+    except SyntaxError:
+        return {"exito": False, "mensaje": "❌ Error de sintaxis en la función. Verifica que esté bien escrita.\n💡 Ejemplo correcto: x**3 - 2*x - 5"}
+    except Exception:
+        return {"exito": False, "mensaje": "❌ Error al procesar la función: Asegúrate de usar 'x' como variable.\n💡 Ejemplos: x**2-4, sin(x)-x/2, exp(x)-3*x"}
+
+    busqueda = buscar_intervalos(funcion_str, x_min, x_max, num_puntos)
+    intervalos = busqueda["intervalos"]
+    y_finitos = np.abs(busqueda["y"][np.isfinite(busqueda["y"])])
+
+    if y_finitos.size == 0:
+        return {"exito": False,
+                "mensaje": f"❌ La función no está definida en ningún punto de [{x_min}, {x_max}]\n\n🔧 Solución: Cambia el rango de búsqueda"}
+
+    if tol_f is None:
+        tol_f = 1e-8 * max(1.0, float(np.median(y_finitos)))
+
+    detalle = []
+    descartados = 0
+
+    for raiz in busqueda["raices_exactas"]:
+        detalle.append({"raiz": float(raiz), "tipo": "exacta", "intervalo": [float(raiz), float(raiz)],
+                        "iteraciones": 0, "f(raiz)": 0.0})
+
+    # Resolver todos los intervalos con cambio de signo en un solo lote
+    if len(intervalos):
+        lote = resolver_lote(metodo, funcion_str, tol, niter, xi=intervalos[:, 0], xs=intervalos[:, 1], tol_str=tol_str)
+        f_extremos = np.minimum(np.abs(evaluar_vectorial(f, intervalos[:, 0])),
+                                np.abs(evaluar_vectorial(f, intervalos[:, 1])))
+
+        for i, raiz in enumerate(lote["raices"]):
+            f_raiz = lote["valores_f"][i]
+            # En una discontinuidad (ej: tan(x) en pi/2) el "cambio de signo" lleva a |f| enorme
+            if raiz is None or f_raiz is None or abs(f_raiz) > f_extremos[i]:
+                descartados += 1
+                continue
+            detalle.append({"raiz": raiz, "tipo": "cambio_signo",
+                            "intervalo": intervalos[i].tolist(),
+                            "iteraciones": lote["iteraciones"][i], "f(raiz)": f_raiz,
+                            "convergio": lote["convergio"][i]})
+
+    # Raíces de multiplicidad par: |f| toca cero sin cambiar de signo
+    minimos = busqueda["minimos"]
+    if len(minimos):
+        candidatos, pasos = _minimizar_abs_lote(f, minimos[:, 0], minimos[:, 1])
+        f_candidatos = evaluar_vectorial(f, candidatos)
+        for i, raiz in enumerate(candidatos):
+            if np.isfinite(f_candidatos[i]) and abs(f_candidatos[i]) <= tol_f:
+                detalle.append({"raiz": float(raiz), "tipo": "multiplicidad_par",
+                                "intervalo": minimos[i].tolist(),
+                                "iteraciones": pasos, "f(raiz)": float(f_candidatos[i])})
+
+    detalle.sort(key=lambda d: d["raiz"])
+
+    # Eliminar repetidos (la misma raíz detectada por dos vías)
+    unicos = []
+    for d in detalle:
+        if unicos and abs(d["raiz"] - unicos[-1]["raiz"]) <= max(2 * tol, 1e-12):
+            continue
+        unicos.append(d)
+
+    raices = [d["raiz"] for d in unicos]
+
+    if raices:
+        mensaje = f"✅ Se encontraron {len(raices)} raíces en [{x_min}, {x_max}]"
+    else:
+        mensaje = f"⚠️ No se encontraron raíces en [{x_min}, {x_max}].\n\n🔧 Soluciones:\n   1. Amplía el rango de búsqueda\n   2. Aumenta el número de puntos de la malla"
+
+    return {
+        "exito": True,
+        "raices": raices,
+        "num_raices": len(raices),
+        "detalle": unicos,
+        "intervalos_detectados": int(len(intervalos)),
+        "minimos_revisados": int(len(minimos)),
+        "descartados": descartados,
+        "metodo": metodo,
+        "tipo_error": detectar_tipo_error(tol_str if tol_str is not None else str(tol)),
+        "mensaje": mensaje
+    }
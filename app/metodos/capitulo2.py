@@ -1,8 +1,14 @@
 """
 Métodos numéricos del Capítulo 2: Sistemas de ecuaciones lineales iterativos
-Incluye: Jacobi, Gauss-Seidel y SOR
+Incluye: Jacobi, Gauss-Seidel y SOR (densos y dispersos en formato CSR, con
+factor de relajación automático en SOR y tres formas de barrer las
+componentes en Gauss-Seidel/SOR) y los métodos de Krylov CG, BiCGSTAB y GMRES
+con precondicionadores
 """
 
+import base64
+from collections import deque
+
 import numpy as np
 
 
@@ -17,169 +23,777 @@ def calcular_error(x_actual, x_anterior):
     return float(np.linalg.norm(x_actual - x_anterior, np.inf))
 
 
-def jacobi(A, b, x0, tol, niter):
+def sustitucion_progresiva(M, r):
     """
-    Método de Jacobi para resolver sistemas de ecuaciones lineales
+    Resuelve M x = r con M triangular inferior (diagonal no nula) en O(n^2)
 
     Parámetros:
-    A: Matriz de coeficientes (numpy array)
-    b: Vector de términos independientes (numpy array)
-    x0: Vector inicial (numpy array)
-    tol: Tolerancia para el error (norma infinito)
-    niter: Número máximo de iteraciones
+    M: Matriz triangular inferior (numpy array n x n)
+    r: Lado derecho (vector de n elementos o matriz n x k)
 
-    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'radio_espectral', 'converge'
+    Retorna: numpy array con la solución (misma forma que r)
     """
-    try:
-        n = len(A)
-        c = 0
-        error = tol + 1
-        tabla_datos = []
+    x = np.empty(np.shape(r), dtype=float)
+    for i in range(len(M)):
+        x[i] = (r[i] - M[i, :i] @ x[:i]) / M[i, i]
+    return x
+
+
+def sustitucion_regresiva(M, r):
+    """
+    Resuelve M x = r con M triangular superior (diagonal no nula) en O(n^2)
+
+    Parámetros:
+    M: Matriz triangular superior (numpy array n x n)
+    r: Lado derecho (vector de n elementos o matriz n x k)
+
+    Retorna: numpy array con la solución (misma forma que r)
+    """
+    x = np.empty(np.shape(r), dtype=float)
+    for i in range(len(M) - 1, -1, -1):
+        x[i] = (r[i] - M[i, i+1:] @ x[i+1:]) / M[i, i]
+    return x
 
-        # Descomposición de la matriz A
-        D = np.diag(np.diag(A))
+
+class IteracionEstacionaria:
+    """
+    Método iterativo estacionario x^(k+1) = T x^(k) + C a partir de la partición A = M - N
+
+    Con A = D - L - U (D diagonal, L y U partes estrictamente triangulares con signo cambiado):
+    - Jacobi:       M = D,        N = L + U
+    - Gauss-Seidel: M = D - L,    N = U
+    - SOR:          M = D - w*L,  N = (1-w)*D + w*U   (y el lado derecho es w*b)
+
+    M, N y la diagonal se calculan una sola vez. Cada paso cuesta O(n^2):
+    Jacobi solo escala por la diagonal y Gauss-Seidel/SOR resuelven un
+    sistema triangular inferior, sin formar nunca inversas.
+    """
+
+    def __init__(self, A, b, metodo, w=1.0):
+        self.metodo = metodo
+        self.n = len(A)
+        self.diagonal = np.diag(A).astype(float)
+        if np.any(self.diagonal == 0):
+            raise ValueError("La matriz tiene ceros en la diagonal")
+
+        D = np.diag(self.diagonal)
         L = -np.tril(A, -1)
         U = -np.triu(A, 1)
 
-        # Calcular matriz de iteración T y radio espectral
-        T = np.linalg.inv(D) @ (L + U)
-        radio_espectral = max(abs(np.linalg.eigvals(T)))
+        if metodo == 'jacobi':
+            self.M = None
+            self.N = L + U
+            self.lado_derecho = np.asarray(b, dtype=float)
+        elif metodo == 'gauss_seidel':
+            self.M = D - L
+            self.N = U
+            self.lado_derecho = np.asarray(b, dtype=float)
+        elif metodo == 'sor':
+            self.M = D - w * L
+            self.N = (1 - w) * D + w * U
+            self.lado_derecho = w * np.asarray(b, dtype=float)
+        else:
+            raise ValueError(f"Método '{metodo}' no reconocido")
 
-        # Guardar estado inicial
-        tabla_datos.append({
-            "iter": 0,
-            "x": x0.copy().tolist(),
-            "error": None
-        })
+    def resolver_M(self, r):
+        """Resuelve M y = r (escala diagonal en Jacobi, sustitución progresiva en GS/SOR)"""
+        if self.M is None:
+            return r / self.diagonal if np.ndim(r) == 1 else r / self.diagonal[:, None]
+        return sustitucion_progresiva(self.M, r)
 
-        x_prev = x0.copy()
+    def paso(self, x):
+        """Calcula x^(k+1) = M^(-1) (N x^(k) + lado derecho)"""
+        return self.resolver_M(self.N @ x + self.lado_derecho)
 
-        while error > tol and c < niter:
-            # Jacobi: x^(k+1) = T * x^(k) + C
-            C = np.linalg.inv(D) @ b
-            x1 = T @ x_prev + C
+    def paso_columnas(self, X, columnas):
+        """Paso de bloque: X (n x len(columnas)) con esas columnas del lado derecho"""
+        return self.resolver_M(self.N @ X + self.lado_derecho[:, columnas])
 
-            # Calcular error (norma infinito como el profesor)
-            error = calcular_error(x1, x_prev)
+    def aplicar_T(self, v):
+        """Producto T v = M^(-1) N v sin formar T"""
+        return self.resolver_M(self.N @ v)
 
-            c += 1
-            tabla_datos.append({
-                "iter": int(c),
-                "x": x1.copy().tolist(),
-                "error": error
-            })
+    def matriz_T(self):
+        """Matriz de iteración T = M^(-1) N (densa, solo para análisis espectral)"""
+        return self.resolver_M(self.N)
 
-            x_prev = x1.copy()
 
-        converge = bool(radio_espectral < 1)
+# ===== KERNELS DE BARRIDO (GAUSS-SEIDEL Y SOR) =====
 
-        # Extraer lista de errores
-        errores_lista = []
-        for dato in tabla_datos:
-            error_val = dato.get("error")
-            if error_val is not None:
-                errores_lista.append(error_val)
+# Formas de calcular un paso de Gauss-Seidel/SOR denso:
+# - 'matricial':  M x^(k+1) = N x^(k) + b con M triangular (IteracionEstacionaria)
+# - 'por_filas':  barrido en su lugar, x_i <- x_i + w (b_i - A_i x) / a_ii, con
+#                 un producto punto por fila y sin construir M ni N
+# - 'rojo_negro': las componentes se agrupan en colores sin acoplamiento entre
+#                 sí (rojo y negro en matrices tridiagonales o de 5 puntos) y
+#                 cada color se actualiza con una sola operación vectorizada
+KERNELS_BARRIDO = ('matricial', 'por_filas', 'rojo_negro')
 
-        return {
-            "exito": bool(error < tol),
-            "solucion": x_prev.tolist(),
-            "iteraciones": int(c),
-            "tabla": tabla_datos,
-            "errores": errores_lista,  # Lista de errores para comparación
-            "radio_espectral": float(radio_espectral),
-            "converge": converge,
-            "mensaje": f"Solución encontrada en {c} iteraciones" if error < tol else f"No convergió en {niter} iteraciones",
-            "error_final": float(error)
-        }
-    except Exception as e:
-        return {"exito": False, "mensaje": f"Error: {str(e)}"}
 
+def colorear_componentes(A):
+    """
+    Agrupa las componentes en colores tales que a_ij = a_ji = 0 para i != j del
+    mismo color (coloración voraz en orden natural del grafo de la matriz)
+
+    En matrices tridiagonales y de diferencias finitas de 5 puntos resultan
+    dos colores (ordenamiento rojo-negro); en una matriz llena, n colores.
+
+    Acepta una matriz densa o una MatrizCSR (en ese caso recorre solo los
+    elementos no nulos, O(nnz)).
 
-def gauss_seidel(A, b, x0, tol, niter):
+    Retorna: lista de arrays de índices, uno por color
     """
-    Método de Gauss-Seidel para resolver sistemas de ecuaciones lineales
+    if isinstance(A, MatrizCSR):
+        return _colorear_csr(A)
+
+    n = len(A)
+    acoplados = (A != 0) | (A != 0).T
+    colores = np.full(n, -1, dtype=np.int64)
+    for i in range(n):
+        # Menor color que no usa ningún vecino anterior
+        usados = np.zeros(i + 1, dtype=bool)
+        usados[colores[:i][acoplados[i, :i]]] = True
+        colores[i] = int(np.argmin(usados))
+    return [np.flatnonzero(colores == color) for color in range(int(colores.max()) + 1)]
+
+
+def _colorear_csr(A):
+    """Coloración voraz de colorear_componentes sobre la estructura de una MatrizCSR"""
+    n = A.n
+    # Vecinos anteriores de cada componente en el grafo de A + A^T (sin la diagonal)
+    filas = np.concatenate([A.filas, A.indices])
+    columnas = np.concatenate([A.indices, A.filas])
+    anteriores = columnas < filas
+    filas, columnas = filas[anteriores], columnas[anteriores]
+    orden = np.argsort(filas, kind='stable')
+    vecinos = columnas[orden].tolist()
+    inicio = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(filas, minlength=n), out=inicio[1:])
+    inicio = inicio.tolist()
+
+    colores = [0] * n
+    for i in range(n):
+        if inicio[i] == inicio[i + 1]:
+            continue
+        usados = {colores[j] for j in vecinos[inicio[i]:inicio[i + 1]]}
+        color = 0
+        while color in usados:
+            color += 1
+        colores[i] = color
+
+    colores = np.array(colores, dtype=np.int64)
+    por_color = np.argsort(colores, kind='stable')
+    return np.split(por_color, np.cumsum(np.bincount(colores))[:-1])
+
+
+class IteracionPorComponentes:
+    """
+    Gauss-Seidel y SOR barriendo las componentes de x en su lugar
+
+    Cada componente se corrige con el residuo de su fila usando los valores ya
+    actualizados: x_i <- x_i + w (b_i - A_i x) / a_ii (w = 1 en Gauss-Seidel).
+    Es la misma iteración que IteracionEstacionaria (orden 'natural') sin
+    construir M ni N. Con orden 'rojo_negro' se recorren los colores de
+    colorear_componentes: dentro de un color ninguna componente depende de
+    otra, así que todas se actualizan juntas (Gauss-Seidel/SOR en el orden
+    permutado por colores: distintas iteraciones, misma solución).
+
+    Tiene la interfaz de IteracionEstacionaria (paso, paso_columnas,
+    aplicar_T, matriz_T) para usarse en _resolver_estacionario y _resolver_bloque.
+    """
+
+    def __init__(self, A, b, metodo, w=1.0, orden='natural'):
+        if metodo not in ('gauss_seidel', 'sor'):
+            raise ValueError(f"Método '{metodo}' no reconocido")
+        if orden not in ('natural', 'rojo_negro'):
+            raise ValueError(f"Orden '{orden}' no reconocido")
+
+        self.A = np.asarray(A, dtype=float)
+        self.n = len(self.A)
+        self.diagonal = np.diag(self.A).copy()
+        if np.any(self.diagonal == 0):
+            raise ValueError("La matriz tiene ceros en la diagonal")
+
+        self.metodo = metodo
+        self.w = 1.0 if metodo == 'gauss_seidel' else float(w)
+        self.lado_derecho = np.asarray(b, dtype=float)
+        self.orden = orden
+        escala = self.w / self.diagonal
+
+        # Vistas de las filas y escalas como floats de Python: menos costo por fila
+        self._filas = list(self.A)
+        self._escala = escala.tolist()
+
+        # Grupos que se actualizan juntos: (índices, sus filas de A, w / a_ii), o
+        # (i, None, None) para una sola componente (se actualiza como escalar)
+        if orden == 'rojo_negro':
+            self.colores = colorear_componentes(self.A)
+            self._grupos = [(int(indices[0]), None, None) if len(indices) == 1
+                            else (indices, self.A[indices], escala[indices]) for indices in self.colores]
+        else:
+            self.colores = None
+            self._grupos = [(i, None, None) for i in range(self.n)]
+
+    def _barrer(self, X, B):
+        """Un barrido sobre X (vector o matriz n x k), modificándolo en su lugar"""
+        # Con un solo lado derecho, b_i como float de Python (más rápido que indexar el array)
+        b = B.tolist() if X.ndim == 1 else B
+
+        for indices, filas, escala in self._grupos:
+            if filas is None:
+                X[indices] += self._escala[indices] * (b[indices] - self._filas[indices].dot(X))
+            else:
+                if X.ndim == 2:
+                    escala = escala[:, None]
+                X[indices] += escala * (B[indices] - filas @ X)
+        return X
+
+    def paso(self, x):
+        """Calcula x^(k+1) a partir de x^(k) sin modificar x"""
+        return self._barrer(np.array(x, dtype=float), self.lado_derecho)
+
+    def paso_columnas(self, X, columnas):
+        """Paso de bloque: X (n x len(columnas)) con esas columnas del lado derecho"""
+        return self._barrer(np.array(X, dtype=float), self.lado_derecho[:, columnas])
+
+    def aplicar_T(self, v):
+        """Producto T v: el mismo barrido con lado derecho nulo"""
+        return self._barrer(np.array(v, dtype=float), np.zeros(np.shape(v)))
+
+    def matriz_T(self):
+        """Matriz de iteración (densa, solo para análisis espectral)"""
+        return self.aplicar_T(np.eye(self.n))
+
+
+def crear_iteracion(A, b, metodo, w=1.0, kernel='matricial'):
+    """
+    Iteración de Gauss-Seidel o SOR densa con el kernel elegido (ver KERNELS_BARRIDO)
+    """
+    if kernel not in KERNELS_BARRIDO:
+        raise ValueError(f"Kernel '{kernel}' no reconocido. Opciones: {', '.join(KERNELS_BARRIDO)}")
+    if kernel == 'matricial':
+        return IteracionEstacionaria(A, b, metodo, w)
+    return IteracionPorComponentes(A, b, metodo, w, 'rojo_negro' if kernel == 'rojo_negro' else 'natural')
+
+
+def _informar_kernel(resultado, iteracion, kernel):
+    """Agrega al resultado el kernel usado (y los colores en 'rojo_negro'), si no es el matricial"""
+    if kernel != 'matricial' and "solucion" in resultado:
+        resultado["kernel"] = kernel
+        if getattr(iteracion, 'colores', None) is not None:
+            resultado["colores"] = len(iteracion.colores)
+    return resultado
+
+
+# ===== ESTIMACIÓN DEL RADIO ESPECTRAL =====
+
+# Estimadores disponibles para el radio espectral de T
+ESTIMADORES_RADIO = ('auto', 'exacto', 'potencia', 'arnoldi', 'a_posteriori')
+
+# Hasta este tamaño 'auto' usa np.linalg.eigvals sobre la T densa
+N_RADIO_EXACTO = 50
+
+# Iteraciones finales que usa la estimación a posteriori
+VENTANA_RADIO_ERRORES = 5
+
+# Máximo de lados derechos (columnas de B) que se resuelven juntos en modo bloque
+MAX_LADOS_DERECHOS = 10000
+
+
+def _vector_inicial(n):
+    """Vector aleatorio reproducible y normalizado para los métodos de Krylov"""
+    v = np.random.default_rng(0).standard_normal(n)
+    return v / np.linalg.norm(v)
+
+
+def radio_por_potencia(aplicar_T, n, max_iter=100, tol=1e-5):
+    """
+    Estima el radio espectral con el método de la potencia
+
+    Usa la media geométrica de dos razones consecutivas ||T v_k|| para que
+    los pares de autovalores dominantes ±ρ o complejos conjugados no hagan
+    oscilar la estimación.
+    """
+    v = _vector_inicial(n)
+    normas = []
+    estimacion = 0.0
+
+    for _ in range(max_iter):
+        w = aplicar_T(v)
+        norma = float(np.linalg.norm(w))
+        if norma == 0 or not np.isfinite(norma):
+            return 0.0 if norma == 0 else float('inf')
+
+        normas.append(norma)
+        v = w / norma
+
+        if len(normas) >= 2:
+            anterior = estimacion
+            estimacion = float(np.sqrt(normas[-1] * normas[-2]))
+            if abs(estimacion - anterior) <= tol * estimacion:
+                break
+
+    return estimacion if len(normas) >= 2 else normas[-1]
+
+
+def radio_por_arnoldi(aplicar_T, n, m=None):
+    """
+    Estima el radio espectral con m pasos de Arnoldi
+
+    Construye una base ortonormal del subespacio de Krylov de T y toma el mayor
+    módulo de los valores de Ritz (autovalores de la Hessenberg H de m x m).
+    Para n <= m el resultado coincide con el radio espectral exacto.
+    """
+    if m is None:
+        # Limitar la base de Krylov a unos 16 millones de números
+        m = min(n, 20, max(5, 16000000 // n))
+
+    V = np.zeros((m + 1, n))
+    H = np.zeros((m + 1, m))
+    V[0] = _vector_inicial(n)
+    pasos = m
+
+    for j in range(m):
+        w = aplicar_T(V[j])
+
+        # Gram-Schmidt modificado
+        for i in range(j + 1):
+            H[i, j] = V[i] @ w
+            w = w - H[i, j] * V[i]
+
+        H[j + 1, j] = np.linalg.norm(w)
+        if H[j + 1, j] <= 1e-12 * max(1.0, np.abs(H[:j + 1, j]).max()):
+            # Subespacio invariante: los valores de Ritz son autovalores exactos
+            pasos = j + 1
+            break
+        V[j + 1] = w / H[j + 1, j]
+
+    return float(max(abs(np.linalg.eigvals(H[:pasos, :pasos]))))
+
+
+def radio_por_errores(errores, ventana=VENTANA_RADIO_ERRORES):
+    """
+    Estimación a posteriori del radio espectral a partir de los errores de la solución
+
+    Como ||x^(k) - x^(k-1)|| ~ C ρ^k, se toma la media geométrica de las razones
+    e_k / e_(k-1) en las últimas 'ventana' iteraciones.
+    Retorna None si hay menos de 3 errores.
+    """
+    if len(errores) < 3:
+        return None
+
+    ultimo = errores[-1]
+    if ultimo == 0:
+        return 0.0
+
+    pasos = min(ventana, len(errores) - 1)
+    inicial = errores[-1 - pasos]
+    if inicial == 0 or not np.isfinite(ultimo) or not np.isfinite(inicial):
+        return float('inf') if not np.isfinite(ultimo) else None
+
+    return float((ultimo / inicial) ** (1.0 / pasos))
+
+
+def estimar_radio_espectral(iteracion, estimador='auto', errores=None):
+    """
+    Calcula o estima el radio espectral de la matriz de iteración T
 
     Parámetros:
-    A: Matriz de coeficientes (numpy array)
-    b: Vector de términos independientes (numpy array)
-    x0: Vector inicial (numpy array)
-    tol: Tolerancia para el error (norma infinito)
-    niter: Número máximo de iteraciones
+    iteracion: IteracionEstacionaria o IteracionDispersa (deben tener aplicar_T)
+    estimador: 'exacto', 'potencia', 'arnoldi', 'a_posteriori' o 'auto'
+               ('auto' = exacto en matrices densas de hasta N_RADIO_EXACTO,
+               a posteriori en dispersas y Arnoldi en el resto)
+    errores: Errores de la solución (requeridos por 'a_posteriori')
 
-    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'radio_espectral', 'converge'
+    Retorna: (radio, estimador_usado)
     """
-    try:
-        n = len(A)
-        c = 0
-        error = tol + 1
-        tabla_datos = []
+    if estimador not in ESTIMADORES_RADIO:
+        raise ValueError(f"Estimador '{estimador}' no reconocido. Opciones: {', '.join(ESTIMADORES_RADIO)}")
+
+    densa = hasattr(iteracion, 'matriz_T')
+    if estimador == 'auto':
+        if densa and iteracion.n <= N_RADIO_EXACTO:
+            estimador = 'exacto'
+        elif not densa and errores is not None:
+            estimador = 'a_posteriori'
+        else:
+            estimador = 'arnoldi'
 
-        # Descomposición de la matriz A
-        D = np.diag(np.diag(A))
-        L = -np.tril(A, -1)
-        U = -np.triu(A, 1)
+    if estimador == 'a_posteriori':
+        radio = radio_por_errores(errores if errores is not None else [])
+        if radio is not None:
+            return radio, estimador
+        # Muy pocas iteraciones para estimar: usar Arnoldi
+        estimador = 'arnoldi'
+
+    if estimador == 'exacto':
+        if not densa:
+            raise ValueError("El estimador 'exacto' solo está disponible para matrices densas")
+        return float(max(abs(np.linalg.eigvals(iteracion.matriz_T())))), estimador
+
+    if estimador == 'potencia':
+        return radio_por_potencia(iteracion.aplicar_T, iteracion.n), estimador
+
+    return radio_por_arnoldi(iteracion.aplicar_T, iteracion.n), estimador
+
+
+# ===== HISTORIAL DE ITERACIONES =====
 
-        # Calcular matriz de iteración T y radio espectral
-        T = np.linalg.inv(D - L) @ U
-        radio_espectral = max(abs(np.linalg.eigvals(T)))
+# Formatos de la tabla de iteraciones en el resultado
+FORMATOS_TABLA = ('filas', 'columnas', 'base64')
 
-        # Guardar estado inicial
-        tabla_datos.append({
+
+class HistorialIteraciones:
+    """
+    Historial de iteraciones guardado en arreglos float64 que crecen por duplicación
+
+    Los vectores x quedan en una matriz (iteraciones guardadas x n) en vez de
+    una lista de Python por iteración. Los errores de todas las iteraciones se
+    guardan siempre (los usan la comparación de métodos y la estimación a
+    posteriori del radio espectral).
+
+    Parámetros:
+    cada_k: Guardar x solo cada k iteraciones (la inicial y la final siempre se guardan)
+    ultimos_n: Si se indica, guardar solo los últimos n vectores (búfer circular)
+    formato: Cómo se serializa la tabla:
+             'filas'    = [{"iter", "x", "error"}, ...] (formato original)
+             'columnas' = {"iter": [...], "x": [[...], ...], "error": [...]}
+             'base64'   = como 'columnas', con x y error en bytes float64
+                          (little-endian) codificados en base64
+    """
+
+    def __init__(self, cada_k=1, ultimos_n=None, formato='filas', capacidad=64):
+        if int(cada_k) < 1:
+            raise ValueError("cada_k debe ser un entero positivo")
+        if ultimos_n is not None and int(ultimos_n) < 1:
+            raise ValueError("ultimos_n debe ser un entero positivo")
+        if formato not in FORMATOS_TABLA:
+            raise ValueError(f"Formato de tabla '{formato}' no reconocido. Opciones: {', '.join(FORMATOS_TABLA)}")
+
+        self.cada_k = int(cada_k)
+        self.ultimos_n = int(ultimos_n) if ultimos_n is not None else None
+        self.formato = formato
+        self._capacidad = self.ultimos_n or capacidad
+
+        # Se reservan al guardar el primer vector (ahí se conoce n)
+        self._iters = None
+        self._x = None
+        self._errores_x = None
+        self._guardadas = 0
+
+        self._errores = np.empty(capacidad)
+        self._num_errores = 0
+
+    def agregar(self, k, x, error=None):
+        """Registra la iteración k (error None en la iteración inicial)"""
+        if error is not None:
+            if self._num_errores == len(self._errores):
+                self._errores = np.resize(self._errores, 2 * len(self._errores))
+            self._errores[self._num_errores] = error
+            self._num_errores += 1
+
+        if k % self.cada_k == 0:
+            self._guardar(k, x, error)
+
+    def finalizar(self, k, x, error):
+        """Asegura que la última iteración quede guardada aunque no sea múltiplo de cada_k"""
+        if self._guardadas == 0 or self._iters[(self._guardadas - 1) % len(self._iters)] != k:
+            self._guardar(k, x, error)
+
+    def _guardar(self, k, x, error):
+        if self._x is None:
+            self._iters = np.empty(self._capacidad, dtype=np.int64)
+            self._x = np.empty((self._capacidad, len(x)))
+            self._errores_x = np.empty(self._capacidad)
+
+        if self.ultimos_n:
+            fila = self._guardadas % self.ultimos_n
+        else:
+            fila = self._guardadas
+            if fila == len(self._iters):
+                self._iters = np.resize(self._iters, 2 * fila)
+                self._errores_x = np.resize(self._errores_x, 2 * fila)
+                x_nuevo = np.empty((2 * fila, self._x.shape[1]))
+                x_nuevo[:fila] = self._x
+                self._x = x_nuevo
+
+        self._iters[fila] = k
+        self._x[fila] = x
+        self._errores_x[fila] = np.nan if error is None else error
+        self._guardadas += 1
+
+    def errores(self):
+        """Errores de todas las iteraciones (numpy array, sin copiar)"""
+        return self._errores[:self._num_errores]
+
+    def guardadas(self):
+        """Retorna (iteraciones, matriz de x, errores) de las iteraciones guardadas, en orden"""
+        if self._guardadas == 0:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0)), np.empty(0)
+
+        if self.ultimos_n and self._guardadas > self.ultimos_n:
+            orden = np.arange(self._guardadas, self._guardadas + self.ultimos_n) % self.ultimos_n
+            return self._iters[orden], self._x[orden], self._errores_x[orden]
+
+        m = self._guardadas
+        return self._iters[:m], self._x[:m], self._errores_x[:m]
+
+    def tabla(self):
+        """Serializa las iteraciones guardadas en el formato elegido"""
+        iters, X, errores = self.guardadas()
+
+        if self.formato == 'base64':
+            return {
+                "iter": iters.tolist(),
+                "forma": list(X.shape),
+                "dtype": "float64",
+                "x": base64.b64encode(X.astype('<f8').tobytes()).decode('ascii'),
+                "error": base64.b64encode(errores.astype('<f8').tobytes()).decode('ascii')  # NaN en la iteración 0
+            }
+
+        # La iteración inicial no tiene error
+        lista_errores = [None if k == 0 else e for k, e in zip(iters.tolist(), errores.tolist())]
+        if self.formato == 'columnas':
+            return {"iter": iters.tolist(), "x": X.tolist(), "error": lista_errores}
+
+        return [{"iter": k, "x": x, "error": e}
+                for k, x, e in zip(iters.tolist(), X.tolist(), lista_errores)]
+
+
+def _iterar(iteracion, x0, tol, niter):
+    """
+    Generador común de los métodos estacionarios
+
+    Aplica x^(k+1) = iteracion.paso(x^(k)) hasta que el error (norma infinito)
+    sea menor o igual que tol o se alcancen niter iteraciones.
+    Entrega (k, x^(k), error) en cada iteración.
+    """
+    x_prev = x0.copy()
+    error = tol + 1
+    c = 0
+
+    while error > tol and c < niter:
+        x1 = iteracion.paso(x_prev)
+
+        # Calcular error (norma infinito como el profesor)
+        error = calcular_error(x1, x_prev)
+
+        c += 1
+        yield c, x1, error
+
+        x_prev = x1
+
+
+def _resolver_estacionario(iteracion, x0, tol, niter, w=None, estimador='auto', emitir=None, historial=None):
+    """
+    Ejecuta un método estacionario y arma el dict de resultados común
+    a Jacobi, Gauss-Seidel y SOR (con w se agrega el factor de relajación)
+
+    La tabla se guarda en 'historial' (HistorialIteraciones; por defecto todas
+    las iteraciones en formato 'filas'). Con 'emitir' (modo flujo) cada fila se
+    entrega a esa función en vez de guardarse: 'tabla' y 'errores' quedan
+    vacíos y solo se conservan los últimos errores que necesita la estimación
+    a posteriori del radio espectral.
+    """
+
+    # Guardar estado inicial
+    if emitir is None:
+        if historial is None:
+            historial = HistorialIteraciones()
+        historial.agregar(0, x0, None)
+    else:
+        emitir({
             "iter": 0,
-            "x": x0.copy().tolist(),
+            "x": x0.tolist(),
             "error": None
         })
+        errores_recientes = deque(maxlen=VENTANA_RADIO_ERRORES + 1)
 
-        x_prev = x0.copy()
+    x_final = x0.copy()
+    c = 0
+    error = tol + 1
 
-        while error > tol and c < niter:
-            # Gauss-Seidel: x^(k+1) = T * x^(k) + C
-            C = np.linalg.inv(D - L) @ b
-            x1 = T @ x_prev + C
-
-            # Calcular error (norma infinito como el profesor)
-            error = calcular_error(x1, x_prev)
-
-            c += 1
-            tabla_datos.append({
+    for c, x_final, error in _iterar(iteracion, x0, tol, niter):
+        if emitir is None:
+            historial.agregar(c, x_final, error)
+        else:
+            emitir({
                 "iter": int(c),
-                "x": x1.copy().tolist(),
+                "x": x_final.tolist(),
                 "error": error
             })
+            errores_recientes.append(error)
 
-            x_prev = x1.copy()
+    if emitir is None:
+        historial.finalizar(c, x_final, error)
+        errores = historial.errores()
+    else:
+        errores = errores_recientes
+
+    # Radio espectral de la matriz de iteración T
+    radio_espectral, estimador_usado = estimar_radio_espectral(iteracion, estimador, errores)
+
+    resultado = {
+        "exito": bool(error < tol),
+        "solucion": x_final.tolist(),
+        "iteraciones": int(c),
+        "tabla": historial.tabla() if emitir is None else [],
+        "errores": errores.tolist() if emitir is None else [],  # Lista de errores para comparación
+        "radio_espectral": float(radio_espectral),
+        "converge": bool(radio_espectral < 1),
+        "estimador_radio": estimador_usado,
+        "radio_espectral_observado": radio_por_errores(errores)
+    }
 
-        converge = bool(radio_espectral < 1)
+    mensaje = f"Solución encontrada en {c} iteraciones" if error < tol else f"No convergió en {niter} iteraciones"
+    if w is not None:
+        resultado["w"] = float(w)
+        if error < tol:
+            mensaje += f" con w={w}"
 
-        # Extraer lista de errores
-        errores_lista = []
-        for dato in tabla_datos:
-            error_val = dato.get("error")
-            if error_val is not None:
-                errores_lista.append(error_val)
+    resultado["mensaje"] = mensaje
+    resultado["error_final"] = float(error)
+    return resultado
 
-        return {
-            "exito": bool(error < tol),
-            "solucion": x_prev.tolist(),
-            "iteraciones": int(c),
-            "tabla": tabla_datos,
-            "errores": errores_lista,  # Lista de errores para comparación
-            "radio_espectral": float(radio_espectral),
-            "converge": converge,
-            "mensaje": f"Solución encontrada en {c} iteraciones" if error < tol else f"No convergió en {niter} iteraciones",
-            "error_final": float(error)
-        }
+
+def _resolver_bloque(iteracion, x0, tol, niter, w=None, estimador='auto'):
+    """
+    Resuelve A X = B para varios lados derechos a la vez (una columna de B por sistema)
+
+    Todas las columnas avanzan juntas: cada paso es un producto matriz-matriz
+    N X y una sola sustitución (o escala diagonal) con k columnas, en vez de k
+    pasos matriz-vector. Cada columna lleva su propio error y deja de iterar
+    apenas converge (se retira del bloque). La partición M - N y el radio
+    espectral de T son los mismos para todas, así que se calculan una vez.
+
+    Parámetros:
+    iteracion: IteracionEstacionaria o IteracionPorComponentes construida con B (n x k) como lado derecho
+    x0: Vector inicial común (n) o uno por columna (n x k)
+
+    Retorna: dict con 'solucion' (n x k), y por columna 'iteraciones',
+    'convergio', 'error_final' y 'errores'
+    """
+    lado_derecho = iteracion.lado_derecho
+    n, k = lado_derecho.shape
+    x0 = np.asarray(x0, dtype=float)
+    X = np.tile(x0.reshape(n, 1), (1, k)) if x0.ndim == 1 else x0.copy()
+
+    activas = np.arange(k)
+    iteraciones = np.zeros(k, dtype=np.int64)
+    error_final = np.full(k, tol + 1)
+    errores = [[] for _ in range(k)]
+    c = 0
+
+    while activas.size and c < niter:
+        X_activas = X[:, activas]
+        X_nuevas = iteracion.paso_columnas(X_activas, activas)
+
+        # Error de cada columna (norma infinito, como en el caso de un solo b)
+        errores_paso = np.abs(X_nuevas - X_activas).max(axis=0)
+        X[:, activas] = X_nuevas
+
+        c += 1
+        iteraciones[activas] = c
+        error_final[activas] = errores_paso
+        for j, error in zip(activas.tolist(), errores_paso.tolist()):
+            errores[j].append(error)
+
+        # Retirar las columnas que ya convergieron
+        activas = activas[errores_paso > tol]
+
+    # La estimación a posteriori usa la columna que más iteró
+    mas_larga = int(np.argmax(iteraciones)) if k else 0
+    radio_espectral, estimador_usado = estimar_radio_espectral(iteracion, estimador, errores[mas_larga] if k else [])
+
+    convergio = error_final < tol
+    convergidas = int(convergio.sum())
+    resultado = {
+        "exito": bool(convergidas == k),
+        "solucion": X.tolist(),
+        "columnas": k,
+        "iteraciones": iteraciones.tolist(),
+        "convergio": convergio.tolist(),
+        "convergidas": convergidas,
+        "ciclos": c,
+        "pasos_columna": int(iteraciones.sum()),
+        "errores": errores,
+        "error_final": error_final.tolist(),
+        "radio_espectral": float(radio_espectral),
+        "converge": bool(radio_espectral < 1),
+        "estimador_radio": estimador_usado,
+        "mensaje": f"{convergidas} de {k} lados derechos convergieron en {c} iteraciones del bloque"
+    }
+    if w is not None:
+        resultado["w"] = float(w)
+    return resultado
+
+
+def jacobi(A, b, x0, tol, niter, estimador='auto', emitir=None, historial=None):
+    """
+    Método de Jacobi para resolver sistemas de ecuaciones lineales
+
+    Parámetros:
+    A: Matriz de coeficientes (numpy array)
+    b: Vector de términos independientes (numpy array), o matriz n x k con
+       un lado derecho por columna (se resuelven juntos, ver _resolver_bloque)
+    x0: Vector inicial (numpy array)
+    tol: Tolerancia para el error (norma infinito)
+    niter: Número máximo de iteraciones
+    estimador: Cómo obtener el radio espectral (ver estimar_radio_espectral)
+    emitir: Si se indica, recibe cada fila de la tabla en vez de guardarla (modo flujo)
+    historial: HistorialIteraciones con las opciones de la tabla (cada_k, ultimos_n, formato)
+
+    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'radio_espectral', 'converge'
+    """
+    try:
+        # Jacobi: x^(k+1) = D^(-1) ((L + U) x^(k) + b)
+        iteracion = IteracionEstacionaria(A, b, 'jacobi')
+        if np.ndim(b) == 2:
+            return _resolver_bloque(iteracion, x0, tol, niter, estimador=estimador)
+        return _resolver_estacionario(iteracion, x0, tol, niter, estimador=estimador, emitir=emitir, historial=historial)
     except Exception as e:
         return {"exito": False, "mensaje": f"Error: {str(e)}"}
 
 
-def sor(A, b, x0, tol, niter, w):
+def gauss_seidel(A, b, x0, tol, niter, estimador='auto', emitir=None, historial=None, kernel='matricial'):
+    """
+    Método de Gauss-Seidel para resolver sistemas de ecuaciones lineales
+
+    Parámetros:
+    A: Matriz de coeficientes (numpy array)
+    b: Vector de términos independientes (numpy array), o matriz n x k con
+       un lado derecho por columna (se resuelven juntos, ver _resolver_bloque)
+    x0: Vector inicial (numpy array)
+    tol: Tolerancia para el error (norma infinito)
+    niter: Número máximo de iteraciones
+    estimador: Cómo obtener el radio espectral (ver estimar_radio_espectral)
+    emitir: Si se indica, recibe cada fila de la tabla en vez de guardarla (modo flujo)
+    historial: HistorialIteraciones con las opciones de la tabla (cada_k, ultimos_n, formato)
+    kernel: Cómo se calcula cada paso: 'matricial', 'por_filas' o 'rojo_negro' (ver KERNELS_BARRIDO)
+
+    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'radio_espectral', 'converge'
+    """
+    try:
+        # Gauss-Seidel: (D - L) x^(k+1) = U x^(k) + b
+        iteracion = crear_iteracion(A, b, 'gauss_seidel', kernel=kernel)
+        if np.ndim(b) == 2:
+            resultado = _resolver_bloque(iteracion, x0, tol, niter, estimador=estimador)
+        else:
+            resultado = _resolver_estacionario(iteracion, x0, tol, niter, estimador=estimador, emitir=emitir,
+                                               historial=historial)
+        return _informar_kernel(resultado, iteracion, kernel)
+    except Exception as e:
+        return {"exito": False, "mensaje": f"Error: {str(e)}"}
+
+
+def sor(A, b, x0, tol, niter, w, estimador='auto', emitir=None, historial=None, kernel='matricial'):
     """
     Método SOR (Successive Over-Relaxation) para resolver sistemas de ecuaciones lineales
 
     Parámetros:
     A: Matriz de coeficientes (numpy array)
-    b: Vector de términos independientes (numpy array)
+    b: Vector de términos independientes (numpy array), o matriz n x k con
+       un lado derecho por columna (se resuelven juntos, ver _resolver_bloque)
     x0: Vector inicial (numpy array)
     tol: Tolerancia para el error (norma infinito)
     niter: Número máximo de iteraciones
@@ -187,91 +801,908 @@ def sor(A, b, x0, tol, niter, w):
        w < 1: Subrelajación
        w = 1: Gauss-Seidel
        w > 1: Sobrerelajación
-
-    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'radio_espectral', 'converge', 'w'
+       'auto' o 'adaptativo': elegirlo automáticamente (ver MODOS_W_AUTOMATICO)
+    estimador: Cómo obtener el radio espectral (ver estimar_radio_espectral)
+    emitir: Si se indica, recibe cada fila de la tabla en vez de guardarla (modo flujo)
+    historial: HistorialIteraciones con las opciones de la tabla (cada_k, ultimos_n, formato)
+    kernel: Cómo se calcula cada paso: 'matricial', 'por_filas' o 'rojo_negro' (ver KERNELS_BARRIDO)
+
+    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'radio_espectral', 'converge', 'w'.
+    Con w automático agrega 'w_automatico', 'iteraciones_w1' e 'iteraciones_ahorradas'.
     """
     try:
+        if isinstance(w, str):
+            return _sor_w_automatico(A, b, x0, tol, niter, w, estimador, emitir, historial, kernel)
+
         if w <= 0 or w >= 2:
             return {"exito": False, "mensaje": "El factor de relajación w debe estar entre 0 y 2"}
 
+        # SOR: (D - w L) x^(k+1) = ((1-w) D + w U) x^(k) + w b
+        iteracion = crear_iteracion(A, b, 'sor', w, kernel)
+        if np.ndim(b) == 2:
+            resultado = _resolver_bloque(iteracion, x0, tol, niter, w, estimador)
+        else:
+            resultado = _resolver_estacionario(iteracion, x0, tol, niter, w, estimador, emitir, historial)
+        return _informar_kernel(resultado, iteracion, kernel)
+    except Exception as e:
+        return {"exito": False, "mensaje": f"Error: {str(e)}"}
+
+
+# ===== FACTOR DE RELAJACIÓN AUTOMÁTICO =====
+
+# Modos de elección automática de w en SOR:
+# - 'auto': fórmula de Young con el radio espectral de Jacobi (si Jacobi no
+#   converge, se pasa al modo adaptativo)
+# - 'adaptativo': empieza con w = 1 y corrige w durante las iteraciones
+MODOS_W_AUTOMATICO = ('auto', 'adaptativo')
+
+# Cota superior de w (cerca de 2 SOR deja de converger)
+W_MAXIMO = 1.99
+
+# Aumento mínimo de w para reconstruir la iteración en el modo adaptativo
+DELTA_W_ADAPTATIVO = 0.01
+
+# Diferencia relativa máxima entre dos estimaciones seguidas de la tasa de
+# convergencia -log(λ) para considerarla estable (modo adaptativo)
+TOL_RADIO_ESTABLE = 0.05
+
+# Pasos de Arnoldi para el radio de Jacobi: la fórmula de Young es muy sensible
+# a ρ_J cerca de 1, así que se usan más pasos que en estimar_radio_espectral
+PASOS_ARNOLDI_W = 60
+
+
+def w_optimo_young(radio_jacobi):
+    """
+    Factor de relajación óptimo de Young: w = 2 / (1 + sqrt(1 - ρ_J²))
+
+    Es exacto para matrices consistentemente ordenadas (por ejemplo
+    tridiagonales o de diferencias finitas) cuya matriz de Jacobi tiene
+    autovalores reales; en las demás es una aproximación.
+    Retorna None si ρ_J >= 1 (la fórmula no aplica).
+    """
+    if not 0 <= radio_jacobi < 1:
+        return None
+    return min(2.0 / (1.0 + np.sqrt(1.0 - radio_jacobi ** 2)), W_MAXIMO)
+
+
+def radio_espectral_jacobi(A, estimador='auto'):
+    """
+    Radio espectral de la matriz de iteración de Jacobi (no depende de b)
+
+    Con 'auto', 'arnoldi' o 'a_posteriori' usa el valor exacto hasta
+    N_RADIO_EXACTO y si no PASOS_ARNOLDI_W pasos de Arnoldi.
+    """
+    iteracion = IteracionEstacionaria(A, np.zeros(len(A)), 'jacobi')
+    if estimador in ('exacto', 'potencia'):
+        return estimar_radio_espectral(iteracion, estimador)[0]
+    if iteracion.n <= N_RADIO_EXACTO:
+        return estimar_radio_espectral(iteracion, 'exacto')[0]
+    pasos = min(iteracion.n, PASOS_ARNOLDI_W, max(5, 16000000 // iteracion.n))
+    return radio_por_arnoldi(iteracion.aplicar_T, iteracion.n, pasos)
+
+
+class SORAdaptativo:
+    """
+    SOR que ajusta w durante las iteraciones (procedimiento de Hageman y Young)
+
+    Empieza con w = 1 (Gauss-Seidel). Cuando la razón de convergencia
+    observada λ (radio_por_errores sobre ||x^(k) - x^(k-1)||) se estabiliza,
+    estima el radio de Jacobi, que en matrices consistentemente ordenadas
+    cumple λ + w - 1 = w ρ_J sqrt(λ), y pasa al w de Young con ese ρ_J.
+    w solo aumenta, y deja de ajustarse cuando:
+    - λ ya es cercano a w - 1 (en el óptimo o por encima, todos los
+      autovalores tienen módulo w - 1), o
+    - el último aumento empeoró la razón de convergencia (la matriz no es
+      consistentemente ordenada): se vuelve al w anterior.
+
+    Tiene la interfaz de IteracionEstacionaria (paso, aplicar_T, matriz_T),
+    así que se resuelve con _resolver_estacionario. Cada paso usa el kernel
+    indicado (ver KERNELS_BARRIDO).
+    """
+
+    def __init__(self, A, b, ventana=VENTANA_RADIO_ERRORES, kernel='matricial'):
+        self.A = A
+        self.b = b
+        self.n = len(A)
+        self.ventana = ventana
+        self.kernel = kernel
+        self.w = 1.0
+        self.ajustes = []
+        self._iteracion = crear_iteracion(A, b, 'sor', self.w, kernel)
+        self._errores = []
+        self._anterior = None  # (w, radio) antes del último aumento
+        self._fijo = False
+        self._k = 0
+
+    def _cambiar_w(self, w):
+        self.w = w
+        self.ajustes.append({"iter": self._k, "w": w})
+        self._iteracion = crear_iteracion(self.A, self.b, 'sor', w, self.kernel)
+        self._errores = []
+
+    def _ajustar(self):
+        # El primer error después de un cambio de w es transitorio y no se usa
+        errores = self._errores[1:]
+        if len(errores) < 2 * self.ventana + 1:
+            return
+
+        # λ es confiable cuando coincide en dos ventanas disjuntas seguidas. Cerca de
+        # λ = 1 se compara la tasa -log(λ) (las iteraciones son proporcionales a 1/tasa)
+        radio = radio_por_errores(errores, self.ventana)
+        previo = radio_por_errores(errores[:-self.ventana], self.ventana)
+        if radio is None or previo is None or not 0 < radio < 1 or not 0 < previo < 1:
+            return
+        if abs(np.log(radio) - np.log(previo)) > TOL_RADIO_ESTABLE * -np.log(radio):
+            return
+
+        if self._anterior is not None and -np.log(radio) < (1 - TOL_RADIO_ESTABLE) * -np.log(self._anterior[1]):
+            # El aumento empeoró la convergencia: volver al w anterior
+            self._fijo = True
+            self._cambiar_w(self._anterior[0])
+            return
+
+        if radio <= (self.w - 1) * (1 + DELTA_W_ADAPTATIVO):
+            self._fijo = True
+            return
+
+        radio_jacobi_estimado = (radio + self.w - 1) / (self.w * np.sqrt(radio))
+        w_nuevo = w_optimo_young(radio_jacobi_estimado)
+        if w_nuevo is not None and w_nuevo - self.w >= DELTA_W_ADAPTATIVO:
+            self._anterior = (self.w, radio)
+            self._cambiar_w(round(float(w_nuevo), 4))
+
+    def paso(self, x):
+        """Calcula x^(k+1) con el w actual y, si corresponde, corrige w"""
+        x1 = self._iteracion.paso(x)
+        self._k += 1
+        if not self._fijo:
+            self._errores.append(calcular_error(x1, x))
+            self._ajustar()
+        return x1
+
+    @property
+    def colores(self):
+        """Colores del kernel 'rojo_negro' (None en los demás)"""
+        return getattr(self._iteracion, 'colores', None)
+
+    def aplicar_T(self, v):
+        """Producto T v con el w actual"""
+        return self._iteracion.aplicar_T(v)
+
+    def matriz_T(self):
+        """Matriz de iteración con el w actual"""
+        return self._iteracion.matriz_T()
+
+
+def _iteraciones_w1(A, b, x0, tol, niter, kernel='matricial'):
+    """
+    Iteraciones que necesita SOR con w = 1 (Gauss-Seidel) en el mismo problema
+    y con el mismo kernel (el orden rojo-negro cambia las iteraciones)
+
+    Retorna: (iteraciones, convergio); con varios lados derechos, las
+    iteraciones son la suma de las de cada columna
+    """
+    iteracion = crear_iteracion(A, b, 'gauss_seidel', kernel=kernel)
+    if np.ndim(b) == 2:
+        resultado = _resolver_bloque(iteracion, x0, tol, niter, estimador='potencia')
+        return resultado["pasos_columna"], resultado["exito"]
+
+    c, error = 0, tol + 1
+    for c, _, error in _iterar(iteracion, x0, tol, niter):
+        pass
+    return c, bool(error < tol)
+
+
+def _sor_w_automatico(A, b, x0, tol, niter, modo, estimador='auto', emitir=None, historial=None, kernel='matricial'):
+    """
+    SOR con w elegido automáticamente (modo 'auto' o 'adaptativo', ver MODOS_W_AUTOMATICO)
+
+    Para informar la ganancia resuelve además el problema con w = 1 (solo
+    cuenta iteraciones, sin tabla). Con varios lados derechos solo está
+    disponible la fórmula de Young.
+    """
+    if modo not in MODOS_W_AUTOMATICO:
+        raise ValueError(f"Factor de relajación '{modo}' no reconocido. Use un número entre 0 y 2 o "
+                         f"{', '.join(MODOS_W_AUTOMATICO)}")
+
+    rho_jacobi = None
+    w = None
+    if modo == 'auto':
+        rho_jacobi = radio_espectral_jacobi(A, estimador)
+        w = w_optimo_young(rho_jacobi)
+
+    if w is not None:
+        w = round(float(w), 4)
+        resultado = sor(A, b, x0, tol, niter, w, estimador, emitir, historial, kernel)
+        if "solucion" not in resultado:
+            return resultado
+        resultado["w_automatico"] = 'young'
+        resultado["radio_jacobi"] = float(rho_jacobi)
+    else:
+        if np.ndim(b) == 2:
+            raise ValueError("El w adaptativo no está disponible con varios lados derechos; "
+                             "con w='auto' se requiere que el radio espectral de Jacobi sea menor que 1")
+        iteracion = SORAdaptativo(A, b, kernel=kernel)
+        resultado = _resolver_estacionario(iteracion, x0, tol, niter, None, estimador, emitir, historial)
+        _informar_kernel(resultado, iteracion, kernel)
+        resultado["w"] = iteracion.w
+        resultado["w_automatico"] = 'adaptativo'
+        resultado["ajustes_w"] = iteracion.ajustes
+        if rho_jacobi is not None:
+            resultado["radio_jacobi"] = float(rho_jacobi)
+        if resultado["exito"]:
+            resultado["mensaje"] += f" con w={iteracion.w}"
+
+    iteraciones_w1, convergio_w1 = _iteraciones_w1(A, b, x0, tol, niter, kernel)
+    iteraciones = resultado.get("pasos_columna", resultado["iteraciones"])
+    resultado["iteraciones_w1"] = int(iteraciones_w1)
+    resultado["convergio_w1"] = convergio_w1
+    resultado["iteraciones_ahorradas"] = int(iteraciones_w1 - iteraciones)
+    if resultado["exito"]:
+        sufijo = "" if convergio_w1 else f", que no convergió en {niter}"
+        resultado["mensaje"] += (f" (w automático: {resultado['w_automatico']}; "
+                                 f"{resultado['iteraciones_ahorradas']} iteraciones menos que con w=1{sufijo})")
+    return resultado
+
+
+# ===== MÉTODOS DE KRYLOV =====
+
+# Métodos y precondicionadores disponibles
+METODOS_KRYLOV = ('cg', 'bicgstab', 'gmres')
+PRECONDICIONADORES = ('ninguno', 'jacobi', 'ssor')
+
+# Dimensión del subespacio de GMRES antes de reiniciar, si no se indica otra
+REINICIO_GMRES = 20
+
+
+class Precondicionador:
+    """
+    Aproximación M de A para los métodos de Krylov, construida con las mismas
+    particiones A = D - L - U de los métodos estacionarios
+
+    - 'ninguno': M = I
+    - 'jacobi':  M = D (la M de Jacobi)
+    - 'ssor':    M = (D - wL) D^(-1) (D - wU) / (w (2 - w)), un barrido SOR hacia
+                 adelante y otro hacia atrás; es simétrica si A lo es (sirve para CG)
+
+    aplicar(r) resuelve M z = r sin formar M ni su inversa.
+    """
+
+    def __init__(self, A, tipo='jacobi', w=1.0):
+        if tipo not in PRECONDICIONADORES:
+            raise ValueError(f"Precondicionador '{tipo}' no reconocido. Opciones: {', '.join(PRECONDICIONADORES)}")
+        if tipo == 'ssor' and (w <= 0 or w >= 2):
+            raise ValueError("El factor de relajación w del precondicionador SSOR debe estar entre 0 y 2")
+
+        self.tipo = tipo
+        self.w = float(w)
+        if tipo == 'ninguno':
+            return
+
         n = len(A)
-        c = 0
-        error = tol + 1
-        tabla_datos = []
+        if tipo == 'jacobi':
+            self._adelante = IteracionEstacionaria(A, np.zeros(n), 'jacobi')
+        else:
+            # Barrido hacia adelante: M de SOR = D - wL; hacia atrás: D - wU = D + w triu(A, 1)
+            self._adelante = IteracionEstacionaria(A, np.zeros(n), 'sor', w)
+            self._atras = np.diag(self._adelante.diagonal) + w * np.triu(A, 1)
 
-        # Descomposición de la matriz A
-        D = np.diag(np.diag(A))
-        L = -np.tril(A, -1)
-        U = -np.triu(A, 1)
+    def aplicar(self, r):
+        """Retorna z tal que M z = r"""
+        if self.tipo == 'ninguno':
+            return r.copy()
+        if self.tipo == 'jacobi':
+            return self._adelante.resolver_M(r)
 
-        # Calcular matriz de iteración T y radio espectral
-        T = np.linalg.inv(D - w*L) @ ((1-w)*D + w*U)
-        radio_espectral = max(abs(np.linalg.eigvals(T)))
+        y = self._adelante.resolver_M(r)
+        return self.w * (2 - self.w) * sustitucion_regresiva(self._atras, self._adelante.diagonal * y)
 
-        # Guardar estado inicial
-        tabla_datos.append({
-            "iter": 0,
-            "x": x0.copy().tolist(),
-            "error": None
-        })
 
-        x_prev = x0.copy()
+def _gradiente_conjugado(A, b, x0, tol, niter, precondicionador):
+    """
+    Gradiente conjugado precondicionado (A simétrica definida positiva)
 
-        while error > tol and c < niter:
-            # SOR: x^(k+1) = T * x^(k) + C
-            C = w * np.linalg.inv(D - w*L) @ b
-            x1 = T @ x_prev + C
+    Entrega (k, x^(k), error, residuo) en cada iteración, con error = ||x^(k) - x^(k-1)||_∞
+    y residuo = ||b - A x^(k)||_2. Termina si el residuo se anula (solución exacta).
+    """
+    x = x0.copy()
+    r = b - A @ x
+    if not np.any(r):
+        yield 1, x, 0.0, 0.0  # x0 ya es la solución
+        return
+    z = precondicionador.aplicar(r)
+    p = z.copy()
+    rz = r @ z
+
+    for k in range(1, niter + 1):
+        Ap = A @ p
+        curvatura = p @ Ap
+        if curvatura <= 0:
+            raise ValueError("El gradiente conjugado requiere una matriz simétrica definida positiva")
+
+        alfa = rz / curvatura
+        x_nuevo = x + alfa * p
+        r = r - alfa * Ap
+        error = calcular_error(x_nuevo, x)
+        residuo = float(np.linalg.norm(r))
+        yield k, x_nuevo, error, residuo
+
+        x = x_nuevo
+        if error <= tol or residuo == 0:
+            return
+
+        z = precondicionador.aplicar(r)
+        rz_nuevo = r @ z
+        p = z + (rz_nuevo / rz) * p
+        rz = rz_nuevo
+
+
+def _bicgstab(A, b, x0, tol, niter, precondicionador):
+    """
+    BiCGSTAB con precondicionamiento por derecha (A no simétrica)
 
-            # Calcular error (norma infinito como el profesor)
-            error = calcular_error(x1, x_prev)
+    Entrega (k, x^(k), error, residuo) como _gradiente_conjugado.
+    """
+    x = x0.copy()
+    r = b - A @ x
+    if not np.any(r):
+        yield 1, x, 0.0, 0.0  # x0 ya es la solución
+        return
+    r_sombra = r.copy()
+    rho = alfa = omega = 1.0
+    v = np.zeros_like(x)
+    p = np.zeros_like(x)
+
+    for k in range(1, niter + 1):
+        rho_nuevo = r_sombra @ r
+        if rho_nuevo == 0:
+            raise ValueError("BiCGSTAB se interrumpió (ρ = 0): pruebe con GMRES")
+
+        p = r + (rho_nuevo / rho) * (alfa / omega) * (p - omega * v)
+        p_prec = precondicionador.aplicar(p)
+        v = A @ p_prec
+        if r_sombra @ v == 0:
+            raise ValueError("BiCGSTAB se interrumpió (división por cero): pruebe con GMRES")
+        alfa = rho_nuevo / (r_sombra @ v)
+        s = r - alfa * v
+
+        if not np.any(s):
+            x_nuevo = x + alfa * p_prec
+            r = s
+        else:
+            s_prec = precondicionador.aplicar(s)
+            t = A @ s_prec
+            omega = (t @ s) / (t @ t)
+            if omega == 0:
+                raise ValueError("BiCGSTAB se interrumpió (ω = 0): pruebe con GMRES")
+            x_nuevo = x + alfa * p_prec + omega * s_prec
+            r = s - omega * t
 
-            c += 1
-            tabla_datos.append({
-                "iter": int(c),
-                "x": x1.copy().tolist(),
-                "error": error
-            })
+        error = calcular_error(x_nuevo, x)
+        residuo = float(np.linalg.norm(r))
+        yield k, x_nuevo, error, residuo
+
+        x = x_nuevo
+        rho = rho_nuevo
+        if error <= tol or residuo == 0:
+            return
 
-            x_prev = x1.copy()
 
-        converge = bool(radio_espectral < 1)
+def _gmres(A, b, x0, tol, niter, precondicionador, reinicio=REINICIO_GMRES):
+    """
+    GMRES reiniciado cada 'reinicio' pasos, con precondicionamiento por derecha
+
+    Cada paso agrega un vector a la base de Arnoldi (Gram-Schmidt modificado)
+    y actualiza la factorización QR de la Hessenberg con rotaciones de Givens,
+    así que el residuo |g_(j+1)| sale sin calcular b - A x. Entrega
+    (k, x^(k), error, residuo) como _gradiente_conjugado, contando los pasos
+    de todos los ciclos.
+    """
+    n = len(b)
+    m = max(1, min(int(reinicio), n))
+    x = x0.copy()
+    k = 0
+
+    while k < niter:
+        r = b - A @ x
+        beta = float(np.linalg.norm(r))
+        if beta == 0:
+            yield k + 1, x, 0.0, 0.0  # x ya es la solución
+            return
+
+        V = np.zeros((n, m + 1))
+        H = np.zeros((m + 1, m))
+        cosenos = np.zeros(m)
+        senos = np.zeros(m)
+        g = np.zeros(m + 1)
+        V[:, 0] = r / beta
+        g[0] = beta
+        x_ciclo = x
+
+        for j in range(m):
+            w = A @ precondicionador.aplicar(V[:, j])
+            for i in range(j + 1):
+                H[i, j] = w @ V[:, i]
+                w -= H[i, j] * V[:, i]
+            H[j + 1, j] = np.linalg.norm(w)
+            agotado = H[j + 1, j] <= 1e-14 * beta  # El subespacio ya contiene la solución
+            if not agotado:
+                V[:, j + 1] = w / H[j + 1, j]
+
+            # Rotaciones anteriores y nueva rotación que anula H[j+1, j]
+            for i in range(j):
+                H[i, j], H[i + 1, j] = (cosenos[i] * H[i, j] + senos[i] * H[i + 1, j],
+                                        -senos[i] * H[i, j] + cosenos[i] * H[i + 1, j])
+            radio = np.hypot(H[j, j], H[j + 1, j])
+            if radio == 0:
+                raise ValueError("La matriz es singular (el sistema no tiene solución única)")
+            cosenos[j], senos[j] = H[j, j] / radio, H[j + 1, j] / radio
+            H[j, j], H[j + 1, j] = radio, 0.0
+            g[j + 1] = -senos[j] * g[j]
+            g[j] = cosenos[j] * g[j]
+
+            # Iterado actual: x = x_ciclo + M^(-1) V y, con R y = g
+            y = sustitucion_regresiva(H[:j + 1, :j + 1], g[:j + 1])
+            x_nuevo = x_ciclo + precondicionador.aplicar(V[:, :j + 1] @ y)
+
+            k += 1
+            error = calcular_error(x_nuevo, x)
+            residuo = 0.0 if agotado else float(abs(g[j + 1]))
+            yield k, x_nuevo, error, residuo
+
+            x = x_nuevo
+            if error <= tol or residuo == 0 or k >= niter:
+                return
+
+
+def _resolver_krylov(iteraciones, x0, tol, niter, emitir=None, historial=None):
+    """
+    Recorre un generador de Krylov y arma el mismo dict de resultados que los
+    métodos estacionarios ('tabla', 'errores', 'error_final', ...), más los
+    residuos ||b - A x^(k)||_2 de cada iteración
+
+    El criterio de parada es el del capítulo (||x^(k) - x^(k-1)||_∞ <= tol).
+    Si el residuo llega a cero antes, la solución ya es exacta y se agrega una
+    última fila con error 0 (el siguiente iterado sería el mismo).
+    """
+    if emitir is None:
+        if historial is None:
+            historial = HistorialIteraciones()
+        historial.agregar(0, x0, None)
+    else:
+        emitir({"iter": 0, "x": x0.tolist(), "error": None})
+
+    residuos = []
+    x_final = x0.copy()
+    c = 0
+    error = tol + 1
+
+    def registrar(c, x, error):
+        if emitir is None:
+            historial.agregar(c, x, error)
+        else:
+            emitir({"iter": int(c), "x": x.tolist(), "error": error})
+
+    for c, x_final, error, residuo in iteraciones:
+        registrar(c, x_final, error)
+        residuos.append(residuo)
+
+    if error > tol and residuos and residuos[-1] == 0 and c < niter:
+        c += 1
+        error = 0.0
+        registrar(c, x_final, error)
+        residuos.append(0.0)
+
+    if emitir is None:
+        historial.finalizar(c, x_final, error)
+
+    return {
+        "exito": bool(error < tol),
+        "solucion": x_final.tolist(),
+        "iteraciones": int(c),
+        "tabla": historial.tabla() if emitir is None else [],
+        "errores": historial.errores().tolist() if emitir is None else [],
+        "residuos": residuos if emitir is None else [],
+        "residuo_final": residuos[-1] if residuos else None,
+        "mensaje": f"Solución encontrada en {c} iteraciones" if error < tol else f"No convergió en {niter} iteraciones",
+        "error_final": float(error)
+    }
+
+
+def krylov(A, b, x0, tol, niter, metodo='cg', precondicionador='jacobi', w=1.0, reinicio=REINICIO_GMRES,
+           emitir=None, historial=None):
+    """
+    Métodos de Krylov para resolver sistemas de ecuaciones lineales
+
+    Parámetros:
+    A: Matriz de coeficientes (numpy array)
+    b: Vector de términos independientes (numpy array)
+    x0: Vector inicial (numpy array)
+    tol: Tolerancia para el error (norma infinito de x^(k) - x^(k-1), como en Jacobi)
+    niter: Número máximo de iteraciones
+    metodo: 'cg' (gradiente conjugado, A simétrica definida positiva),
+            'bicgstab' o 'gmres' (GMRES reiniciado, A cualquiera no singular)
+    precondicionador: 'ninguno', 'jacobi' o 'ssor' (ver Precondicionador)
+    w: Factor de relajación del precondicionador SSOR (0 < w < 2)
+    reinicio: Pasos de GMRES entre reinicios
+    emitir: Si se indica, recibe cada fila de la tabla en vez de guardarla (modo flujo)
+    historial: HistorialIteraciones con las opciones de la tabla (cada_k, ultimos_n, formato)
+
+    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'tabla', 'errores', 'residuos', 'error_final'
+    """
+    try:
+        if metodo not in METODOS_KRYLOV:
+            return {"exito": False, "mensaje": f"Método '{metodo}' no reconocido. Opciones: {', '.join(METODOS_KRYLOV)}"}
+
+        A = np.asarray(A, dtype=float)
+        b = np.asarray(b, dtype=float)
+        x0 = np.asarray(x0, dtype=float)
+        M = Precondicionador(A, precondicionador, w)
+
+        if metodo == 'cg':
+            if not np.allclose(A, A.T):
+                return {"exito": False, "mensaje": "El gradiente conjugado requiere una matriz simétrica definida positiva: use BiCGSTAB o GMRES"}
+            iteraciones = _gradiente_conjugado(A, b, x0, tol, niter, M)
+        elif metodo == 'bicgstab':
+            iteraciones = _bicgstab(A, b, x0, tol, niter, M)
+        else:
+            iteraciones = _gmres(A, b, x0, tol, niter, M, reinicio)
+
+        resultado = _resolver_krylov(iteraciones, x0, tol, niter, emitir, historial)
+        resultado["metodo"] = metodo
+        resultado["precondicionador"] = precondicionador
+        if precondicionador == 'ssor':
+            resultado["w"] = float(w)
+        if metodo == 'gmres':
+            resultado["reinicio"] = max(1, min(int(reinicio), len(b)))
+        return resultado
+    except Exception as e:
+        return {"exito": False, "mensaje": f"Error: {str(e)}"}
+
+
+# ===== MODO DISPERSO (CSR) =====
+
+# Gauss-Seidel/SOR dispersos barren por colores si en promedio cada color tiene
+# al menos esta cantidad de componentes; si no, recorren las filas una por una
+MIN_COMPONENTES_POR_COLOR = 16
+
+
+class MatrizCSR:
+    """
+    Matriz dispersa cuadrada en formato CSR (Compressed Sparse Row) usando solo numpy
+
+    Atributos:
+    n: Dimensión de la matriz (n x n)
+    datos: Valores no nulos, fila por fila
+    indices: Columna de cada valor de 'datos'
+    indptr: La fila i ocupa datos[indptr[i]:indptr[i+1]]
+    filas: Fila de cada valor de 'datos' (para productos vectorizados)
+    diagonal: Elementos de la diagonal principal
+    """
+
+    def __init__(self, datos, indices, indptr, n):
+        self.n = int(n)
+        self.datos = np.asarray(datos, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.filas = np.repeat(np.arange(self.n, dtype=np.int64), np.diff(self.indptr))
+
+        self.diagonal = np.zeros(self.n)
+        en_diagonal = self.filas == self.indices
+        self.diagonal[self.filas[en_diagonal]] = self.datos[en_diagonal]
+
+    @property
+    def nnz(self):
+        """Número de elementos almacenados"""
+        return int(self.datos.size)
+
+    @classmethod
+    def desde_coo(cls, filas, columnas, valores, n=None):
+        """
+        Construye la matriz a partir de tripletas (fila, columna, valor) con índices desde 0
+
+        Las entradas repetidas se suman, como en el formato COO habitual.
+        """
+        filas = np.asarray(filas, dtype=np.int64).ravel()
+        columnas = np.asarray(columnas, dtype=np.int64).ravel()
+        valores = np.asarray(valores, dtype=float).ravel()
+
+        if not (filas.size == columnas.size == valores.size):
+            raise ValueError("Las listas de filas, columnas y valores deben tener la misma longitud")
+        if filas.size == 0:
+            raise ValueError("La matriz no tiene elementos")
+
+        if n is None:
+            n = int(max(filas.max(), columnas.max())) + 1
+        n = int(n)
+
+        if filas.min() < 0 or columnas.min() < 0 or filas.max() >= n or columnas.max() >= n:
+            raise ValueError(f"Hay índices fuera de rango para una matriz de {n}x{n}")
+
+        # Ordenar por (fila, columna) y sumar duplicados
+        claves = filas * n + columnas
+        orden = np.argsort(claves, kind='stable')
+        claves = claves[orden]
+        valores = valores[orden]
+
+        inicio_grupo = np.flatnonzero(np.r_[True, claves[1:] != claves[:-1]])
+        claves = claves[inicio_grupo]
+        valores = np.add.reduceat(valores, inicio_grupo)
+
+        filas = claves // n
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=n), out=indptr[1:])
+
+        return cls(valores, claves % n, indptr, n)
+
+    @classmethod
+    def desde_matrix_market(cls, texto):
+        """
+        Construye la matriz a partir del contenido de un archivo Matrix Market (.mtx)
+
+        Soporta el formato 'coordinate' con campos real, integer o pattern y
+        simetrías general, symmetric y skew-symmetric.
+        """
+        lineas = texto.splitlines()
+        if not lineas or not lineas[0].lower().startswith('%%matrixmarket'):
+            raise ValueError("El archivo no tiene el encabezado %%MatrixMarket")
+
+        encabezado = lineas[0].lower().split()
+        if len(encabezado) < 5 or encabezado[1] != 'matrix' or encabezado[2] != 'coordinate':
+            raise ValueError("Solo se soportan archivos Matrix Market en formato 'matrix coordinate'")
+
+        campo, simetria = encabezado[3], encabezado[4]
+        if campo not in ('real', 'integer', 'pattern'):
+            raise ValueError(f"Campo '{campo}' no soportado (use real, integer o pattern)")
+        if simetria not in ('general', 'symmetric', 'skew-symmetric'):
+            raise ValueError(f"Simetría '{simetria}' no soportada")
+
+        contenido = [linea for linea in lineas[1:] if linea.strip() and not linea.lstrip().startswith('%')]
+        if not contenido:
+            raise ValueError("El archivo no contiene la línea de dimensiones")
+
+        m, n, nnz = (int(v) for v in contenido[0].split()[:3])
+        if m != n:
+            raise ValueError(f"La matriz debe ser cuadrada. Dimensión actual: {m}x{n}")
+
+        columnas_por_entrada = 2 if campo == 'pattern' else 3
+        valores = np.array(" ".join(contenido[1:]).split(), dtype=float)
+        if valores.size != nnz * columnas_por_entrada:
+            raise ValueError(f"Se esperaban {nnz} entradas y el archivo tiene {valores.size // columnas_por_entrada}")
+
+        entradas = valores.reshape(nnz, columnas_por_entrada)
+        filas = entradas[:, 0].astype(np.int64) - 1
+        columnas = entradas[:, 1].astype(np.int64) - 1
+        datos = np.ones(nnz) if campo == 'pattern' else entradas[:, 2]
+
+        if simetria != 'general':
+            # Solo viene la mitad triangular: reflejar las entradas fuera de la diagonal
+            fuera = filas != columnas
+            signo = -1.0 if simetria == 'skew-symmetric' else 1.0
+            filas, columnas, datos = (np.concatenate([filas, columnas[fuera]]),
+                                      np.concatenate([columnas, filas[fuera]]),
+                                      np.concatenate([datos, signo * datos[fuera]]))
+
+        return cls.desde_coo(filas, columnas, datos, n)
+
+    def matvec(self, x):
+        """Producto A @ x en O(nnz)"""
+        return np.bincount(self.filas, weights=self.datos * x[self.indices], minlength=self.n)
+
+    def es_diagonalmente_dominante(self):
+        """Verifica dominancia diagonal estricta por filas sin formar la matriz densa"""
+        suma_filas = np.bincount(self.filas, weights=np.abs(self.datos), minlength=self.n)
+        return bool(np.all(np.abs(self.diagonal) > suma_filas - np.abs(self.diagonal)))
+
+
+class IteracionDispersa:
+    """
+    Jacobi, Gauss-Seidel y SOR sobre una MatrizCSR, con costo O(nnz) por iteración
+
+    Jacobi se evalúa vectorizado: x^(k+1) = x^(k) + (b - A x^(k)) / d.
+    Gauss-Seidel y SOR usan los valores ya actualizados:
+    x_i <- x_i + w (b_i - A_i x) / a_ii (w = 1 en Gauss-Seidel). Las componentes
+    se recorren por los colores de colorear_componentes (rojo-negro en matrices
+    tridiagonales o de 5 puntos): dentro de un color ninguna depende de otra, así
+    que cada color se actualiza con un producto vectorizado como matvec. Si la
+    coloración deja colores muy chicos (menos de MIN_COMPONENTES_POR_COLOR en
+    promedio) se recorren las filas una por una en orden natural.
+    """
+
+    def __init__(self, A, b, metodo, w=1.0):
+        if metodo not in ('jacobi', 'gauss_seidel', 'sor'):
+            raise ValueError(f"Método '{metodo}' no reconocido")
+        if np.any(A.diagonal == 0):
+            raise ValueError("La matriz tiene ceros en la diagonal")
+
+        self.A = A
+        self.b = np.asarray(b, dtype=float)
+        self.metodo = metodo
+        self.n = A.n
+        self.w = 1.0 if metodo == 'gauss_seidel' else float(w)
+        self.colores = None
+
+        if metodo == 'jacobi':
+            return
+
+        colores = colorear_componentes(A)
+        if self.n >= MIN_COMPONENTES_POR_COLOR * len(colores):
+            # Por color: sus filas de A como tripletas (fila local, columna, valor)
+            self.colores = colores
+            escala = self.w / A.diagonal
+            self._grupos = []
+            for indices in colores:
+                inicio, fin = A.indptr[indices], A.indptr[indices + 1]
+                largos = fin - inicio
+                posiciones = np.repeat(inicio - np.cumsum(largos) + largos, largos) + np.arange(largos.sum())
+                filas_locales = np.repeat(np.arange(len(indices)), largos)
+                self._grupos.append((indices, filas_locales, A.indices[posiciones],
+                                     A.datos[posiciones], escala[indices]))
+        else:
+            # Filas como listas de Python: el barrido secuencial es más rápido así
+            # que indexando arreglos de numpy elemento por elemento
+            self._filas = [(A.indices[inicio:fin].tolist(), A.datos[inicio:fin].tolist())
+                           for inicio, fin in zip(A.indptr[:-1].tolist(), A.indptr[1:].tolist())]
+            self._diagonal = A.diagonal.tolist()
+            self._b = self.b.tolist()
+
+    def _barrido_colores(self, x, b):
+        """Un barrido de Gauss-Seidel/SOR por colores sobre una copia de x"""
+        x = np.array(x, dtype=float)
+        for indices, filas_locales, columnas, valores, escala in self._grupos:
+            producto = np.bincount(filas_locales, weights=valores * x[columnas], minlength=len(indices))
+            x[indices] += escala * (b[indices] - producto)
+        return x
+
+    def _barrido(self, x, b):
+        """Un barrido de Gauss-Seidel/SOR por filas sobre una copia de x (b como lista)"""
+        w = self.w
+        x_nuevo = x.tolist()
+        for i, (columnas, valores) in enumerate(self._filas):
+            residuo = b[i]
+            for j, a_ij in zip(columnas, valores):
+                residuo -= a_ij * x_nuevo[j]
+            x_nuevo[i] += w * residuo / self._diagonal[i]
+        return np.array(x_nuevo)
+
+    def paso(self, x):
+        """Calcula x^(k+1) a partir de x^(k) sin modificar x"""
+        if self.metodo == 'jacobi':
+            return x + (self.b - self.A.matvec(x)) / self.A.diagonal
+        if self.colores is not None:
+            return self._barrido_colores(x, self.b)
+        return self._barrido(x, self._b)
+
+    def aplicar_T(self, v):
+        """Producto T v: el mismo paso con lado derecho nulo"""
+        if self.metodo == 'jacobi':
+            return v - self.A.matvec(v) / self.A.diagonal
+        if self.colores is not None:
+            return self._barrido_colores(v, np.zeros(self.n))
+        return self._barrido(v, [0.0] * self.n)
+
+
+def resolver_disperso(A, b, x0, tol, niter, metodo='jacobi', w=1.0, estimador='auto'):
+    """
+    Resuelve A x = b con Jacobi, Gauss-Seidel o SOR sobre una matriz dispersa
+
+    Parámetros:
+    A: MatrizCSR
+    b: Vector de términos independientes (numpy array)
+    x0: Vector inicial (numpy array)
+    tol: Tolerancia para el error (norma infinito)
+    niter: Número máximo de iteraciones
+    metodo: 'jacobi', 'gauss_seidel' o 'sor'
+    w: Factor de relajación (solo SOR)
+    estimador: Cómo estimar el radio espectral ('exacto' no está disponible)
+
+    Retorna: dict con 'exito', 'solucion', 'iteraciones', 'errores', 'radio_espectral', 'error_final', 'n', 'nnz'.
+    No incluye la tabla de vectores por iteración (sería de tamaño niter x n).
+    """
+    try:
+        if metodo == 'sor' and (w <= 0 or w >= 2):
+            return {"exito": False, "mensaje": "El factor de relajación w debe estar entre 0 y 2"}
+
+        iteracion = IteracionDispersa(A, b, metodo, w)
 
-        # Extraer lista de errores
         errores_lista = []
-        for dato in tabla_datos:
-            error_val = dato.get("error")
-            if error_val is not None:
-                errores_lista.append(error_val)
+        x_final = np.asarray(x0, dtype=float).copy()
+        c = 0
+        error = tol + 1
+
+        for c, x_final, error in _iterar(iteracion, x_final, tol, niter):
+            errores_lista.append(error)
 
-        return {
+        radio_espectral, estimador_usado = estimar_radio_espectral(iteracion, estimador, errores_lista)
+
+        resultado = {
             "exito": bool(error < tol),
-            "solucion": x_prev.tolist(),
+            "solucion": x_final.tolist(),
             "iteraciones": int(c),
-            "tabla": tabla_datos,
-            "errores": errores_lista,  # Lista de errores para comparación
+            "errores": errores_lista,
             "radio_espectral": float(radio_espectral),
-            "converge": converge,
-            "w": float(w),
-            "mensaje": f"Solución encontrada en {c} iteraciones con w={w}" if error < tol else f"No convergió en {niter} iteraciones",
-            "error_final": float(error)
+            "converge": bool(radio_espectral < 1),
+            "estimador_radio": estimador_usado,
+            "metodo": metodo,
+            "n": A.n,
+            "nnz": A.nnz,
+            "es_diagonalmente_dominante": A.es_diagonalmente_dominante()
         }
+        if iteracion.colores is not None:
+            resultado["colores"] = len(iteracion.colores)
+
+        mensaje = f"Solución encontrada en {c} iteraciones" if error < tol else f"No convergió en {niter} iteraciones"
+        if metodo == 'sor':
+            resultado["w"] = float(w)
+            if error < tol:
+                mensaje += f" con w={w}"
+
+        resultado["mensaje"] = mensaje
+        resultado["error_final"] = float(error)
+        return resultado
     except Exception as e:
         return {"exito": False, "mensaje": f"Error: {str(e)}"}
 
 
-def validar_matriz(matriz_str, b_str):
+def validar_dispersa(A, b):
+    """
+    Valida un sistema disperso ya construido
+
+    Parámetros:
+    A: MatrizCSR
+    b: Vector de términos independientes (lista, string "1,2,3" o numpy array)
+
+    Retorna: (b, error) - b como numpy array, o None y el mensaje de error
+    """
+    try:
+        if isinstance(b, str):
+            b = [v for v in b.replace(',', ' ').split()]
+        b = np.asarray(b, dtype=float).ravel()
+    except (ValueError, TypeError):
+        return None, "[ERROR] Error en vector b: Todos los elementos deben ser numeros"
+
+    if A.n < 2:
+        return None, "[ERROR] La matriz debe tener al menos 2x2 elementos"
+
+    if len(b) != A.n:
+        return None, f"[ERROR] El vector b debe tener {A.n} elementos (igual a las filas de A). Elementos actuales en b: {len(b)}"
+
+    if np.any(A.diagonal == 0):
+        indices_cero = (np.flatnonzero(A.diagonal == 0) + 1)[:10].tolist()
+        return None, f"[ERROR] La matriz tiene ceros en la diagonal (primeras posiciones: {indices_cero}). Los metodos iterativos requieren diagonal no nula."
+
+    if not np.all(np.isfinite(A.datos)):
+        return None, "[ERROR] La matriz contiene valores infinitos o NaN"
+
+    if not np.all(np.isfinite(b)):
+        return None, "[ERROR] El vector b contiene valores infinitos o NaN"
+
+    return b, None
+
+
+def validar_matriz(matriz_str, b_str, permitir_bloque=False):
     """
     Valida y convierte strings de matriz y vector b a numpy arrays
 
     Formato esperado:
     Matriz: "1,2,3;4,5,6;7,8,9" (filas separadas por ;, elementos por ,)
-    Vector b: "1,2,3" (elementos separados por ,)
+    Vector b: "1,2,3" (elementos separados por ,) o lista [1, 2, 3]
+
+    Con permitir_bloque, b también puede ser una matriz B de n x k con un
+    lado derecho por columna: "1,4;2,5;3,6" o lista de n filas [[1, 4], ...].
     """
     try:
         # Validar que no estén vacíos
         if not matriz_str or matriz_str.strip() == '':
             return None, None, "[ERROR] La matriz A no puede estar vacia. Formato: 10,1,1;2,10,1;2,2,10"
 
+        # Lista JSON: una lista de números es un solo vector b; una lista de filas es la matriz B
+        if isinstance(b_str, list):
+            if permitir_bloque and any(isinstance(fila, list) for fila in b_str):
+                b_str = ';'.join(','.join(str(v) for v in (fila if isinstance(fila, list) else [fila])) for fila in b_str)
+            else:
+                b_str = ','.join(str(v) for v in b_str)
+
         if not b_str or b_str.strip() == '':
             return None, None, "[ERROR] El vector b no puede estar vacio. Formato: 12,13,14"
 
@@ -288,12 +1719,23 @@ def validar_matriz(matriz_str, b_str):
 
         A = np.array(A)
 
-        # Procesar vector b
+        # Procesar vector b (o matriz B de lados derechos, una fila por ecuación)
         try:
-            b = np.array([float(x.strip()) for x in b_str.strip().split(',')])
+            if permitir_bloque and ';' in b_str:
+                filas_b = [[float(x.strip()) for x in fila.split(',')] for fila in b_str.strip().split(';')]
+            else:
+                b = np.array([float(x.strip()) for x in b_str.strip().split(',')])
         except ValueError:
             return None, None, "[ERROR] Error en vector b: Todos los elementos deben ser numeros. Formato: 12,13,14"
 
+        if permitir_bloque and ';' in b_str:
+            if len({len(fila) for fila in filas_b}) != 1:
+                return None, None, "[ERROR] Todas las filas de B deben tener la misma cantidad de lados derechos. Formato: 12,1;13,2;14,3"
+            b = np.array(filas_b)
+
+        if b.ndim == 2 and b.shape[1] > MAX_LADOS_DERECHOS:
+            return None, None, f"[ERROR] Máximo {MAX_LADOS_DERECHOS} lados derechos por solicitud. Actuales: {b.shape[1]}"
+
         # Validar dimensiones
         n_filas, n_cols = A.shape
 
@@ -372,9 +1814,10 @@ def generar_puntos_grafica_convergencia(tabla_datos, tipo_error="absoluto"):
     return iteraciones, errores
 
 
-def comparar_metodos_cap2(A, b, x0, tol, niter, w=1.5, tol_str=None):
+def comparar_metodos_cap2(A, b, x0, tol, niter, w=1.5, tol_str=None, precondicionador='jacobi'):
     """
-    Compara los tres métodos del capítulo 2 para un mismo problema
+    Compara los métodos del capítulo 2 (Jacobi, Gauss-Seidel, SOR, CG,
+    BiCGSTAB y GMRES) para un mismo problema
 
     Parámetros:
     A: Matriz de coeficientes (numpy array)
@@ -382,33 +1825,29 @@ def comparar_metodos_cap2(A, b, x0, tol, niter, w=1.5, tol_str=None):
     x0: Vector inicial (numpy array)
     tol: Tolerancia para el error
     niter: Número máximo de iteraciones
-    w: Factor de relajación para SOR
-    tol_str: String de tolerancia para detectar tipo de error
+    w: Factor de relajación para SOR, o 'auto'/'adaptativo' (el w elegido se usa también en SSOR)
+    tol_str: String de tolerancia (se conserva por compatibilidad; el error siempre es la norma infinito)
+    precondicionador: Precondicionador de los métodos de Krylov ('ninguno', 'jacobi' o 'ssor')
 
     Retorna: dict con resultados de cada método y análisis comparativo
     """
     resultados = {}
 
-    # Ejecutar Jacobi
-    res_jacobi = jacobi(A, b, x0.copy(), tol, niter, tol_str)
-    resultados['jacobi'] = res_jacobi
-
-    # Ejecutar Gauss-Seidel
-    res_seidel = gauss_seidel(A, b, x0.copy(), tol, niter, tol_str)
-    resultados['gauss_seidel'] = res_seidel
+    # Métodos estacionarios
+    resultados['jacobi'] = jacobi(A, b, x0.copy(), tol, niter)
+    resultados['gauss_seidel'] = gauss_seidel(A, b, x0.copy(), tol, niter)
+    resultados['sor'] = sor(A, b, x0.copy(), tol, niter, w)
 
-    # Ejecutar SOR
-    res_sor = sor(A, b, x0.copy(), tol, niter, w, tol_str)
-    resultados['sor'] = res_sor
+    # Métodos de Krylov (CG solo aplica a matrices simétricas definidas positivas)
+    w_ssor = resultados['sor'].get('w', 1.0)
+    for metodo in METODOS_KRYLOV:
+        resultados[metodo] = krylov(A, b, x0.copy(), tol, niter, metodo, precondicionador, w_ssor)
 
     # Análisis comparativo
-    metodos_exitosos = []
-    if res_jacobi.get('exito'):
-        metodos_exitosos.append(('Jacobi', res_jacobi['iteraciones'], res_jacobi['error_final']))
-    if res_seidel.get('exito'):
-        metodos_exitosos.append(('Gauss-Seidel', res_seidel['iteraciones'], res_seidel['error_final']))
-    if res_sor.get('exito'):
-        metodos_exitosos.append(('SOR', res_sor['iteraciones'], res_sor['error_final']))
+    nombres = {'jacobi': 'Jacobi', 'gauss_seidel': 'Gauss-Seidel', 'sor': 'SOR',
+               'cg': 'CG', 'bicgstab': 'BiCGSTAB', 'gmres': 'GMRES'}
+    metodos_exitosos = [(nombres[clave], res['iteraciones'], res['error_final'])
+                        for clave, res in resultados.items() if res.get('exito')]
 
     if metodos_exitosos:
         # Ordenar por número de iteraciones (menor es mejor)
@@ -6,7 +6,30 @@ Basado en los códigos del profesor con mejoras para la aplicación web
 """
 
 import numpy as np
-import sympy as sp
+
+
+# Puntos por segmento en las gráficas de los splines
+PUNTOS_POR_SEGMENTO = 50
+
+# Máximo de puntos en la gráfica de un spline (con más segmentos se usa una malla uniforme)
+MAX_PUNTOS_GRAFICA = 20000
+
+# Máximo de puntos aceptados por el spline cúbico (el resto de métodos admite 8)
+MAX_PUNTOS_SPLINE = 1000000
+
+# Formas de Lagrange y máximo de puntos en la forma baricéntrica
+FORMAS_LAGRANGE = ('monomial', 'baricentrica')
+MAX_PUNTOS_BARICENTRICO = 10000
+
+# Máximo de puntos en Newton cuando solo se piden los coeficientes (sin la tabla n x n)
+MAX_PUNTOS_NEWTON = 10000
+
+# Términos mostrados en los strings de polinomios muy largos
+MAX_TERMINOS_STRING = 12
+
+# Segmentos, coeficientes y errores detallados en la respuesta de un spline;
+# con más segmentos se devuelven los primeros y un resumen (mantiene acotado el JSON)
+MAX_SEGMENTOS_DETALLE = 200
 
 
 def vandermonde(x, y):
@@ -65,13 +88,15 @@ def vandermonde(x, y):
         return {"exito": False, "mensaje": f"❌ Error: {str(e)}"}
 
 
-def newton_interpolante(x, y):
+def newton_interpolante(x, y, tabla_completa=True):
     """
     Método de Newton con diferencias divididas
 
     Parámetros:
     x: Array con los valores de x (puntos conocidos)
     y: Array con los valores de y (valores de la función en esos puntos)
+    tabla_completa: Si es False solo se calculan los coeficientes (la diagonal
+                    de la tabla) con memoria O(n) y no se retorna 'tabla'
 
     Retorna:
     dict con 'exito', 'tabla', 'coeficientes', 'polinomio_str', 'puntos_grafica'
@@ -79,64 +104,110 @@ def newton_interpolante(x, y):
     try:
         n = len(x)
 
-        # Crear tabla de diferencias divididas
-        Tabla = np.zeros((n, n + 1))
-        Tabla[:, 0] = x
-        Tabla[:, 1] = y
-
-        # Calcular diferencias divididas
-        for j in range(2, n + 1):
-            for i in range(j - 1, n):
-                Tabla[i, j] = (Tabla[i, j-1] - Tabla[i-1, j-1]) / (Tabla[i, 0] - Tabla[i-j+1, 0])
+        # Crear tabla de diferencias divididas y extraer coeficientes (diagonal)
+        with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+            if tabla_completa:
+                Tabla = tabla_diferencias_divididas(x, y)
+                coeficientes = np.diagonal(Tabla, offset=1).copy()
+            else:
+                Tabla = None
+                coeficientes = coeficientes_newton(x, y)
 
-        # Extraer coeficientes (diagonal de diferencias divididas)
-        coeficientes = []
-        for i in range(n):
-            coeficientes.append(Tabla[i, i+1])
+        # Con muchos nodos las diferencias divididas se desbordan (inf/NaN)
+        if not np.all(np.isfinite(coeficientes)):
+            if len(np.unique(x)) != n:
+                return {"exito": False, "mensaje": "❌ Error: División por cero. Verifica que no haya valores de x repetidos."}
+            return {"exito": False,
+                    "mensaje": f"❌ Error: Las diferencias divididas se desbordan con {n} puntos (grado {n - 1}).\n💡 Usa Lagrange en forma baricéntrica, que es estable para grados altos."}
 
         # Crear string del polinomio de Newton
-        polinomio_str = crear_string_newton(coeficientes, x)
+        polinomio_str = crear_string_newton(coeficientes, x, max_terminos=MAX_TERMINOS_STRING)
 
         # Generar puntos para graficar
         x_min, x_max = x.min(), x.max()
         margen = (x_max - x_min) * 0.1 if x_max != x_min else 1
         x_plot = np.linspace(x_min - margen, x_max + margen, 300)
-        y_plot = np.array([evaluar_newton(Tabla, xi) for xi in x_plot])
+        y_plot = horner_newton(coeficientes, x, x_plot)
 
         # Verificación en puntos originales
-        errores = []
-        for i in range(len(x)):
-            y_calc = evaluar_newton(Tabla, x[i])
-            errores.append(abs(y[i] - y_calc))
+        errores = np.abs(y - horner_newton(coeficientes, x, x))
 
-        return {
+        resultado = {
             "exito": True,
-            "tabla": Tabla.tolist(),
-            "coeficientes": coeficientes,
+            "tabla": Tabla.tolist() if tabla_completa else None,
+            "coeficientes": coeficientes.tolist(),
             "polinomio_str": polinomio_str,
             "puntos_grafica": {"x": x_plot.tolist(), "y": y_plot.tolist()},
             "puntos_originales": {"x": x.tolist(), "y": y.tolist()},
-            "errores": errores,
+            "errores": errores.tolist(),
             "grado": n - 1,
             "tipo": "polinomial"
         }
-    except ZeroDivisionError:
-        return {"exito": False, "mensaje": "❌ Error: División por cero. Verifica que no haya valores de x repetidos."}
+        if not tabla_completa:
+            del resultado["tabla"]
+        return resultado
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error: {str(e)}"}
 
 
-def lagrange(x, y):
+def tabla_diferencias_divididas(x, y):
+    """
+    Tabla de diferencias divididas construida por columnas
+
+    La columna 0 tiene los x, la columna 1 los y, y la columna j+1 las
+    diferencias de orden j: T[i, j+1] = (T[i, j] - T[i-1, j]) / (x_i - x_{i-j}).
+    Cada columna es una sola operación vectorizada.
+
+    Retorna: numpy array n x (n+1) (triangular inferior a partir de la columna 1)
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    Tabla = np.zeros((n, n + 1))
+    Tabla[:, 0] = x
+    Tabla[:, 1] = y
+
+    for j in range(1, n):
+        anterior = Tabla[:, j]
+        Tabla[j:, j + 1] = (anterior[j:] - anterior[j-1:-1]) / (x[j:] - x[:-j])
+
+    return Tabla
+
+
+def coeficientes_newton(x, y):
+    """
+    Coeficientes de Newton (diagonal de la tabla de diferencias divididas)
+    calculados en un solo vector, con memoria O(n)
+
+    Retorna: numpy array [f[x_0], f[x_0,x_1], ..., f[x_0,...,x_{n-1}]]
+    """
+    x = np.asarray(x, dtype=float)
+    c = np.array(y, dtype=float)
+
+    # Tras el paso j, c[i] (i >= j) guarda f[x_{i-j}, ..., x_i]
+    for j in range(1, len(x)):
+        c[j:] = (c[j:] - c[j-1:-1]) / (x[j:] - x[:-j])
+
+    return c
+
+
+def lagrange(x, y, forma='monomial'):
     """
     Método de Lagrange para interpolación polinomial
 
     Parámetros:
     x: Array con los valores de x (puntos conocidos)
     y: Array con los valores de y (valores de la función en esos puntos)
+    forma: 'monomial' (coeficientes del polinomio expandido) o
+           'baricentrica' (pesos baricéntricos, estable para grados altos)
 
     Retorna:
-    dict con 'exito', 'coeficientes', 'polinomio_str', 'puntos_grafica'
+    dict con 'exito', 'coeficientes' (o 'pesos'), 'polinomio_str', 'puntos_grafica'
     """
+    if forma == 'baricentrica':
+        return lagrange_baricentrico(x, y)
+    if forma != 'monomial':
+        return {"exito": False, "mensaje": f"❌ Error: Forma '{forma}' no reconocida.\n💡 Opciones: {', '.join(FORMAS_LAGRANGE)}"}
+
     try:
         n = len(x)
         Tabla = np.zeros((n, n))
@@ -190,95 +261,210 @@ def lagrange(x, y):
         return {"exito": False, "mensaje": f"❌ Error: {str(e)}"}
 
 
-def spline_lineal(x, y):
+class LagrangeBaricentrico:
     """
-    Spline lineal (interpolación por segmentos lineales)
+    Interpolante de Lagrange en forma baricéntrica
 
-    Para cada segmento [x_i, x_{i+1}], calcula un polinomio lineal:
-    P_i(x) = a_i*x + b_i
+    p(x) = [Σ w_j y_j / (x - x_j)] / [Σ w_j / (x - x_j)],  w_j = 1 / Π_{k≠j} (x_j - x_k)
+
+    Los pesos cuestan O(n^2) una sola vez (O(n) por cada nodo agregado) y
+    cada evaluación cuesta O(n). Como los productos se desbordan en grados
+    altos, cada peso se guarda como signo y logaritmo de su magnitud; la
+    fórmula es invariante a un factor común, así que los pesos expuestos se
+    normalizan para que el mayor tenga magnitud 1.
+    """
+
+    def __init__(self, x, y, bloque=4000000):
+        self.nodos = np.asarray(x, dtype=float).copy()
+        self.valores = np.asarray(y, dtype=float).copy()
+        n = len(self.nodos)
+        if n == 0:
+            raise ValueError("Se necesita al menos un nodo")
+        if len(np.unique(self.nodos)) != n:
+            raise ValueError("No puede haber valores de x repetidos")
+
+        self._log_pesos = np.empty(n)
+        self._signos = np.empty(n)
+
+        # Filas de la matriz de diferencias por bloques: O(n^2) tiempo, memoria acotada
+        paso = max(1, bloque // n)
+        for inicio in range(0, n, paso):
+            filas = np.arange(inicio, min(n, inicio + paso))
+            diferencias = self.nodos[filas, None] - self.nodos[None, :]
+            diferencias[np.arange(len(filas)), filas] = 1.0
+            self._log_pesos[filas] = -np.log(np.abs(diferencias)).sum(axis=1)
+            self._signos[filas] = np.prod(np.sign(diferencias), axis=1)
+
+        self._actualizar_pesos()
+
+    def _actualizar_pesos(self):
+        self.pesos = self._signos * np.exp(self._log_pesos - self._log_pesos.max())
+
+    def agregar_nodo(self, x_nuevo, y_nuevo):
+        """Agrega el nodo (x_nuevo, y_nuevo) actualizando los pesos en O(n)"""
+        diferencias = self.nodos - x_nuevo
+        if np.any(diferencias == 0):
+            raise ValueError(f"El nodo x = {x_nuevo} ya existe")
+
+        # w_j <- w_j / (x_j - x_nuevo)  y  w_nuevo = 1 / Π (x_nuevo - x_j)
+        self._log_pesos = np.append(self._log_pesos - np.log(np.abs(diferencias)),
+                                    -np.log(np.abs(diferencias)).sum())
+        self._signos = np.append(self._signos * np.sign(diferencias), np.prod(np.sign(-diferencias)))
+        self.nodos = np.append(self.nodos, float(x_nuevo))
+        self.valores = np.append(self.valores, float(y_nuevo))
+        self._actualizar_pesos()
+
+    def evaluar(self, x_eval, bloque=4000000):
+        """
+        Evalúa el interpolante en x_eval (escalar o array)
+
+        Los puntos se procesan en bloques de a lo sumo 'bloque' pares
+        (punto, nodo) para no formar matrices enormes.
+        En los nodos se retorna el valor exacto y_j.
+        """
+        x_eval = np.asarray(x_eval, dtype=float)
+        planos = x_eval.ravel()
+        resultado = np.empty(planos.size)
+        paso = max(1, bloque // len(self.nodos))
+
+        for inicio in range(0, planos.size, paso):
+            puntos = planos[inicio:inicio + paso]
+            diferencias = puntos[:, None] - self.nodos[None, :]
+            exactos = diferencias == 0
+            diferencias[exactos] = 1.0
+
+            cocientes = self.pesos / diferencias
+            valores = (cocientes @ self.valores) / cocientes.sum(axis=1)
+
+            fila, columna = np.nonzero(exactos)
+            valores[fila] = self.valores[columna]
+            resultado[inicio:inicio + paso] = valores
+
+        return float(resultado[0]) if x_eval.ndim == 0 else resultado.reshape(x_eval.shape)
+
+    __call__ = evaluar
+
+
+def lagrange_baricentrico(x, y):
+    """
+    Interpolación de Lagrange en forma baricéntrica (ver LagrangeBaricentrico)
 
     Parámetros:
     x: Array con los valores de x (puntos conocidos)
     y: Array con los valores de y (valores de la función en esos puntos)
 
     Retorna:
-    dict con 'exito', 'coeficientes', 'segmentos', 'puntos_grafica'
+    dict con 'exito', 'pesos', 'polinomio_str', 'puntos_grafica'
     """
     try:
         n = len(x)
-        d = 1  # grado lineal
-
-        # Crear matriz A y vector b para el sistema lineal
-        A = np.zeros(((d+1)*(n-1), (d+1)*(n-1)))
-        b_vec = np.zeros((d+1)*(n-1))
-
-        c = 0  # columna
-        h = 0  # fila
-
-        # Condición 1: El polinomio i pasa por el punto (x_i, y_i)
-        # P_i(x_i) = y_i para i = 1, 2, ..., n-1
-        for i in range(n-1):
-            A[h, c] = x[i]
-            A[h, c+1] = 1
-            b_vec[h] = y[i]
-            c += 2
-            h += 1
-
-        # Condición 2: El polinomio i pasa por el punto (x_{i+1}, y_{i+1})
-        # P_i(x_{i+1}) = y_{i+1} para i = 1, 2, ..., n-1
-        c = 0
-        for i in range(1, n):
-            A[h, c] = x[i]
-            A[h, c+1] = 1
-            b_vec[h] = y[i]
-            c += 2
-            h += 1
-
-        # Resolver el sistema lineal
-        val = np.linalg.solve(A, b_vec)
-
-        # Reorganizar los coeficientes en una tabla
-        # Cada fila representa un segmento: [a, b] para P(x) = ax + b
-        Tabla = val.reshape(n-1, d+1)
-
-        # Crear lista de segmentos
-        segmentos = []
-        for i in range(n-1):
-            a, b_coef = Tabla[i]
-            segmentos.append({
-                "intervalo": [float(x[i]), float(x[i+1])],
-                "coeficientes": [float(a), float(b_coef)],
-                "polinomio": f"{a:.6f}x {'+' if b_coef >= 0 else '-'} {abs(b_coef):.6f}"
-            })
+        interpolante = LagrangeBaricentrico(x, y)
 
         # Generar puntos para graficar
-        x_plot = []
-        y_plot = []
-        for i in range(n-1):
-            x_seg = np.linspace(x[i], x[i+1], 50)
-            y_seg = Tabla[i, 0] * x_seg + Tabla[i, 1]
-            x_plot.extend(x_seg.tolist())
-            y_plot.extend(y_seg.tolist())
+        x_min, x_max = x.min(), x.max()
+        margen = (x_max - x_min) * 0.1 if x_max != x_min else 1
+        x_plot = np.linspace(x_min - margen, x_max + margen, 300)
+        y_plot = interpolante(x_plot)
 
         # Verificación en puntos originales
-        errores = []
-        for i in range(len(x)):
-            y_calc = evaluar_spline_lineal(Tabla, x, x[i])
-            errores.append(abs(y[i] - y_calc))
+        errores = np.abs(y - interpolante(x))
 
         return {
             "exito": True,
-            "coeficientes": Tabla.tolist(),
-            "segmentos": segmentos,
-            "puntos_grafica": {"x": x_plot, "y": y_plot},
+            "pesos": interpolante.pesos.tolist(),
+            "polinomio_str": crear_string_baricentrico(interpolante),
+            "puntos_grafica": {"x": x_plot.tolist(), "y": y_plot.tolist()},
             "puntos_originales": {"x": x.tolist(), "y": y.tolist()},
-            "errores": errores,
-            "num_segmentos": n - 1,
-            "tipo": "spline",
-            "grado_spline": 1
+            "errores": errores.tolist(),
+            "grado": n - 1,
+            "forma": "baricentrica",
+            "tipo": "polinomial"
         }
-    except np.linalg.LinAlgError:
-        return {"exito": False, "mensaje": "❌ Error: El sistema de ecuaciones es singular."}
+    except Exception as e:
+        return {"exito": False, "mensaje": f"❌ Error: {str(e)}"}
+
+
+def detalle_spline(spline, tabla, formatear):
+    """
+    Arma la respuesta común de los splines (segmentos, gráfica y errores).
+
+    Con más de MAX_SEGMENTOS_DETALLE segmentos solo se detallan los primeros
+    (igual que MAX_TERMINOS_STRING recorta el string de Newton): los errores se
+    resumen en 'error_maximo'/'error_promedio' y los puntos originales se
+    submuestrean a MAX_PUNTOS_GRAFICA para la gráfica.
+
+    Parámetros:
+    spline: Spline ya construido
+    tabla: Matriz (n-1) x (grado+1) con los coeficientes en la base monomial
+    formatear: Función que arma el string del polinomio de un segmento
+
+    Retorna:
+    dict con 'exito', 'coeficientes', 'segmentos', 'puntos_grafica', 'errores', ...
+    """
+    x, y = spline.nodos, spline.valores
+    num_segmentos = len(x) - 1
+    mostrados = min(num_segmentos, MAX_SEGMENTOS_DETALLE)
+
+    # Solo los segmentos mostrados (con floats de Python: formatear escalares numpy es lento)
+    coeficientes = tabla[:mostrados].tolist()
+    nodos = x[:mostrados + 1].tolist()
+    segmentos = [{
+        "intervalo": [nodos[i], nodos[i+1]],
+        "coeficientes": fila,
+        "polinomio": formatear(*fila)
+    } for i, fila in enumerate(coeficientes)]
+
+    # Generar puntos para graficar
+    x_plot, y_plot = spline.puntos_grafica()
+
+    # Verificación en puntos originales
+    errores = np.abs(y - spline.evaluar(x))
+
+    # Puntos originales para la gráfica (submuestreados si son demasiados)
+    paso = -(-len(x) // MAX_PUNTOS_GRAFICA)
+    indices = np.r_[np.arange(0, len(x) - 1, paso), len(x) - 1] if paso > 1 else slice(None)
+
+    truncado = mostrados < num_segmentos
+    return {
+        "exito": True,
+        "coeficientes": coeficientes,
+        "segmentos": segmentos,
+        "puntos_grafica": {"x": x_plot.tolist(), "y": y_plot.tolist()},
+        "puntos_originales": {"x": x[indices].tolist(), "y": y[indices].tolist()},
+        "errores": errores[:MAX_SEGMENTOS_DETALLE + 1].tolist() if truncado else errores.tolist(),
+        "error_maximo": float(errores.max()),
+        "error_promedio": float(errores.mean()),
+        "num_segmentos": num_segmentos,
+        "segmentos_mostrados": mostrados,
+        "segmentos_truncados": truncado,
+        "tipo": "spline"
+    }
+
+
+def spline_lineal(x, y):
+    """
+    Spline lineal (interpolación por segmentos lineales)
+
+    Para cada segmento [x_i, x_{i+1}], calcula un polinomio lineal:
+    P_i(x) = a_i*x + b_i
+
+    con la pendiente a_i = (y_{i+1} - y_i) / (x_{i+1} - x_i) y el
+    intercepto b_i = y_i - a_i*x_i (sin armar ningún sistema de ecuaciones).
+
+    Parámetros:
+    x: Array con los valores de x (puntos conocidos)
+    y: Array con los valores de y (valores de la función en esos puntos)
+
+    Retorna:
+    dict con 'exito', 'coeficientes', 'segmentos', 'puntos_grafica'
+    """
+    try:
+        spline = Spline.lineal(x, y)
+
+        # Cada fila representa un segmento: [a, b] para P(x) = ax + b
+        resultado = detalle_spline(spline, spline.monomios(), formatear_polinomio_lineal)
+        resultado["grado_spline"] = 1
+        return resultado
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error: {str(e)}"}
 
@@ -290,6 +476,11 @@ def spline_cubico(x, y):
     Para cada segmento [x_i, x_{i+1}], calcula un polinomio cúbico:
     P_i(x) = a_i*x^3 + b_i*x^2 + c_i*x + d_i
 
+    Las segundas derivadas M_i en los nodos se obtienen del sistema
+    tridiagonal del spline natural (M_0 = M_{n-1} = 0) con el algoritmo de
+    Thomas en O(n). Cada segmento se construye en coordenadas locales
+    t = x - x_i y al final se expresa en la base monomial para la salida.
+
     Parámetros:
     x: Array con los valores de x (puntos conocidos)
     y: Array con los valores de y (valores de la función en esos puntos)
@@ -298,129 +489,200 @@ def spline_cubico(x, y):
     dict con 'exito', 'coeficientes', 'segmentos', 'puntos_grafica'
     """
     try:
-        n = len(x)
-        d = 3  # grado cúbico
-
-        # Crear matriz A y vector b para el sistema lineal
-        A = np.zeros(((d+1)*(n-1), (d+1)*(n-1)))
-        b_vec = np.zeros((d+1)*(n-1))
-
-        # Potencias de x
-        x2 = x**2
-        x3 = x**3
-
-        c = 0  # columna
-        h = 0  # fila
-
-        # Condición 1: P_i(x_i) = y_i para i = 1, 2, ..., n-1
-        for i in range(n-1):
-            A[h, c] = x3[i]
-            A[h, c+1] = x2[i]
-            A[h, c+2] = x[i]
-            A[h, c+3] = 1
-            b_vec[h] = y[i]
-            c += 4
-            h += 1
-
-        # Condición 2: P_i(x_{i+1}) = y_{i+1} para i = 1, 2, ..., n-1
-        c = 0
-        for i in range(1, n):
-            A[h, c] = x3[i]
-            A[h, c+1] = x2[i]
-            A[h, c+2] = x[i]
-            A[h, c+3] = 1
-            b_vec[h] = y[i]
-            c += 4
-            h += 1
-
-        # Condición 3: Primera derivada continua en los puntos interiores
-        # P'_i(x_{i+1}) = P'_{i+1}(x_{i+1}) para i = 1, 2, ..., n-2
-        c = 0
-        for i in range(1, n-1):
-            A[h, c] = 3*x2[i]
-            A[h, c+1] = 2*x[i]
-            A[h, c+2] = 1
-            A[h, c+4] = -3*x2[i]
-            A[h, c+5] = -2*x[i]
-            A[h, c+6] = -1
-            b_vec[h] = 0
-            c += 4
-            h += 1
-
-        # Condición 4: Segunda derivada continua en los puntos interiores
-        # P''_i(x_{i+1}) = P''_{i+1}(x_{i+1}) para i = 1, 2, ..., n-2
-        c = 0
-        for i in range(1, n-1):
-            A[h, c] = 6*x[i]
-            A[h, c+1] = 2
-            A[h, c+4] = -6*x[i]
-            A[h, c+5] = -2
-            b_vec[h] = 0
-            c += 4
-            h += 1
-
-        # Condición 5: Spline natural (segunda derivada nula en los extremos)
-        # P''_1(x_1) = 0
-        A[h, 0] = 6*x[0]
-        A[h, 1] = 2
-        b_vec[h] = 0
-        h += 1
-
-        # P''_{n-1}(x_n) = 0
-        A[h, c] = 6*x[-1]
-        A[h, c+1] = 2
-        b_vec[h] = 0
-
-        # Resolver el sistema lineal
-        val = np.linalg.solve(A, b_vec)
-
-        # Reorganizar los coeficientes en una tabla
-        # Cada fila representa un segmento: [a, b, c, d] para P(x) = ax^3 + bx^2 + cx + d
-        Tabla = val.reshape(n-1, d+1)
-
-        # Crear lista de segmentos
-        segmentos = []
-        for i in range(n-1):
-            a, b, c_coef, d_coef = Tabla[i]
-            segmentos.append({
-                "intervalo": [float(x[i]), float(x[i+1])],
-                "coeficientes": [float(a), float(b), float(c_coef), float(d_coef)],
-                "polinomio": formatear_polinomio_cubico(a, b, c_coef, d_coef)
-            })
+        spline = Spline.cubico_natural(x, y)
 
-        # Generar puntos para graficar
-        x_plot = []
-        y_plot = []
-        for i in range(n-1):
-            x_seg = np.linspace(x[i], x[i+1], 50)
-            a, b, c_coef, d_coef = Tabla[i]
-            y_seg = a * x_seg**3 + b * x_seg**2 + c_coef * x_seg + d_coef
-            x_plot.extend(x_seg.tolist())
-            y_plot.extend(y_seg.tolist())
+        # Coeficientes en la base monomial: [a, b, c, d] para P(x) = ax^3 + bx^2 + cx + d
+        Tabla = spline.monomios()
 
-        # Verificación en puntos originales
-        errores = []
-        for i in range(len(x)):
-            y_calc = evaluar_spline_cubico(Tabla, x, x[i])
-            errores.append(abs(y[i] - y_calc))
-
-        return {
-            "exito": True,
-            "coeficientes": Tabla.tolist(),
-            "segmentos": segmentos,
-            "puntos_grafica": {"x": x_plot, "y": y_plot},
-            "puntos_originales": {"x": x.tolist(), "y": y.tolist()},
-            "errores": errores,
-            "num_segmentos": n - 1,
-            "tipo": "spline",
-            "grado_spline": 3
-        }
+        resultado = detalle_spline(spline, Tabla, formatear_polinomio_cubico)
+        resultado["grado_spline"] = 3
+        return resultado
     except np.linalg.LinAlgError:
         return {"exito": False, "mensaje": "❌ Error: El sistema de ecuaciones es singular."}
     except Exception as e:
         return {"exito": False, "mensaje": f"❌ Error: {str(e)}"}
 
 
+def resolver_tridiagonal(inferior, diagonal, superior, d):
+    """
+    Resuelve un sistema tridiagonal con el algoritmo de Thomas en O(n)
+
+    Parámetros:
+    inferior: Subdiagonal (n-1 elementos)
+    diagonal: Diagonal principal (n elementos)
+    superior: Superdiagonal (n-1 elementos)
+    d: Lado derecho (n elementos)
+
+    Retorna: numpy array con la solución
+    """
+    n = len(diagonal)
+    if n == 0:
+        return np.zeros(0)
+
+    # Listas de Python: el barrido es secuencial y así evita el costo de indexar numpy
+    a = list(map(float, inferior))
+    b = list(map(float, diagonal))
+    c = list(map(float, superior))
+    d = list(map(float, d))
+
+    # Eliminación hacia adelante
+    for i in range(1, n):
+        m = a[i-1] / b[i-1]
+        b[i] -= m * c[i-1]
+        d[i] -= m * d[i-1]
+
+    # Sustitución regresiva
+    x = [0.0] * n
+    x[-1] = d[-1] / b[-1]
+    for i in range(n - 2, -1, -1):
+        x[i] = (d[i] - c[i] * x[i+1]) / b[i]
+
+    return np.array(x)
+
+
+def coeficientes_spline_cubico(x, y):
+    """
+    Coeficientes locales del spline cúbico natural
+
+    Para el segmento i con t = x - x_i y h_i = x_{i+1} - x_i:
+    S_i(t) = y_i + b_i t + c_i t^2 + d_i t^3, donde
+    c_i = M_i / 2, d_i = (M_{i+1} - M_i) / (6 h_i),
+    b_i = (y_{i+1} - y_i) / h_i - h_i (2 M_i + M_{i+1}) / 6
+
+    Parámetros:
+    x: Nodos ordenados de forma creciente
+    y: Valores en los nodos
+
+    Retorna: numpy array (n-1) x 4 con [y_i, b_i, c_i, d_i] por fila
+    """
+    h = np.diff(x)
+    pendientes = np.diff(y) / h
+
+    # Sistema tridiagonal para las segundas derivadas interiores M_1 .. M_{n-2}:
+    # h_{i-1} M_{i-1} + 2 (h_{i-1} + h_i) M_i + h_i M_{i+1} = 6 (pendiente_i - pendiente_{i-1})
+    M = np.zeros(len(x))
+    M[1:-1] = resolver_tridiagonal(h[1:-1], 2 * (h[:-1] + h[1:]), h[1:-1], 6 * np.diff(pendientes))
+
+    return np.column_stack([
+        y[:-1],
+        pendientes - h * (2 * M[:-1] + M[1:]) / 6,
+        M[:-1] / 2,
+        np.diff(M) / (6 * h)
+    ])
+
+
+def locales_a_monomios(locales, x_izq):
+    """
+    Convierte coeficientes locales [y_i, b_i, c_i, d_i] (en t = x - x_i)
+    a la base monomial [a, b, c, d] de P(x) = ax^3 + bx^2 + cx + d
+    """
+    e, b, c, d = locales.T
+    return np.column_stack([
+        d,
+        c - 3 * d * x_izq,
+        b - 2 * c * x_izq + 3 * d * x_izq**2,
+        e - b * x_izq + c * x_izq**2 - d * x_izq**3
+    ])
+
+
+class Spline:
+    """
+    Spline por segmentos reutilizable, con los nodos y coeficientes precalculados
+
+    Cada segmento i se guarda en coordenadas locales t = x - x_i:
+    S_i(t) = c_i0 + c_i1 t + ... + c_ik t^k
+
+    La evaluación es vectorizada: el segmento de cada punto se ubica con
+    np.searchsorted (búsqueda binaria) y el polinomio local se evalúa con
+    Horner. Fuera de [x_0, x_{n-1}] se extrapola con el primer/último segmento.
+    """
+
+    def __init__(self, nodos, locales, valores=None):
+        self.nodos = np.asarray(nodos, dtype=float)
+        self.locales = np.asarray(locales, dtype=float)
+        self.valores = self.locales[:, 0] if valores is None else np.asarray(valores, dtype=float)
+        self.grado = self.locales.shape[1] - 1
+
+    @staticmethod
+    def _ordenar(x, y):
+        """Ordena los nodos de forma creciente (los segmentos unen nodos consecutivos)"""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        orden = np.argsort(x, kind='stable')
+        return x[orden], y[orden]
+
+    @classmethod
+    def lineal(cls, x, y):
+        """Spline lineal: S_i(t) = y_i + m_i t con m_i la pendiente del segmento"""
+        x, y = cls._ordenar(x, y)
+        return cls(x, np.column_stack([y[:-1], np.diff(y) / np.diff(x)]), y)
+
+    @classmethod
+    def cubico_natural(cls, x, y):
+        """Spline cúbico natural (ver coeficientes_spline_cubico)"""
+        x, y = cls._ordenar(x, y)
+        return cls(x, coeficientes_spline_cubico(x, y), y)
+
+    @property
+    def num_segmentos(self):
+        return len(self.nodos) - 1
+
+    def segmento(self, x_eval):
+        """Índice del segmento de cada punto (búsqueda binaria sobre los nodos)"""
+        indices = np.searchsorted(self.nodos, x_eval, side='right') - 1
+        return np.clip(indices, 0, self.num_segmentos - 1)
+
+    def evaluar(self, x_eval):
+        """
+        Evalúa el spline en x_eval (escalar o array)
+
+        Retorna: float si x_eval es escalar, numpy array con la forma de x_eval si no
+        """
+        x_eval = np.asarray(x_eval, dtype=float)
+        resultado = self._horner(self.segmento(x_eval), x_eval)
+        return float(resultado) if resultado.ndim == 0 else resultado
+
+    def _horner(self, indices, x_eval):
+        """Evalúa el polinomio local del segmento indices[k] en x_eval[k] con Horner"""
+        t = x_eval - self.nodos[indices]
+        coef = self.locales[indices]
+
+        resultado = coef[..., self.grado]
+        for k in range(self.grado - 1, -1, -1):
+            resultado = resultado * t + coef[..., k]
+        return resultado
+
+    __call__ = evaluar
+
+    def monomios(self):
+        """
+        Coeficientes de cada segmento en la base monomial (mayor potencia primero)
+        """
+        x_izq = self.nodos[:-1]
+        if self.grado == 1:
+            e, m = self.locales.T
+            return np.column_stack([m, e - m * x_izq])
+        return locales_a_monomios(self.locales, x_izq)
+
+    def puntos_grafica(self):
+        """
+        Puntos para graficar: PUNTOS_POR_SEGMENTO por segmento si caben en
+        MAX_PUNTOS_GRAFICA; si no, una malla uniforme de MAX_PUNTOS_GRAFICA puntos
+
+        Retorna: (x_plot, y_plot) como numpy arrays
+        """
+        if self.num_segmentos * PUNTOS_POR_SEGMENTO <= MAX_PUNTOS_GRAFICA:
+            t = np.linspace(0.0, 1.0, PUNTOS_POR_SEGMENTO)
+            x_plot = (self.nodos[:-1, None] + t * np.diff(self.nodos)[:, None]).ravel()
+            # Evaluar cada punto en su propio segmento (el extremo derecho también)
+            indices = np.repeat(np.arange(self.num_segmentos), PUNTOS_POR_SEGMENTO)
+        else:
+            x_plot = np.linspace(self.nodos[0], self.nodos[-1], MAX_PUNTOS_GRAFICA)
+            indices = self.segmento(x_plot)
+
+        return x_plot, self._horner(indices, x_plot)
+
+
 # ===== FUNCIONES AUXILIARES =====
 
 def evaluar_polinomio_vandermonde(coeficientes, x_eval):
@@ -446,85 +708,89 @@ def evaluar_polinomio_vandermonde(coeficientes, x_eval):
 
 def evaluar_newton(Tabla, x_eval):
     """
-    Evalúa el polinomio de Newton en un punto dado
+    Evalúa el polinomio de Newton en los puntos dados
 
     Parámetros:
     Tabla: Tabla de diferencias divididas
-    x_eval: Punto donde evaluar el polinomio
+    x_eval: Punto o array de puntos donde evaluar el polinomio
 
     Retorna:
-    Valor del polinomio en x_eval
+    Valor del polinomio en x_eval (float si x_eval es escalar)
     """
-    n = len(Tabla)
-    x = Tabla[:, 0]
-    resultado = Tabla[0, 1]
-    producto = 1.0
+    Tabla = np.asarray(Tabla, dtype=float)
+    return horner_newton(np.diagonal(Tabla, offset=1), Tabla[:, 0], x_eval)
 
-    for i in range(1, n):
-        producto *= (x_eval - x[i-1])
-        resultado += Tabla[i, i+1] * producto
 
-    return resultado
+def horner_newton(coeficientes, x, x_eval):
+    """
+    Evalúa a_0 + a_1(x-x_0) + ... + a_{n-1}(x-x_0)...(x-x_{n-2}) por
+    multiplicación anidada: (...(a_{n-1}(x - x_{n-2}) + a_{n-2})(x - x_{n-3}) + ...) + a_0
+
+    Parámetros:
+    coeficientes: Coeficientes de Newton [a_0, ..., a_{n-1}]
+    x: Nodos de interpolación
+    x_eval: Punto o array de puntos donde evaluar
+
+    Retorna:
+    Valor del polinomio en x_eval (float si x_eval es escalar)
+    """
+    x_eval = np.asarray(x_eval, dtype=float)
+    resultado = np.full(x_eval.shape, float(coeficientes[-1]))
+
+    for k in range(len(coeficientes) - 2, -1, -1):
+        resultado *= x_eval - x[k]
+        resultado += coeficientes[k]
+
+    return float(resultado) if resultado.ndim == 0 else resultado
 
 
 def evaluar_spline_lineal(Tabla, x_original, x_eval):
     """
-    Evalúa el spline lineal en un punto dado
+    Evalúa el spline lineal en los puntos dados
 
     Parámetros:
     Tabla: Matriz de coeficientes del spline
-    x_original: Puntos originales usados para crear el spline
-    x_eval: Punto donde evaluar el spline
+    x_original: Puntos originales usados para crear el spline (ordenados)
+    x_eval: Punto o array de puntos donde evaluar el spline
 
     Retorna:
-    Valor del spline en x_eval
+    Valor del spline en x_eval (float si x_eval es escalar)
     """
-    n = len(x_original)
-
-    # Encontrar en qué segmento está x_eval
-    for i in range(n-1):
-        if x_original[i] <= x_eval <= x_original[i+1]:
-            # Evaluar el polinomio lineal del segmento i
-            a, b = Tabla[i]
-            return a * x_eval + b
-
-    # Si está fuera del rango, usar extrapolación
-    if x_eval < x_original[0]:
-        a, b = Tabla[0]
-        return a * x_eval + b
-    else:
-        a, b = Tabla[-1]
-        return a * x_eval + b
+    return _evaluar_por_segmentos(Tabla, x_original, x_eval)
 
 
 def evaluar_spline_cubico(Tabla, x_original, x_eval):
     """
-    Evalúa el spline cúbico en un punto dado
+    Evalúa el spline cúbico en los puntos dados
 
     Parámetros:
     Tabla: Matriz de coeficientes del spline
-    x_original: Puntos originales usados para crear el spline
-    x_eval: Punto donde evaluar el spline
+    x_original: Puntos originales usados para crear el spline (ordenados)
+    x_eval: Punto o array de puntos donde evaluar el spline
 
     Retorna:
-    Valor del spline en x_eval
+    Valor del spline en x_eval (float si x_eval es escalar)
     """
-    n = len(x_original)
+    return _evaluar_por_segmentos(Tabla, x_original, x_eval)
 
-    # Encontrar en qué segmento está x_eval
-    for i in range(n-1):
-        if x_original[i] <= x_eval <= x_original[i+1]:
-            # Evaluar el polinomio cúbico del segmento i
-            a, b, c, d = Tabla[i]
-            return a * x_eval**3 + b * x_eval**2 + c * x_eval + d
 
-    # Si está fuera del rango, usar extrapolación
-    if x_eval < x_original[0]:
-        a, b, c, d = Tabla[0]
-        return a * x_eval**3 + b * x_eval**2 + c * x_eval + d
-    else:
-        a, b, c, d = Tabla[-1]
-        return a * x_eval**3 + b * x_eval**2 + c * x_eval + d
+def _evaluar_por_segmentos(Tabla, x_original, x_eval):
+    """
+    Evalúa un spline dado en la base monomial (mayor potencia primero):
+    ubica el segmento con búsqueda binaria y aplica Horner. Fuera del rango
+    se extrapola con el primer/último segmento.
+    """
+    Tabla = np.asarray(Tabla, dtype=float)
+    x_eval = np.asarray(x_eval, dtype=float)
+
+    indices = np.searchsorted(x_original, x_eval, side='right') - 1
+    coef = Tabla[np.clip(indices, 0, len(Tabla) - 1)]
+
+    resultado = coef[..., 0]
+    for k in range(1, Tabla.shape[1]):
+        resultado = resultado * x_eval + coef[..., k]
+
+    return float(resultado) if resultado.ndim == 0 else resultado
 
 
 def crear_string_polinomio_vandermonde(coeficientes):
@@ -588,13 +854,43 @@ def crear_string_polinomio_standard(coeficientes):
     return resultado
 
 
-def crear_string_newton(coeficientes, x):
+def crear_string_baricentrico(interpolante, max_terminos=8):
+    """
+    Crea representación en string de la forma baricéntrica
+
+    Formato: [Σ w_j y_j/(x - x_j)] / [Σ w_j/(x - x_j)], mostrando a lo sumo
+    max_terminos términos de cada suma
+    """
+    def suma(coeficientes):
+        terminos = []
+        for coef, x_j in zip(coeficientes[:max_terminos], interpolante.nodos[:max_terminos]):
+            if abs(x_j) < 1e-10:
+                terminos.append(f"{coef:.6f}/x")
+            elif x_j > 0:
+                terminos.append(f"{coef:.6f}/(x - {x_j:.3f})")
+            else:
+                terminos.append(f"{coef:.6f}/(x + {abs(x_j):.3f})")
+        if len(coeficientes) > max_terminos:
+            terminos.append(f"... ({len(coeficientes)} términos)")
+        return " + ".join(terminos).replace("+ -", "- ")
+
+    pesos = interpolante.pesos
+    return f"[{suma(pesos * interpolante.valores)}] / [{suma(pesos)}]"
+
+
+def crear_string_newton(coeficientes, x, max_terminos=None):
     """
     Crea representación en string del polinomio de Newton
 
     Formato: a_0 + a_1(x-x_0) + a_2(x-x_0)(x-x_1) + ...
+    Con max_terminos se muestran solo los primeros términos (el string
+    completo crece como O(n^2)).
     """
     n = len(coeficientes)
+    omitidos = 0
+    if max_terminos is not None and n > max_terminos:
+        omitidos = n - max_terminos
+        n = max_terminos
 
     if n == 0:
         return "0"
@@ -619,12 +915,20 @@ def crear_string_newton(coeficientes, x):
         if abs(coeficientes[i]) > 1e-10:
             terminos.append(f"{coeficientes[i]:.6f}{producto}")
 
+    if omitidos:
+        terminos.append(f"... ({omitidos} términos más)")
+
     resultado = " + ".join(terminos)
     resultado = resultado.replace("+ -", "- ")
 
     return resultado
 
 
+def formatear_polinomio_lineal(a, b):
+    """Formatea un polinomio lineal de manera legible"""
+    return f"{a:.6f}x {'+' if b >= 0 else '-'} {abs(b):.6f}"
+
+
 def formatear_polinomio_cubico(a, b, c, d):
     """Formatea un polinomio cúbico de manera legible"""
     terminos = []
@@ -647,11 +951,12 @@ def formatear_polinomio_cubico(a, b, c, d):
     return resultado
 
 
-def validar_puntos(puntos_str):
+def validar_puntos(puntos_str, max_puntos=8):
     """
     Valida y convierte string de puntos a arrays numpy
 
     Formato esperado: "x1,y1;x2,y2;x3,y3;..."
+    max_puntos: Cantidad máxima de puntos aceptados
 
     Retorna: (x, y, error_mensaje)
     """
@@ -682,14 +987,14 @@ def validar_puntos(puntos_str):
         if len(x) < 2:
             return None, None, f"❌ Error: Se necesitan al menos 2 puntos para interpolar.\n💡 Puntos recibidos: {len(x)}"
 
-        if len(x) > 8:
-            return None, None, f"❌ Error: Máximo 8 puntos permitidos.\n💡 Puntos recibidos: {len(x)}"
+        if len(x) > max_puntos:
+            return None, None, f"❌ Error: Máximo {max_puntos} puntos permitidos.\n💡 Puntos recibidos: {len(x)}"
 
         x = np.array(x)
         y = np.array(y)
 
         # Verificar que no haya x repetidos
-        if len(set(x)) != len(x):
+        if len(np.unique(x)) != len(x):
             return None, None, "❌ Error: No puede haber valores de x repetidos.\n💡 Cada punto debe tener un valor x único"
 
         # Verificar que no haya NaN o infinitos
@@ -0,0 +1,479 @@
+"""
+Métodos directos para sistemas de ecuaciones lineales (Capítulo 2)
+Incluye: LU con pivoteo parcial y total, Cholesky (matrices simétricas
+definidas positivas) y LU de banda, con un caché de factorizaciones
+
+Factorizar cuesta O(n^3) (O(n p q) en banda); con la factorización ya hecha,
+cada lado derecho nuevo se resuelve con dos sustituciones en O(n^2). Por eso
+las factorizaciones se guardan en un caché cuya clave es el hash de la matriz.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Métodos disponibles
+METODOS_DIRECTOS = ('lu_parcial', 'lu_total', 'cholesky', 'lu_banda')
+
+# Un pivote con valor absoluto menor que esto (relativo a la matriz) se considera cero
+TOL_PIVOTE = 1e-12
+
+# Hasta este tamaño el resultado incluye las matrices de la factorización
+N_MOSTRAR_FACTORES = 10
+
+
+# ===== SUSTITUCIONES =====
+
+def sustitucion_progresiva(L, b, diagonal_unitaria=False):
+    """
+    Resuelve L y = b con L triangular inferior en O(n^2)
+
+    Parámetros:
+    L: Matriz triangular inferior (se ignora lo que esté sobre la diagonal)
+    b: Lado derecho (vector de n elementos o matriz n x k)
+    diagonal_unitaria: Suponer L[i, i] = 1 (factor L de Doolittle)
+
+    Retorna: numpy array con la solución (misma forma que b)
+    """
+    y = np.array(b, dtype=float)
+    for i in range(len(L)):
+        y[i] -= L[i, :i] @ y[:i]
+        if not diagonal_unitaria:
+            y[i] /= L[i, i]
+    return y
+
+
+def sustitucion_regresiva(U, y):
+    """
+    Resuelve U x = y con U triangular superior en O(n^2)
+
+    Parámetros:
+    U: Matriz triangular superior (se ignora lo que esté bajo la diagonal)
+    y: Lado derecho (vector de n elementos o matriz n x k)
+
+    Retorna: numpy array con la solución (misma forma que y)
+    """
+    x = np.array(y, dtype=float)
+    for i in range(len(U) - 1, -1, -1):
+        x[i] = (x[i] - U[i, i+1:] @ x[i+1:]) / U[i, i]
+    return x
+
+
+# ===== FACTORIZACIONES =====
+
+class FactorizacionLU:
+    """
+    Factorización P A Q = L U (Doolittle: L con diagonal unitaria)
+
+    Con pivoteo parcial Q es la identidad; con pivoteo total se intercambian
+    también columnas, como en gauss_piv_total de los códigos del profesor.
+    L y U se guardan juntas en una sola matriz (L bajo la diagonal, U desde
+    la diagonal hacia arriba).
+
+    Atributos:
+    LU: Matriz con los factores L y U
+    filas: Permutación de filas (P A = A[filas])
+    columnas: Permutación de columnas (A Q = A[:, columnas])
+    """
+
+    def __init__(self, A, pivoteo='parcial'):
+        LU = np.array(A, dtype=float)
+        n = len(LU)
+        filas = np.arange(n)
+        columnas = np.arange(n)
+        tolerancia = TOL_PIVOTE * max(np.abs(LU).max(), 1.0)
+
+        for k in range(n):
+            # Elegir el pivote: máximo de la columna k (parcial) o de la submatriz (total)
+            if pivoteo == 'total':
+                submatriz = np.abs(LU[k:, k:])
+                fila_max, columna_max = divmod(int(np.argmax(submatriz)), n - k)
+                fila_max += k
+                columna_max += k
+            else:
+                fila_max = k + int(np.argmax(np.abs(LU[k:, k])))
+                columna_max = k
+
+            if abs(LU[fila_max, columna_max]) < tolerancia:
+                raise ValueError("La matriz es singular (el sistema no tiene solución única)")
+
+            if fila_max != k:
+                LU[[k, fila_max]] = LU[[fila_max, k]]
+                filas[[k, fila_max]] = filas[[fila_max, k]]
+            if columna_max != k:
+                LU[:, [k, columna_max]] = LU[:, [columna_max, k]]
+                columnas[[k, columna_max]] = columnas[[columna_max, k]]
+
+            # Multiplicadores y actualización de rango 1 de la submatriz restante
+            LU[k+1:, k] /= LU[k, k]
+            LU[k+1:, k+1:] -= np.outer(LU[k+1:, k], LU[k, k+1:])
+
+        self.LU = LU
+        self.filas = filas
+        self.columnas = columnas
+        self.pivoteo = pivoteo
+        self.n = n
+
+    def resolver(self, b):
+        """Resuelve A x = b (b vector o matriz n x k de lados derechos) en O(n^2)"""
+        y = sustitucion_progresiva(self.LU, np.asarray(b, dtype=float)[self.filas], diagonal_unitaria=True)
+        z = sustitucion_regresiva(self.LU, y)
+        x = np.empty_like(z)
+        x[self.columnas] = z
+        return x
+
+    def factores(self):
+        """Retorna dict con L, U y las permutaciones como listas (para mostrar)"""
+        return {
+            "L": (np.tril(self.LU, -1) + np.eye(self.n)).tolist(),
+            "U": np.triu(self.LU).tolist(),
+            "permutacion_filas": (self.filas + 1).tolist(),
+            "permutacion_columnas": (self.columnas + 1).tolist()
+        }
+
+    def nbytes(self):
+        return self.LU.nbytes + self.filas.nbytes + self.columnas.nbytes
+
+
+class FactorizacionCholesky:
+    """
+    Factorización A = L L^T de una matriz simétrica definida positiva
+
+    Cuesta la mitad que LU y no necesita pivoteo. Si la matriz no es
+    simétrica o aparece un pivote no positivo se lanza ValueError.
+    """
+
+    def __init__(self, A):
+        A = np.asarray(A, dtype=float)
+        n = len(A)
+        if not np.allclose(A, A.T, rtol=1e-10, atol=1e-12 * max(np.abs(A).max(), 1.0)):
+            raise ValueError("Cholesky requiere una matriz simétrica")
+
+        L = np.zeros((n, n))
+        for j in range(n):
+            pivote = A[j, j] - L[j, :j] @ L[j, :j]
+            if pivote <= 0:
+                raise ValueError("Cholesky requiere una matriz definida positiva "
+                                 f"(pivote no positivo en la columna {j + 1})")
+            L[j, j] = np.sqrt(pivote)
+            L[j+1:, j] = (A[j+1:, j] - L[j+1:, :j] @ L[j, :j]) / L[j, j]
+
+        self.L = L
+        self.n = n
+
+    def resolver(self, b):
+        """Resuelve A x = b con L y = b y L^T x = y en O(n^2)"""
+        y = sustitucion_progresiva(self.L, b)
+        return sustitucion_regresiva(self.L.T, y)
+
+    def factores(self):
+        return {"L": self.L.tolist(), "LT": self.L.T.tolist()}
+
+    def nbytes(self):
+        return self.L.nbytes
+
+
+def anchos_de_banda(A):
+    """
+    Retorna (p, q): número de subdiagonales y superdiagonales con elementos no nulos
+    """
+    filas, columnas = np.nonzero(A)
+    if filas.size == 0:
+        return 0, 0
+    return int(max(0, (filas - columnas).max())), int(max(0, (columnas - filas).max()))
+
+
+class FactorizacionBanda:
+    """
+    LU sin pivoteo de una matriz de banda con p subdiagonales y q superdiagonales
+
+    Solo se guarda la banda: la fila i ocupa banda[i, j - i + p] para las
+    columnas j entre i - p e i + q. Factorizar cuesta O(n p q) y resolver
+    O(n (p + q)), contra O(n^3) y O(n^2) de la LU densa. Sin pivoteo la
+    factorización existe, por ejemplo, si la matriz es diagonalmente
+    dominante o simétrica definida positiva; si aparece un pivote nulo se
+    lanza ValueError (usar entonces LU con pivoteo).
+    """
+
+    def __init__(self, A, p=None, q=None):
+        A = np.asarray(A, dtype=float)
+        n = len(A)
+        if p is None or q is None:
+            p, q = anchos_de_banda(A)
+
+        banda = np.zeros((n, p + q + 1))
+        for d in range(-p, q + 1):
+            diagonal = np.diagonal(A, d)
+            if d >= 0:
+                banda[:n - d, p + d] = diagonal
+            else:
+                banda[-d:, p + d] = diagonal
+
+        tolerancia = TOL_PIVOTE * max(np.abs(banda).max(), 1.0)
+        for k in range(n - 1):
+            pivote = banda[k, p]
+            if abs(pivote) < tolerancia:
+                raise ValueError(f"Pivote nulo en la fila {k + 1}: la LU de banda no usa pivoteo, use 'lu_parcial'")
+            ancho = min(q, n - 1 - k)  # Columnas a la derecha del pivote dentro de la banda
+            fila_pivote = banda[k, p + 1:p + 1 + ancho]
+            for i in range(k + 1, min(k + p, n - 1) + 1):
+                desplazamiento = k - i + p
+                banda[i, desplazamiento] /= pivote
+                banda[i, desplazamiento + 1:desplazamiento + 1 + ancho] -= banda[i, desplazamiento] * fila_pivote
+
+        if abs(banda[n - 1, p]) < tolerancia:
+            raise ValueError(f"Pivote nulo en la fila {n}: la LU de banda no usa pivoteo, use 'lu_parcial'")
+
+        self.banda = banda
+        self.p = p
+        self.q = q
+        self.n = n
+
+    def resolver(self, b):
+        """Resuelve A x = b en O(n (p + q)) por lado derecho"""
+        banda, p, q, n = self.banda, self.p, self.q, self.n
+        x = np.array(b, dtype=float)
+
+        # L y = b (L con diagonal unitaria y p subdiagonales)
+        for i in range(1, n):
+            inicio = max(0, i - p)
+            x[i] -= banda[i, inicio - i + p:p] @ x[inicio:i]
+
+        # U x = y (U con q superdiagonales)
+        for i in range(n - 1, -1, -1):
+            fin = min(n, i + q + 1)
+            x[i] = (x[i] - banda[i, p + 1:p + fin - i] @ x[i + 1:fin]) / banda[i, p]
+        return x
+
+    def factores(self):
+        L = np.eye(self.n)
+        U = np.zeros((self.n, self.n))
+        for d in range(-self.p, self.q + 1):
+            valores = self.banda[max(0, -d):self.n - max(0, d), self.p + d]
+            if d < 0:
+                L += np.diag(valores, d)
+            else:
+                U += np.diag(valores, d)
+        return {"L": L.tolist(), "U": U.tolist(), "ancho_inferior": self.p, "ancho_superior": self.q}
+
+    def nbytes(self):
+        return self.banda.nbytes
+
+
+def factorizar(A, metodo='lu_parcial'):
+    """
+    Factoriza A con el método indicado (sin usar el caché)
+
+    Retorna: FactorizacionLU, FactorizacionCholesky o FactorizacionBanda
+    """
+    if metodo == 'lu_parcial':
+        return FactorizacionLU(A, 'parcial')
+    if metodo == 'lu_total':
+        return FactorizacionLU(A, 'total')
+    if metodo == 'cholesky':
+        return FactorizacionCholesky(A)
+    if metodo == 'lu_banda':
+        return FactorizacionBanda(A)
+    raise ValueError(f"Método '{metodo}' no reconocido. Opciones: {', '.join(METODOS_DIRECTOS)}")
+
+
+# ===== CACHÉ DE FACTORIZACIONES =====
+
+def clave_matriz(A, metodo):
+    """Hash SHA-256 del método, la forma y los valores (float64) de la matriz"""
+    A = np.ascontiguousarray(A, dtype=float)
+    encabezado = f"{metodo}:{A.shape[0]}x{A.shape[1]}:".encode('utf-8')
+    return hashlib.sha256(encabezado + A.tobytes()).hexdigest()
+
+
+class CacheFactorizaciones:
+    """
+    Caché LRU de factorizaciones, acotado por número de entradas y por memoria
+
+    Parámetros:
+    max_entradas: Número máximo de factorizaciones guardadas
+    max_bytes: Memoria máxima aproximada (en bytes) de las factorizaciones
+
+    Es seguro usarlo desde varios hilos (el servidor Flask atiende en paralelo).
+    """
+
+    def __init__(self, max_entradas=64, max_bytes=256 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, A, metodo='lu_parcial'):
+        """
+        Retorna (factorización, desde_cache) de A, factorizando solo si no está en caché
+
+        Lanza ValueError si la matriz no admite la factorización pedida.
+        """
+        clave = clave_matriz(A, metodo)
+
+        with self._lock:
+            factorizacion = self._entradas.get(clave)
+            if factorizacion is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return factorizacion, True
+            self.fallos += 1
+
+        # La factorización se hace fuera del lock para no bloquear otros hilos
+        factorizacion = factorizar(A, metodo)
+
+        with self._lock:
+            if clave not in self._entradas:
+                self._entradas[clave] = factorizacion
+                self._total_bytes += factorizacion.nbytes()
+                while self._entradas and (len(self._entradas) > self.max_entradas
+                                          or self._total_bytes > self.max_bytes):
+                    _, vieja = self._entradas.popitem(last=False)
+                    self._total_bytes -= vieja.nbytes()
+                    self.desalojos += 1
+
+        return factorizacion, False
+
+    def limpiar(self):
+        """Vacía el caché y reinicia los contadores"""
+        with self._lock:
+            self._entradas.clear()
+            self._total_bytes = 0
+            self.aciertos = 0
+            self.fallos = 0
+            self.desalojos = 0
+
+    def estadisticas(self):
+        """Retorna dict con aciertos, fallos, desalojos, entradas y memoria usada"""
+        with self._lock:
+            total = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+                "desalojos": self.desalojos,
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes
+            }
+
+
+# Caché compartido por todas las solicitudes
+cache_factorizaciones = CacheFactorizaciones()
+
+
+def estadisticas_cache():
+    """Atajo para consultar las estadísticas del caché compartido"""
+    return cache_factorizaciones.estadisticas()
+
+
+# ===== RESOLUCIÓN =====
+
+def resolver_directo(A, b, metodo='lu_parcial', usar_cache=True):
+    """
+    Resuelve A x = b con un método directo
+
+    Parámetros:
+    A: Matriz de coeficientes (numpy array n x n)
+    b: Lado derecho (vector de n elementos o matriz n x k con un lado derecho por columna)
+    metodo: 'lu_parcial', 'lu_total', 'cholesky' o 'lu_banda'
+    usar_cache: Reutilizar la factorización de una matriz ya vista
+
+    Retorna: dict con 'exito', 'solucion', 'residuo', 'desde_cache', 'mensaje'
+    (y 'factores' si n <= N_MOSTRAR_FACTORES)
+    """
+    if metodo not in METODOS_DIRECTOS:
+        return {"exito": False, "mensaje": f"[ERROR] Método '{metodo}' no reconocido. Opciones: {', '.join(METODOS_DIRECTOS)}"}
+
+    try:
+        if usar_cache:
+            factorizacion, desde_cache = cache_factorizaciones.obtener(A, metodo)
+        else:
+            factorizacion, desde_cache = factorizar(A, metodo), False
+
+        x = factorizacion.resolver(b)
+    except ValueError as ve:
+        return {"exito": False, "mensaje": f"[ERROR] {str(ve)}"}
+    except Exception as e:
+        return {"exito": False, "mensaje": f"[ERROR] Error al resolver el sistema: {str(e)}"}
+
+    if not np.all(np.isfinite(x)):
+        return {"exito": False, "mensaje": "[ERROR] La solución tiene valores infinitos o NaN (matriz mal condicionada)"}
+    residuo = float(np.abs(A @ x - b).max())
+
+    resultado = {
+        "exito": True,
+        "metodo": metodo,
+        "solucion": x.tolist(),
+        "residuo": residuo,
+        "desde_cache": desde_cache,
+        "n": len(A),
+        "mensaje": ("Solución obtenida con la factorización guardada en caché" if desde_cache
+                    else "Solución obtenida factorizando la matriz")
+    }
+    if metodo == 'lu_banda':
+        resultado["ancho_inferior"] = factorizacion.p
+        resultado["ancho_superior"] = factorizacion.q
+    if len(A) <= N_MOSTRAR_FACTORES:
+        resultado["factores"] = factorizacion.factores()
+    return resultado
+
+
+def validar_sistema(matriz, b, max_n=None):
+    """
+    Valida y convierte la matriz y el lado derecho de un sistema para los métodos directos
+
+    Formatos aceptados:
+    matriz: "1,2,3;4,5,6;7,8,9" (filas separadas por ;) o lista de filas
+    b: "1,2,3", lista de n números, o lista de n filas con k lados derechos
+       ("1,2;3,4;5,6" en texto)
+
+    A diferencia de validar_matriz de capitulo2, se aceptan ceros en la
+    diagonal (el pivoteo los resuelve) y matrices de más de 7x7.
+
+    Retorna: (A, b, error) - error es None si los datos son válidos
+    """
+    try:
+        if isinstance(matriz, str):
+            if not matriz.strip():
+                return None, None, "[ERROR] La matriz A no puede estar vacia. Formato: 10,1,1;2,10,1;2,2,10"
+            matriz = [fila.split(',') for fila in matriz.strip().split(';')]
+        A = np.array(matriz, dtype=float)
+    except (ValueError, TypeError):
+        return None, None, "[ERROR] La matriz debe tener solo numeros y filas del mismo tamaño. Formato: 10,1,1;2,10,1;2,2,10"
+
+    try:
+        if isinstance(b, str):
+            if not b.strip():
+                return None, None, "[ERROR] El vector b no puede estar vacio. Formato: 12,13,14"
+            b = [fila.split(',') for fila in b.strip().split(';')] if ';' in b else b.split(',')
+        b = np.array(b, dtype=float)
+    except (ValueError, TypeError):
+        return None, None, "[ERROR] Error en vector b: Todos los elementos deben ser numeros. Formato: 12,13,14"
+
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        return None, None, f"[ERROR] La matriz debe ser cuadrada. Dimension actual: {'x'.join(map(str, A.shape))}"
+
+    n = A.shape[0]
+    if n < 2:
+        return None, None, "[ERROR] La matriz debe tener al menos 2x2 elementos"
+    if max_n is not None and n > max_n:
+        return None, None, f"[ERROR] La matriz no puede tener mas de {max_n}x{max_n} elementos. Tamano actual: {n}x{n}"
+
+    if b.ndim not in (1, 2) or b.shape[0] != n:
+        return None, None, f"[ERROR] El vector b debe tener {n} elementos (igual a las filas de A). Elementos actuales en b: {b.shape[0] if b.ndim else 1}"
+
+    if not np.all(np.isfinite(A)):
+        return None, None, "[ERROR] La matriz contiene valores infinitos o NaN"
+    if not np.all(np.isfinite(b)):
+        return None, None, "[ERROR] El vector b contiene valores infinitos o NaN"
+
+    return A, b, None
@@ -0,0 +1,168 @@
+"""
+Reducción de puntos de las gráficas
+
+Las series que se envían al navegador (puntos_grafica del capítulo 3, f(x)
+del capítulo 1, convergencia del capítulo 2) pueden tener decenas de miles
+de puntos, más de los que caben en el ancho de la gráfica. Aquí se reducen a
+un número acotado por el ancho objetivo (en píxeles) que pide el cliente:
+
+- 'lttb' (Largest-Triangle-Three-Buckets): divide la serie en tantos grupos
+  como puntos se quieren y de cada grupo toma el punto que forma el triángulo
+  de mayor área con el punto elegido antes y el promedio del grupo siguiente.
+  Conserva la forma visual con ancho_objetivo puntos.
+- 'minmax': divide el eje x en ancho_objetivo columnas y de cada una conserva
+  el mínimo y el máximo (hasta 2 x ancho_objetivo puntos). No pierde picos
+  ni oscilaciones rápidas.
+
+Los valores no definidos (None/NaN) parten la serie en tramos: cada tramo se
+reduce por separado y entre tramos se conserva un None para que la gráfica
+siga mostrando el hueco.
+"""
+
+import numpy as np
+
+
+# Métodos de reducción disponibles
+METODOS_REDUCCION = ('lttb', 'minmax')
+
+# Ancho objetivo si el cliente no indica otro, y máximo aceptado
+ANCHO_OBJETIVO_POR_DEFECTO = 2000
+ANCHO_OBJETIVO_MAXIMO = 100000
+
+
+def indices_lttb(x, y, umbral):
+    """
+    Índices de los puntos que conserva LTTB (x, y numpy arrays finitos)
+
+    Retorna: numpy array de índices ordenados (el primero y el último siempre están)
+    """
+    n = len(x)
+    if umbral >= n or umbral < 3:
+        return np.arange(n) if umbral >= n else np.array([0, n - 1][:max(umbral, 1)])
+
+    # Grupos interiores (el primer y el último punto son grupos de un solo punto)
+    limites = np.linspace(1, n - 1, umbral - 1).astype(int)
+    seleccion = np.empty(umbral, dtype=np.int64)
+    seleccion[0] = 0
+    seleccion[-1] = n - 1
+    a = 0
+
+    for i in range(umbral - 2):
+        inicio, fin = limites[i], limites[i + 1]
+
+        # Promedio del grupo siguiente (el último punto si es el grupo final)
+        if i + 2 < len(limites):
+            siguiente = slice(limites[i + 1], limites[i + 2])
+            x_prom, y_prom = x[siguiente].mean(), y[siguiente].mean()
+        else:
+            x_prom, y_prom = x[n - 1], y[n - 1]
+
+        # Área (doble) del triángulo entre el punto elegido, cada candidato y el promedio
+        areas = np.abs((x[a] - x_prom) * (y[inicio:fin] - y[a])
+                       - (x[a] - x[inicio:fin]) * (y_prom - y[a]))
+        a = inicio + int(np.argmax(areas))
+        seleccion[i + 1] = a
+
+    return seleccion
+
+
+def indices_minmax(x, y, ancho):
+    """
+    Índices del mínimo y el máximo de y en cada una de 'ancho' columnas de x
+    (x ordenado, valores finitos), más el primer y el último punto
+
+    Retorna: numpy array de índices ordenados
+    """
+    n = len(x)
+    if n <= 2 * ancho + 2:
+        return np.arange(n)
+
+    ancho_x = x[-1] - x[0]
+    if ancho_x > 0:
+        columnas = np.minimum(((x - x[0]) / ancho_x * ancho).astype(np.int64), ancho - 1)
+    else:
+        columnas = np.arange(n) * ancho // n
+
+    # Ordenar por (columna, y): el primero de cada columna es el mínimo y el último el máximo
+    orden = np.lexsort((y, columnas))
+    columnas_ordenadas = columnas[orden]
+    inicios = np.flatnonzero(np.r_[True, columnas_ordenadas[1:] != columnas_ordenadas[:-1]])
+    finales = np.r_[inicios[1:], n] - 1
+
+    return np.unique(np.concatenate(([0, n - 1], orden[inicios], orden[finales])))
+
+
+def _reducir_tramo(x, y, ancho_objetivo, metodo):
+    if metodo == 'minmax':
+        return indices_minmax(x, y, ancho_objetivo)
+    return indices_lttb(x, y, ancho_objetivo)
+
+
+def reducir_serie(x, y, ancho_objetivo=ANCHO_OBJETIVO_POR_DEFECTO, metodo='lttb', escala_log=False):
+    """
+    Reduce una serie (x, y) para graficarla en ancho_objetivo píxeles
+
+    Parámetros:
+    x, y: Listas o arrays de igual longitud (y puede tener None/NaN)
+    ancho_objetivo: Ancho de la gráfica en píxeles
+    metodo: 'lttb' o 'minmax'
+    escala_log: Elegir los puntos según log10(y) (gráficas de error en escala logarítmica)
+
+    Retorna: (x, y) como listas (None donde y no está definida)
+    """
+    if metodo not in METODOS_REDUCCION:
+        raise ValueError(f"Método de reducción '{metodo}' no reconocido. Opciones: {', '.join(METODOS_REDUCCION)}")
+
+    n = len(x)
+    limite = ancho_objetivo if metodo == 'lttb' else 2 * ancho_objetivo + 2
+    if n <= limite:
+        # Ya cabe: se envía tal cual
+        return (x.tolist() if isinstance(x, np.ndarray) else list(x),
+                y.tolist() if isinstance(y, np.ndarray) else list(y))
+
+    x = np.asarray(x)  # Se conserva el tipo (p. ej. números de iteración enteros)
+    y = np.array([np.nan if v is None else v for v in y], dtype=float)
+
+    x_float = x.astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_criterio = np.log10(np.abs(y)) if escala_log else y
+    finitos = np.isfinite(y_criterio)
+
+    # Tramos de puntos definidos: [inicio, fin)
+    bordes = np.diff(np.r_[0, finitos.astype(np.int8), 0])
+    inicios = np.flatnonzero(bordes == 1)
+    finales = np.flatnonzero(bordes == -1)
+    total_finitos = max(int(finitos.sum()), 1)
+
+    indices = []
+    for inicio, fin in zip(inicios, finales):
+        # Cada tramo recibe una parte del ancho proporcional a su cantidad de puntos
+        cupo = max(2, int(round(ancho_objetivo * (fin - inicio) / total_finitos)))
+        indices.append(inicio + _reducir_tramo(x_float[inicio:fin], y_criterio[inicio:fin], cupo, metodo))
+        if fin < n:
+            indices.append(np.array([fin]))  # Hueco entre tramos
+    if len(inicios) == 0 or inicios[0] > 0:
+        indices.insert(0, np.array([0]))
+
+    seleccion = np.unique(np.concatenate(indices))
+    y_reducida = y[seleccion]
+    return x[seleccion].tolist(), [None if not np.isfinite(v) else v for v in y_reducida.tolist()]
+
+
+def reducir_puntos_grafica(resultado, ancho_objetivo=ANCHO_OBJETIVO_POR_DEFECTO, metodo='lttb'):
+    """
+    Reduce (en el mismo dict) todos los 'puntos_grafica' {"x": [...], "y": [...]}
+    de un resultado, incluidos los anidados (p. ej. en las comparaciones)
+
+    Retorna: el mismo resultado
+    """
+    if isinstance(resultado, dict):
+        for clave, valor in resultado.items():
+            if clave == 'puntos_grafica' and isinstance(valor, dict) and 'x' in valor and 'y' in valor:
+                valor['x'], valor['y'] = reducir_serie(valor['x'], valor['y'], ancho_objetivo, metodo)
+            else:
+                reducir_puntos_grafica(valor, ancho_objetivo, metodo)
+    elif isinstance(resultado, list) and resultado and isinstance(resultado[0], (dict, list)):
+        for valor in resultado:
+            reducir_puntos_grafica(valor, ancho_objetivo, metodo)
+    return resultado
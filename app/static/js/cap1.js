@@ -298,7 +298,9 @@ async function graficarConPlotly(funcion, resultado, metodo) {
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify({
                 funcion: funcion,
-                raiz: resultado.raiz || null
+                raiz: resultado.raiz || null,
+                adaptativo: true,
+                ancho_objetivo: Math.max(document.getElementById(`grafica-${metodo}`)?.clientWidth || 0, 800)
             })
         });
 
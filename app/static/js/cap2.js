@@ -127,15 +127,22 @@ function validarDatosCapitulo2(data, metodo) {
             return { valido: false, mensaje: '[ERROR] Error: El factor de relajación w es obligatorio para SOR. Valor recomendado: 1.5' };
         }
 
-        const w = parseFloat(data.w);
-        if (isNaN(w) || w <= 0 || w >= 2) {
-            return { valido: false, mensaje: `[ERROR] Error: El factor w debe estar entre 0 y 2. Valor ingresado: "${data.w}"` };
+        if (!esWAutomatico(data.w)) {
+            const w = parseFloat(data.w);
+            if (isNaN(w) || w <= 0 || w >= 2) {
+                return { valido: false, mensaje: `[ERROR] Error: El factor w debe estar entre 0 y 2 (o "auto"). Valor ingresado: "${data.w}"` };
+            }
         }
     }
 
     return { valido: true };
 }
 
+// w elegido por el servidor ('auto' = fórmula de Young, 'adaptativo' = ajuste durante las iteraciones)
+function esWAutomatico(w) {
+    return ['auto', 'adaptativo'].includes(String(w).trim().toLowerCase());
+}
+
 // Guardar resultados globalmente para poder actualizar precisión
 if (!window.lastResults) {
     window.lastResults = {};
@@ -161,6 +168,7 @@ function mostrarResultados(metodo, resultado) {
                 <p><strong>Radio Espectral:</strong> ${resultado.radio_espectral?.toFixed(6) || 'N/A'}</p>
                 <p><strong>¿Converge?:</strong> ${resultado.converge ? '✓ Sí (ρ < 1)' : '✗ No (ρ ≥ 1)'}</p>
                 <p><strong>Iteraciones:</strong> ${resultado.iteraciones}</p>
+                ${resultado.w_automatico ? `<p><strong>w elegido (${resultado.w_automatico}):</strong> ${resultado.w} (con w=1: ${resultado.iteraciones_w1} iteraciones)</p>` : ''}
                 <p><strong>Error final:</strong> ${resultado.error_final?.toExponential(4) || 'N/A'}</p>
                 <p><strong>Solución:</strong> [${resultado.solucion?.map(v => v.toFixed(decimalesSolucion)).join(', ') || 'N/A'}]</p>
             </div>
@@ -290,8 +298,8 @@ async function generarInformeCap2() {
     }
 
     const w = parseFloat(data.w);
-    if (isNaN(w) || w <= 0 || w >= 2) {
-        mostrarErrorInforme('informe-cap2', `[ERROR] Error: El factor w debe estar entre 0 y 2. Valor ingresado: "${data.w}"`);
+    if (!esWAutomatico(data.w) && (isNaN(w) || w <= 0 || w >= 2)) {
+        mostrarErrorInforme('informe-cap2', `[ERROR] Error: El factor w debe estar entre 0 y 2 (o "auto"). Valor ingresado: "${data.w}"`);
         return;
     }
 
@@ -345,8 +353,13 @@ function mostrarInformeCap2(resultado) {
             html += `<td><span style="color: #27ae60;">✓ Exitoso</span></td>`;
             html += `<td>${r.iteraciones}</td>`;
             html += `<td>${r.error_final.toExponential(4)}</td>`;
-            html += `<td>${r.radio_espectral.toFixed(6)}</td>`;
-            html += `<td>${r.converge ? '✓ Sí (ρ<1)' : '✗ No (ρ≥1)'}</td>`;
+            // Los métodos de Krylov no tienen matriz de iteración (sin radio espectral)
+            if (r.radio_espectral === null || r.radio_espectral === undefined) {
+                html += '<td>—</td><td>—</td>';
+            } else {
+                html += `<td>${r.radio_espectral.toFixed(6)}</td>`;
+                html += `<td>${r.converge ? '✓ Sí (ρ<1)' : '✗ No (ρ≥1)'}</td>`;
+            }
             html += `<td>${(r.tiempo * 1000).toFixed(2)} ms</td>`;
             html += '</tr>';
         } else {
@@ -18,6 +18,8 @@ async function ejecutarMetodo(metodo) {
     const form = document.getElementById(`form-${metodo}`);
     const formData = new FormData(form);
     const data = Object.fromEntries(formData);
+    // Puntos de la gráfica: no más de los que caben en su ancho (en píxeles)
+    data.ancho_objetivo = Math.max(document.getElementById(metodo).clientWidth || 0, 800);
 
     mostrarLoading(metodo, true);
     ocultarResultados(metodo);
@@ -72,6 +74,9 @@ function mostrarResultados(metodo, resultado) {
                     <code>${seg.polinomio}</code>
                 </div>`;
             });
+            if (resultado.segmentos_truncados) {
+                html += `<p>Mostrando ${resultado.segmentos_mostrados} de ${resultado.num_segmentos} segmentos (error máximo en los nodos: ${resultado.error_maximo.toExponential(3)})</p>`;
+            }
             html += '</div>';
         }
 
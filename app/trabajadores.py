@@ -0,0 +1,289 @@
+"""
+Ejecución de métodos independientes en procesos separados
+
+Los informes corren varios métodos con los mismos datos; cada uno es trabajo
+de CPU (sympy/numpy) que en hilos quedaría serializado por el GIL. Aquí cada
+método corre en su propio proceso, con un tiempo límite propio: si se pasa,
+el proceso se termina (no hay forma segura de cancelar un hilo a medias).
+Los resultados se retornan en el mismo orden de las tareas.
+
+También se usa para aislar cálculos con datos del usuario (funciones f(x)
+arbitrarias): además del tiempo límite, el proceso hijo puede tener un
+límite de memoria (RLIMIT_AS en sistemas POSIX). En modo flujo el hijo
+envía por el pipe lo que va calculando (p. ej. las filas de una tabla de
+iteraciones) y el padre lo entrega mientras el cálculo sigue.
+"""
+
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # Windows: sin límite de memoria
+    resource = None
+
+
+# Tiempo límite por método (segundos) si la tarea no indica otro
+TIMEOUT_POR_DEFECTO = 30.0
+
+# En modo flujo el hijo agrupa lo emitido en lotes de hasta LOTE_FLUJO elementos
+# y no deja un lote incompleto esperando más de ESPERA_FLUJO segundos
+LOTE_FLUJO = 256
+ESPERA_FLUJO = 0.05
+
+# Con 'fork' los hijos heredan módulos ya importados y cachés ya calentados
+# (p. ej. las expresiones compiladas de capitulo1), así que arrancan en milisegundos.
+# Riesgo: el servidor atiende en varios hilos y el hijo solo copia el hilo que hace
+# el fork; un lock que otro hilo tenga tomado en ese instante queda tomado para
+# siempre en el hijo. Los locks que usan los hijos (capitulo1.CacheExpresiones,
+# ModuloPerezoso de app.py) se toman alrededor del fork con os.register_at_fork;
+# cualquier otro lock nuevo que usen los hijos necesita lo mismo
+_METODOS_INICIO = multiprocessing.get_all_start_methods()
+_CONTEXTO = multiprocessing.get_context('fork' if 'fork' in _METODOS_INICIO else None)
+
+
+class Tarea:
+    """
+    Una llamada funcion(*args, **kwargs) a ejecutar en un proceso aparte
+
+    La función y sus argumentos deben poder serializarse con pickle cuando la
+    plataforma no soporta 'fork' (funciones definidas a nivel de módulo).
+    """
+
+    def __init__(self, nombre, funcion, args=(), kwargs=None, timeout=None, memoria_mb=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.memoria_mb = memoria_mb
+
+
+def _memoria_virtual_actual():
+    """Memoria virtual (bytes) del proceso actual según /proc, o None si no está disponible"""
+    try:
+        with open('/proc/self/status') as estado:
+            for linea in estado:
+                if linea.startswith('VmSize:'):
+                    return int(linea.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _limitar_memoria(memoria_mb):
+    """
+    Limita el espacio de direcciones del proceso a lo que ya usa más memoria_mb
+
+    Con 'fork' el hijo hereda la memoria del padre (numpy, sympy, Flask), así
+    que el límite se cuenta por encima de ese punto de partida.
+    """
+    if resource is None or not memoria_mb:
+        return
+    limite = (_memoria_virtual_actual() or 0) + int(memoria_mb * 1024 * 1024)
+    try:
+        _, maximo = resource.getrlimit(resource.RLIMIT_AS)
+        if maximo != resource.RLIM_INFINITY:
+            limite = min(limite, maximo)
+        resource.setrlimit(resource.RLIMIT_AS, (limite, maximo))
+    except (ValueError, OSError):
+        pass
+
+
+class _Emisor:
+    """Función 'emitir' del proceso hijo en modo flujo: envía lo emitido al padre por lotes"""
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.lote = []
+        self.ultimo_envio = time.monotonic()
+
+    def __call__(self, elemento):
+        self.lote.append(elemento)
+        if len(self.lote) >= LOTE_FLUJO or time.monotonic() - self.ultimo_envio >= ESPERA_FLUJO:
+            self.vaciar()
+
+    def vaciar(self):
+        if self.lote:
+            # Si el padre no alcanza a leer, send se bloquea: el hijo no acumula filas
+            self.conexion.send(("parcial", self.lote, None))
+            self.lote = []
+        self.ultimo_envio = time.monotonic()
+
+
+def _ejecutar_hijo(conexion, funcion, args, kwargs, memoria_mb=None, flujo=False):
+    """Punto de entrada del proceso hijo: ejecuta la tarea y envía (estado, valor, tiempo)"""
+    _limitar_memoria(memoria_mb)
+    emisor = None
+    if flujo:
+        emisor = _Emisor(conexion)
+        kwargs = dict(kwargs, emitir=emisor)
+    inicio = time.time()
+    try:
+        resultado = funcion(*args, **kwargs)
+        if emisor is not None:
+            emisor.vaciar()
+        conexion.send(("ok", resultado, time.time() - inicio))
+    except MemoryError:
+        conexion.send(("memoria", f"Memoria insuficiente (límite de {memoria_mb:g} MB)", time.time() - inicio))
+    except Exception as e:
+        conexion.send(("error", str(e), time.time() - inicio))
+    finally:
+        conexion.close()
+
+
+def _resultado(tarea, exito, valor=None, error=None, tiempo=0.0, timeout=False, memoria=False):
+    return {
+        "nombre": tarea.nombre,
+        "exito": exito,
+        "resultado": valor,
+        "error": error,
+        "tiempo": tiempo,
+        "timeout": timeout,
+        "memoria": memoria
+    }
+
+
+def _resultado_recibido(tarea, estado, valor, tiempo):
+    """Convierte el mensaje final (estado, valor, tiempo) de un hijo en el dict de resultado"""
+    if estado == "ok":
+        return _resultado(tarea, True, valor=valor, tiempo=tiempo)
+    return _resultado(tarea, False, error=valor, tiempo=tiempo, memoria=estado == "memoria")
+
+
+def _resultado_sin_respuesta(tarea):
+    """Resultado de un hijo que murió sin responder (p. ej. por falta de memoria al serializar)"""
+    return _resultado(tarea, False, error="El proceso terminó inesperadamente", memoria=bool(tarea.memoria_mb))
+
+
+def _resultado_timeout(tarea, segundos):
+    return _resultado(tarea, False, error=f"Tiempo límite excedido ({segundos:g} s)", tiempo=segundos, timeout=True)
+
+
+def _detener(proceso):
+    """Termina un proceso hijo (SIGTERM y, si no responde, SIGKILL)"""
+    proceso.terminate()
+    proceso.join(0.5)
+    if proceso.is_alive():
+        proceso.kill()
+        proceso.join()
+
+
+def ejecutar_en_paralelo(tareas, timeout=TIMEOUT_POR_DEFECTO, max_procesos=None):
+    """
+    Ejecuta las tareas en procesos separados y espera sus resultados
+
+    Parámetros:
+    tareas: Lista de Tarea
+    timeout: Tiempo límite (segundos) de cada tarea que no tenga uno propio
+    max_procesos: Máximo de procesos simultáneos (por defecto, núcleos disponibles)
+
+    Retorna: lista (en el orden de 'tareas') de dicts con 'nombre', 'exito',
+    'resultado', 'error', 'tiempo', 'timeout' y 'memoria'. 'exito' indica que
+    la función terminó sin excepción; 'tiempo' lo mide el propio proceso hijo;
+    'timeout'/'memoria' indican que se superó el límite de tiempo/memoria.
+    """
+    if max_procesos is None:
+        max_procesos = os.cpu_count() or 1
+
+    resultados = [None] * len(tareas)
+    pendientes = deque(enumerate(tareas))
+    activos = {}  # conexión -> (índice, proceso, instante límite)
+
+    while pendientes or activos:
+        # Lanzar procesos hasta llenar los cupos
+        while pendientes and len(activos) < max_procesos:
+            indice, tarea = pendientes.popleft()
+            receptor, emisor = _CONTEXTO.Pipe(duplex=False)
+            proceso = _CONTEXTO.Process(target=_ejecutar_hijo,
+                                        args=(emisor, tarea.funcion, tarea.args, tarea.kwargs, tarea.memoria_mb),
+                                        daemon=True)
+            proceso.start()
+            emisor.close()
+            limite = time.monotonic() + (tarea.timeout if tarea.timeout is not None else timeout)
+            activos[receptor] = (indice, proceso, limite)
+
+        espera = max(0.0, min(limite for _, _, limite in activos.values()) - time.monotonic())
+        for receptor in wait(list(activos), timeout=espera):
+            indice, proceso, _ = activos.pop(receptor)
+            tarea = tareas[indice]
+            try:
+                resultados[indice] = _resultado_recibido(tarea, *receptor.recv())
+            except EOFError:
+                resultados[indice] = _resultado_sin_respuesta(tarea)
+            receptor.close()
+            proceso.join()
+
+        # Cancelar las tareas que superaron su tiempo límite
+        ahora = time.monotonic()
+        for receptor, (indice, proceso, limite) in list(activos.items()):
+            if limite <= ahora:
+                del activos[receptor]
+                _detener(proceso)
+                receptor.close()
+                tarea = tareas[indice]
+                segundos = tarea.timeout if tarea.timeout is not None else timeout
+                resultados[indice] = _resultado_timeout(tarea, segundos)
+
+    return resultados
+
+
+def ejecutar_supervisado(funcion, args=(), kwargs=None, timeout=TIMEOUT_POR_DEFECTO, memoria_mb=None):
+    """
+    Ejecuta una sola llamada en un proceso aislado con límites de tiempo y memoria
+
+    Retorna: dict como los de ejecutar_en_paralelo
+    """
+    tarea = Tarea(getattr(funcion, '__name__', 'tarea'), funcion, args, kwargs, timeout, memoria_mb)
+    return ejecutar_en_paralelo([tarea], max_procesos=1)[0]
+
+
+def ejecutar_en_flujo(funcion, args=(), kwargs=None, timeout=TIMEOUT_POR_DEFECTO, memoria_mb=None):
+    """
+    Ejecuta funcion(*args, emitir=..., **kwargs) en un proceso aislado y entrega
+    lo que la función emite mientras corre
+
+    Es un generador: produce ('parcial', elemento) por cada elemento emitido y
+    termina con ('fin', dict) en el formato de ejecutar_en_paralelo. El tiempo
+    límite cuenta desde el inicio e incluye la espera del consumidor; si el
+    consumidor abandona el generador, el proceso hijo se termina.
+    """
+    tarea = Tarea(getattr(funcion, '__name__', 'tarea'), funcion, args, kwargs, timeout, memoria_mb)
+    receptor, emisor = _CONTEXTO.Pipe(duplex=False)
+    proceso = _CONTEXTO.Process(target=_ejecutar_hijo,
+                                args=(emisor, funcion, args, tarea.kwargs, memoria_mb, True),
+                                daemon=True)
+    proceso.start()
+    emisor.close()
+    limite = time.monotonic() + timeout
+    terminado = False
+
+    try:
+        while True:
+            # El límite se revisa en cada mensaje: un hijo que emite sin parar también se detiene
+            restante = limite - time.monotonic()
+            if restante <= 0 or not receptor.poll(restante):
+                yield "fin", _resultado_timeout(tarea, timeout)
+                return
+            try:
+                estado, valor, tiempo = receptor.recv()
+            except EOFError:
+                yield "fin", _resultado_sin_respuesta(tarea)
+                return
+
+            if estado != "parcial":
+                terminado = True
+                yield "fin", _resultado_recibido(tarea, estado, valor, tiempo)
+                return
+
+            for elemento in valor:
+                yield "parcial", elemento
+    finally:
+        receptor.close()
+        if terminado:
+            proceso.join()
+        else:
+            _detener(proceso)
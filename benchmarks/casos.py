@@ -0,0 +1,404 @@
+"""
+Catálogo de casos de benchmark de los tres capítulos
+
+Cada caso es una llamada a un método de app/metodos con datos fijos (sin
+aleatoriedad), así que dos ejecuciones del mismo perfil son comparables.
+Los tamaños dependen del perfil:
+
+- 'rapido': tamaños pequeños y medianos, termina en menos de un minuto
+- 'completo': llega a n = 10^5 en el Capítulo 2 (matriz dispersa) y a
+  10^6 puntos en los splines del Capítulo 3
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Los métodos se importan igual que en la aplicación (app/ en el path)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+from metodos import capitulo1, capitulo2, capitulo3, directos
+
+
+PERFILES = ('rapido', 'completo')
+
+# Funciones del Capítulo 1: (nombre, f(x), intervalo [xi, xs], x0, x1, g(x) para punto fijo,
+# raíz exacta en el intervalo para verificar los resultados)
+FUNCIONES_CAP1 = [
+    ('cubica', 'x**3 - 2*x - 5', (2.0, 3.0), 2.0, 3.0, '(2*x + 5)**(1/3)', 2.0945514815423265),
+    ('cubica_2', 'x**3 - x - 2', (1.0, 2.0), 1.5, 2.0, '(x + 2)**(1/3)', 1.5213797068045676),
+    ('exponencial', 'exp(x) - 3*x', (0.0, 1.0), 0.5, 1.0, 'exp(x)/3', 0.6190612867359451),
+    ('trigonometrica', 'cos(x) - x', (0.0, 1.0), 0.5, 1.0, 'cos(x)', 0.7390851332151607),
+    ('raiz_multiple', '(x - 1)**3*(x + 2)', (0.0, 1.7), 1.5, 1.7, None, 1.0),
+]
+
+TOL_CAP1 = 1e-7
+NITER_CAP1 = 500
+
+# Carriles de resolver_lote por perfil
+CARRILES_LOTE = {'rapido': [10, 1000, 10000], 'completo': [10, 1000, 10000, 100000]}
+
+# Capítulo 2: dimensión de los sistemas densos y dispersos por perfil
+N_DENSO = {'rapido': [3, 10, 100, 500], 'completo': [3, 10, 100, 500, 2000]}
+N_DISPERSO = {'rapido': [1000, 10000], 'completo': [1000, 10000, 100000]}
+TOL_CAP2 = 1e-8
+NITER_CAP2 = 1000
+W_SOR = 1.2
+
+# Lados derechos del caso en bloque (una columna de B por sistema)
+LADOS_DERECHOS = 100
+
+# Capítulo 3: puntos de los métodos polinomiales (O(n^2) o más) y de los splines
+PUNTOS_POLINOMIALES = {'rapido': [8, 50, 200], 'completo': [8, 50, 200, 1000]}
+PUNTOS_SPLINES = {'rapido': [8, 1000, 100000], 'completo': [8, 1000, 100000, 1000000]}
+
+# Tolerancias de las verificaciones de correctitud: un cambio que haga un método más
+# rápido pero con resultados incorrectos debe fallar (ver 'verificar' en Caso)
+TOL_VERIFICACION_RAIZ = 1e-6
+TOL_VERIFICACION_SISTEMA = 1e-6
+TOL_VERIFICACION_INTERPOLACION = 1e-8
+
+# Puntos hasta los que se verifican los métodos polinomiales que pasan por la base
+# monomial: con más puntos el mal condicionamiento les quita toda la precisión
+MAX_PUNTOS_VERIFICADOS = {'vandermonde': 8, 'lagrange': 8, 'newton_interpolante': 50}
+
+
+class Caso:
+    """
+    Un benchmark: 'preparar' arma los argumentos (fuera de la medición) y
+    'ejecutar' es la llamada que se mide
+
+    Atributos:
+    id: Identificador único 'capituloN/metodo/problema[/n=...]'
+    funcion_str: f(x) del caso (Capítulo 1), para contar evaluaciones
+    verificar: Recibe el resultado y retorna None si es correcto o el motivo
+               de la falla (None: el caso no se verifica)
+    """
+
+    def __init__(self, capitulo, metodo, problema, ejecutar, preparar=None, tamano=None, funcion_str=None,
+                 verificar=None):
+        self.capitulo = capitulo
+        self.metodo = metodo
+        self.problema = problema
+        self.tamano = tamano
+        self.ejecutar = ejecutar
+        self.preparar = preparar or (lambda: ())
+        self.funcion_str = funcion_str
+        self.verificar = verificar
+
+        self.id = f"capitulo{capitulo}/{metodo}/{problema}"
+        if tamano is not None:
+            self.id += f"/n={tamano}"
+
+
+# ===== VERIFICACIÓN DE RESULTADOS =====
+
+def verificar_raiz(raiz):
+    """Verificador de los métodos de raíces: si el método dice converger, su raíz debe ser 'raiz'"""
+    def verificar(resultado):
+        # Sin éxito o al agotar las iteraciones no hay raíz que verificar ('exito' se compara aparte)
+        if not resultado.get('exito') or resultado.get('iteraciones', 0) >= NITER_CAP1:
+            return None
+        error = abs(float(resultado['raiz']) - raiz)
+        if error > TOL_VERIFICACION_RAIZ:
+            return f"raíz {float(resultado['raiz'])!r} a {error:.2e} de la exacta {raiz!r}"
+        return None
+    return verificar
+
+
+def verificar_lote(raiz):
+    """Verificador de resolver_lote: todos los carriles convergen a 'raiz'"""
+    def verificar(resultado):
+        if not resultado.get('exito'):
+            return None
+        convergio = np.asarray(resultado['convergio'], dtype=bool)
+        if not convergio.all():
+            return f"{int((~convergio).sum())} carriles sin converger"
+        error = np.max(np.abs(np.asarray(resultado['raices'], dtype=float) - raiz))
+        if error > TOL_VERIFICACION_RAIZ:
+            return f"raíz a {error:.2e} de la exacta {raiz!r}"
+        return None
+    return verificar
+
+
+def verificar_solucion(exacta):
+    """
+    Verificador de los sistemas lineales: la solución coincide con la exacta
+    (un vector, o una matriz con una columna por lado derecho)
+
+    Los resultados por columna (una lista de resultados) se apilan como columnas.
+    """
+    def verificar(resultado):
+        resultados = resultado if isinstance(resultado, list) else [resultado]
+        if not all(r.get('exito') for r in resultados):
+            return "sin solución"
+        if isinstance(resultado, list):
+            solucion = np.column_stack([r['solucion'] for r in resultados])
+        else:
+            solucion = np.asarray(resultado['solucion'], dtype=float)
+        if solucion.shape != exacta.shape:
+            return f"solución de forma {solucion.shape}, se esperaba {exacta.shape}"
+        error = np.max(np.abs(solucion - exacta)) / np.max(np.abs(exacta))
+        if not error <= TOL_VERIFICACION_SISTEMA:
+            return f"error relativo {error:.2e} contra la solución exacta"
+        return None
+    return verificar
+
+
+def verificar_interpolacion(n, referencia):
+    """
+    Verificador del Capítulo 3: la gráfica (dentro del rango de los datos, fuera
+    es extrapolación) coincide con 'referencia(x, y, t)' sobre puntos_interpolacion(n)
+    y, en los splines, cada segmento detallado pasa por sus dos nodos
+    """
+    def verificar(resultado):
+        if not resultado.get('exito'):
+            return "sin resultado"
+        x, y = puntos_interpolacion(n)
+        escala = max(1.0, np.max(np.abs(y)))
+
+        t = np.asarray(resultado['puntos_grafica']['x'], dtype=float)
+        valores = np.asarray(resultado['puntos_grafica']['y'], dtype=float)
+        dentro = (t >= x[0]) & (t <= x[-1])
+        error = np.max(np.abs(valores[dentro] - referencia(x, y, t[dentro])), initial=0.0)
+        if not error <= TOL_VERIFICACION_INTERPOLACION * escala:
+            return f"gráfica a {error:.2e} de la interpolación de referencia"
+
+        for i, segmento in enumerate(resultado.get('segmentos', [])):
+            extremos = np.polyval(segmento['coeficientes'], segmento['intervalo'])
+            error = np.max(np.abs(extremos - y[i:i + 2]))
+            if not error <= TOL_VERIFICACION_INTERPOLACION * escala:
+                return f"el segmento {i + 1} no pasa por sus nodos (error {error:.2e})"
+        return None
+    return verificar
+
+
+def _casos_capitulo1(perfil):
+    casos = []
+    for nombre, f, (xi, xs), x0, x1, g, raiz in FUNCIONES_CAP1:
+        def caso(metodo, ejecutar):
+            casos.append(Caso(1, metodo, nombre, ejecutar, funcion_str=f, verificar=verificar_raiz(raiz)))
+
+        caso('biseccion', lambda f=f, xi=xi, xs=xs: capitulo1.biseccion(xi, xs, TOL_CAP1, NITER_CAP1, f))
+        caso('regla_falsa', lambda f=f, xi=xi, xs=xs: capitulo1.regla_falsa(xi, xs, TOL_CAP1, NITER_CAP1, f))
+        caso('regla_falsa_illinois',
+             lambda f=f, xi=xi, xs=xs: capitulo1.regla_falsa_illinois(xi, xs, TOL_CAP1, NITER_CAP1, f))
+        caso('brent', lambda f=f, xi=xi, xs=xs: capitulo1.brent(xi, xs, TOL_CAP1, NITER_CAP1, f))
+        caso('newton_raphson', lambda f=f, x0=x0: capitulo1.newton_raphson(x0, TOL_CAP1, NITER_CAP1, f))
+        caso('secante', lambda f=f, x0=x0, x1=x1: capitulo1.secante(x0, x1, TOL_CAP1, NITER_CAP1, f))
+        caso('raices_multiples', lambda f=f, x0=x0: capitulo1.raices_multiples(x0, TOL_CAP1, NITER_CAP1, f))
+        if g is not None:
+            caso('punto_fijo', lambda f=f, g=g, x0=x0: capitulo1.punto_fijo(g, x0, TOL_CAP1, NITER_CAP1, f))
+
+    # Lotes vectorizados: muchos intervalos de la misma función
+    _, f, (xi, xs), _, _, _, raiz = FUNCIONES_CAP1[0]
+    for carriles in CARRILES_LOTE[perfil]:
+        def preparar(carriles=carriles):
+            return np.full(carriles, xi), np.linspace(xs, xs + 1.0, carriles)
+
+        casos.append(Caso(1, 'lote_biseccion', 'cubica',
+                          lambda a, b, f=f: capitulo1.resolver_lote('biseccion', f, TOL_CAP1, NITER_CAP1, xi=a, xs=b),
+                          preparar, carriles, f, verificar_lote(raiz)))
+        casos.append(Caso(1, 'lote_newton', 'cubica',
+                          lambda a, b, f=f: capitulo1.resolver_lote('newton', f, TOL_CAP1, NITER_CAP1, x0=b),
+                          preparar, carriles, f, verificar_lote(raiz)))
+    return casos
+
+
+def sistema_tridiagonal(n):
+    """Sistema denso A x = b con A = tridiag(-1, 4, -1) (diagonalmente dominante) y b = A·1"""
+    A = 4 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+    return A, A @ np.ones(n), np.zeros(n)
+
+
+def sistema_lleno(n):
+    """Sistema denso con todos los coeficientes no nulos: A = 1 + n I (diagonalmente dominante) y b = A·1"""
+    A = np.ones((n, n)) + n * np.eye(n)
+    return A, A @ np.ones(n), np.zeros(n)
+
+
+def solucion_bloque(n):
+    """Solución exacta de los casos con LADOS_DERECHOS lados derechos (una columna por sistema)"""
+    return np.linspace(1.0, 2.0, n * LADOS_DERECHOS).reshape(n, LADOS_DERECHOS)
+
+
+def sistema_tridiagonal_disperso(n):
+    """El mismo sistema de sistema_tridiagonal como MatrizCSR"""
+    i = np.arange(n)
+    filas = np.concatenate([i, i[1:], i[:-1]])
+    columnas = np.concatenate([i, i[:-1], i[1:]])
+    valores = np.concatenate([np.full(n, 4.0), np.full(2 * (n - 1), -1.0)])
+    A = capitulo2.MatrizCSR.desde_coo(filas, columnas, valores, n)
+    return A, A.matvec(np.ones(n)), np.zeros(n)
+
+
+def _casos_capitulo2(perfil):
+    casos = []
+    for n in N_DENSO[perfil]:
+        preparar = lambda n=n: sistema_tridiagonal(n)
+        verificar = verificar_solucion(np.ones(n))
+        casos.append(Caso(2, 'jacobi', 'tridiagonal', lambda A, b, x0: capitulo2.jacobi(A, b, x0, TOL_CAP2, NITER_CAP2),
+                          preparar, n, verificar=verificar))
+        casos.append(Caso(2, 'gauss_seidel', 'tridiagonal',
+                          lambda A, b, x0: capitulo2.gauss_seidel(A, b, x0, TOL_CAP2, NITER_CAP2), preparar, n,
+                          verificar=verificar))
+        casos.append(Caso(2, 'sor', 'tridiagonal', lambda A, b, x0: capitulo2.sor(A, b, x0, TOL_CAP2, NITER_CAP2, W_SOR),
+                          preparar, n, verificar=verificar))
+        for modo in capitulo2.MODOS_W_AUTOMATICO:
+            casos.append(Caso(2, f'sor_w_{modo}', 'tridiagonal',
+                              lambda A, b, x0, modo=modo: capitulo2.sor(A, b, x0, TOL_CAP2, NITER_CAP2, modo),
+                              preparar, n, verificar=verificar))
+
+    # Kernels de barrido de Gauss-Seidel/SOR ('matricial' son los casos de arriba). En la
+    # tridiagonal 'rojo_negro' usa dos colores; en la llena hay n colores (uno por fila)
+    for n in N_DENSO[perfil]:
+        verificar = verificar_solucion(np.ones(n))
+        for problema, sistema in (('tridiagonal', sistema_tridiagonal), ('llena', sistema_lleno)):
+            preparar = lambda n=n, sistema=sistema: sistema(n)
+            kernels = capitulo2.KERNELS_BARRIDO if problema == 'llena' else capitulo2.KERNELS_BARRIDO[1:]
+            for kernel in kernels:
+                casos.append(Caso(2, f'gauss_seidel_{kernel}', problema,
+                                  lambda A, b, x0, kernel=kernel: capitulo2.gauss_seidel(
+                                      A, b, x0, TOL_CAP2, NITER_CAP2, kernel=kernel),
+                                  preparar, n, verificar=verificar))
+                casos.append(Caso(2, f'sor_{kernel}', problema,
+                                  lambda A, b, x0, kernel=kernel: capitulo2.sor(
+                                      A, b, x0, TOL_CAP2, NITER_CAP2, W_SOR, kernel=kernel),
+                                  preparar, n, verificar=verificar))
+
+    # Varios lados derechos: el mismo A contra LADOS_DERECHOS columnas, en bloque y uno por uno
+    for n in N_DENSO[perfil]:
+        def preparar(n=n):
+            A, _, x0 = sistema_tridiagonal(n)
+            return A, A @ solucion_bloque(n), x0
+
+        verificar = verificar_solucion(solucion_bloque(n))
+        casos.append(Caso(2, 'gauss_seidel_bloque', f'tridiagonal_k={LADOS_DERECHOS}',
+                          lambda A, B, x0: capitulo2.gauss_seidel(A, B, x0, TOL_CAP2, NITER_CAP2), preparar, n,
+                          verificar=verificar))
+        if n <= 100:  # Referencia: uno por uno es unas 50 veces más lento
+            casos.append(Caso(2, 'gauss_seidel_por_columna', f'tridiagonal_k={LADOS_DERECHOS}',
+                              lambda A, B, x0: [capitulo2.gauss_seidel(A, b, x0, TOL_CAP2, NITER_CAP2) for b in B.T],
+                              preparar, n, verificar=verificar))
+
+    # Métodos directos: factorización completa y, con la factorización en caché, solo las sustituciones
+    for n in N_DENSO[perfil]:
+        preparar = lambda n=n: sistema_tridiagonal(n)[:2]
+        verificar = verificar_solucion(np.ones(n))
+        for metodo in directos.METODOS_DIRECTOS:
+            casos.append(Caso(2, metodo, 'tridiagonal',
+                              lambda A, b, metodo=metodo: directos.resolver_directo(A, b, metodo, usar_cache=False),
+                              preparar, n, verificar=verificar))
+        casos.append(Caso(2, 'lu_parcial_en_cache', 'tridiagonal',
+                          lambda A, b: directos.resolver_directo(A, b, 'lu_parcial'), preparar, n,
+                          verificar=verificar))
+
+    # Métodos de Krylov, con cada precondicionador
+    for n in N_DENSO[perfil]:
+        preparar = lambda n=n: sistema_tridiagonal(n)
+        verificar = verificar_solucion(np.ones(n))
+        for metodo in capitulo2.METODOS_KRYLOV:
+            for precondicionador in capitulo2.PRECONDICIONADORES:
+                casos.append(Caso(2, f'{metodo}_{precondicionador}', 'tridiagonal',
+                                  lambda A, b, x0, metodo=metodo, precondicionador=precondicionador: capitulo2.krylov(
+                                      A, b, x0, TOL_CAP2, NITER_CAP2, metodo, precondicionador, W_SOR),
+                                  preparar, n, verificar=verificar))
+
+    for n in N_DISPERSO[perfil]:
+        preparar = lambda n=n: sistema_tridiagonal_disperso(n)
+        verificar = verificar_solucion(np.ones(n))
+        for metodo in ('jacobi', 'gauss_seidel', 'sor'):
+            casos.append(Caso(2, f'{metodo}_disperso', 'tridiagonal',
+                              lambda A, b, x0, metodo=metodo: capitulo2.resolver_disperso(
+                                  A, b, x0, TOL_CAP2, NITER_CAP2, metodo, W_SOR),
+                              preparar, n, verificar=verificar))
+    return casos
+
+
+def puntos_interpolacion(n):
+    """n puntos de sin(x) + x/2 en [0, 10] (nodos de Chebyshev para no sufrir el fenómeno de Runge)"""
+    k = np.arange(n)
+    x = np.sort(5 - 5 * np.cos((2 * k + 1) * np.pi / (2 * n)))
+    return x, np.sin(x) + x / 2
+
+
+def interpolante_referencia(x, y, t):
+    """
+    Polinomio interpolante evaluado en t con la fórmula baricéntrica (estable en
+    los nodos de Chebyshev); los pesos se escalan por 4/(b - a) para no desbordar
+    """
+    escala = 4 / (x[-1] - x[0])
+    diferencias = (x[:, None] - x[None, :]) * escala
+    np.fill_diagonal(diferencias, 1.0)
+    pesos = 1 / np.prod(diferencias, axis=1)
+
+    distancias = t[:, None] - x[None, :]
+    fila, nodo = np.nonzero(distancias == 0)
+    distancias[fila, nodo] = 1.0
+    terminos = pesos / distancias
+    valores = (terminos @ y) / terminos.sum(axis=1)
+    valores[fila] = y[nodo]
+    return valores
+
+
+def spline_lineal_referencia(x, y, t):
+    """Spline lineal evaluado en t"""
+    return np.interp(t, x, y)
+
+
+def spline_cubico_referencia(x, y, t):
+    """
+    Spline cúbico natural evaluado en t, con su propio algoritmo de Thomas (en
+    Python puro, independiente de capitulo3) para las segundas derivadas M
+    """
+    n = len(x)
+    h = np.diff(x)
+    d = (6 * np.diff(np.diff(y) / h)).tolist()
+    inferior, diagonal, superior = h[:-1].tolist(), (2 * (h[:-1] + h[1:])).tolist(), h[1:].tolist()
+
+    # Eliminación hacia adelante y sustitución hacia atrás sobre los n - 2 nodos interiores
+    for i in range(1, n - 2):
+        factor = inferior[i] / diagonal[i - 1]
+        diagonal[i] -= factor * superior[i - 1]
+        d[i] -= factor * d[i - 1]
+    M = [0.0] * n
+    for i in range(n - 3, -1, -1):
+        M[i + 1] = (d[i] - superior[i] * M[i + 2]) / diagonal[i]
+    M = np.array(M)
+
+    k = np.clip(np.searchsorted(x, t, side='right') - 1, 0, n - 2)
+    izquierda, derecha, hk = x[k + 1] - t, t - x[k], h[k]
+    return (M[k] * izquierda ** 3 / (6 * hk) + M[k + 1] * derecha ** 3 / (6 * hk)
+            + (y[k] / hk - M[k] * hk / 6) * izquierda + (y[k + 1] / hk - M[k + 1] * hk / 6) * derecha)
+
+
+def _casos_capitulo3(perfil):
+    casos = []
+    polinomiales = [
+        ('vandermonde', capitulo3.vandermonde),
+        ('newton_interpolante', capitulo3.newton_interpolante),
+        ('lagrange', capitulo3.lagrange),
+        ('lagrange_baricentrico', capitulo3.lagrange_baricentrico),
+    ]
+    for n in PUNTOS_POLINOMIALES[perfil]:
+        preparar = lambda n=n: puntos_interpolacion(n)
+        for nombre, metodo in polinomiales:
+            verificar = (verificar_interpolacion(n, interpolante_referencia)
+                         if n <= MAX_PUNTOS_VERIFICADOS.get(nombre, n) else None)
+            casos.append(Caso(3, nombre, 'seno', metodo, preparar, n, verificar=verificar))
+
+    for n in PUNTOS_SPLINES[perfil]:
+        preparar = lambda n=n: puntos_interpolacion(n)
+        casos.append(Caso(3, 'spline_lineal', 'seno', capitulo3.spline_lineal, preparar, n,
+                          verificar=verificar_interpolacion(n, spline_lineal_referencia)))
+        casos.append(Caso(3, 'spline_cubico', 'seno', capitulo3.spline_cubico, preparar, n,
+                          verificar=verificar_interpolacion(n, spline_cubico_referencia)))
+    return casos
+
+
+def obtener_casos(perfil='rapido'):
+    """Lista de todos los casos del perfil, en orden de capítulo"""
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil '{perfil}' no reconocido. Opciones: {', '.join(PERFILES)}")
+    return _casos_capitulo1(perfil) + _casos_capitulo2(perfil) + _casos_capitulo3(perfil)
@@ -0,0 +1,294 @@
+"""
+Benchmarks de los métodos numéricos
+
+Uso:
+    python benchmarks/ejecutar.py correr [--perfil rapido|completo] [--repeticiones 5]
+                                         [--filtro capitulo2] [--salida resultados.json]
+    python benchmarks/ejecutar.py comparar base.json nuevo.json [--umbral 0.10]
+
+'correr' mide cada caso de casos.py y guarda en JSON, por caso: tiempos de
+pared (mínimo y mediana de las repeticiones, después de una ejecución de
+calentamiento), iteraciones, evaluaciones de f(x) y memoria pico (tracemalloc,
+en una ejecución aparte para que no afecte los tiempos). El resultado del
+calentamiento se verifica contra la solución exacta o una implementación de
+referencia; si algún caso falla la verificación sale con código 1.
+
+'comparar' cruza dos archivos de resultados por id de caso y reporta las
+regresiones de tiempo (mínimo) y de memoria mayores que el umbral relativo,
+los casos que fallan la verificación y los cambios en el número de iteraciones. Sale con código 1 si hay
+regresiones, para poder usarlo en integración continua.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import sympy
+
+from casos import PERFILES, capitulo1, obtener_casos
+
+
+VERSION_FORMATO = 1
+
+# Diferencias de tiempo menores que esto (segundos) se consideran ruido al comparar
+TIEMPO_MINIMO_REGRESION = 1e-3
+
+
+# ===== MEDICIÓN =====
+
+class _Contador:
+    """Envuelve una función compilada y suma los puntos en que se evalúa"""
+
+    def __init__(self, funcion):
+        self.funcion = funcion
+        self.evaluaciones = 0
+
+    def __call__(self, x):
+        self.evaluaciones += int(np.size(x))
+        return self.funcion(x)
+
+
+@contextmanager
+def contar_evaluaciones(funcion_str):
+    """
+    Cuenta las evaluaciones de f(x) y de sus derivadas durante el bloque
+
+    Reemplaza temporalmente las funciones compiladas de la entrada del caché
+    de expresiones del Capítulo 1 (que es la que usan todos los métodos).
+    Produce una lista que al salir contiene [evaluaciones de f, de f', de f''].
+    """
+    entrada = capitulo1.obtener_expresion(funcion_str, derivadas=2)
+    originales = (entrada.f, dict(entrada.derivadas))
+    contadores = [_Contador(entrada.f)] + [_Contador(entrada.derivadas[orden][1]) for orden in (1, 2)]
+
+    entrada.f = contadores[0]
+    for orden in (1, 2):
+        entrada.derivadas[orden] = (entrada.derivadas[orden][0], contadores[orden])
+
+    conteo = []
+    try:
+        yield conteo
+    finally:
+        entrada.f, entrada.derivadas = originales[0], originales[1]
+        conteo.extend(contador.evaluaciones for contador in contadores)
+
+
+def _iteraciones(resultado):
+    """Iteraciones del resultado (en los lotes, la suma de las de cada carril)"""
+    iteraciones = resultado.get('iteraciones') if isinstance(resultado, dict) else None
+    if isinstance(iteraciones, list):
+        return int(sum(iteraciones))
+    return iteraciones
+
+
+def medir(caso, repeticiones=5):
+    """
+    Mide un caso
+
+    Retorna: dict con la descripción del caso y sus métricas
+    """
+    args = caso.preparar()
+
+    # Calentamiento: compila las expresiones y carga lo que haga falta de numpy
+    resultado = caso.ejecutar(*args)
+    falla_verificacion = caso.verificar(resultado) if caso.verificar else None
+
+    tiempos = []
+    for _ in range(repeticiones):
+        args = caso.preparar()
+        inicio = time.perf_counter()
+        caso.ejecutar(*args)
+        tiempos.append(time.perf_counter() - inicio)
+
+    # Memoria pico y evaluaciones en una ejecución aparte (tracemalloc la hace más lenta)
+    args = caso.preparar()
+    evaluaciones = None
+    tracemalloc.start()
+    try:
+        if caso.funcion_str is not None:
+            with contar_evaluaciones(caso.funcion_str) as conteo:
+                caso.ejecutar(*args)
+            evaluaciones = {"f": conteo[0], "df": conteo[1], "d2f": conteo[2], "total": sum(conteo)}
+        else:
+            caso.ejecutar(*args)
+        _, memoria_pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "id": caso.id,
+        "capitulo": caso.capitulo,
+        "metodo": caso.metodo,
+        "problema": caso.problema,
+        "tamano": caso.tamano,
+        "exito": bool(resultado.get('exito')) if isinstance(resultado, dict) else None,
+        "verificado": falla_verificacion is None if caso.verificar else None,
+        "falla_verificacion": falla_verificacion,
+        "iteraciones": _iteraciones(resultado),
+        "evaluaciones": evaluaciones,
+        "tiempo_min": min(tiempos),
+        "tiempo_mediana": statistics.median(tiempos),
+        "tiempos": tiempos,
+        "memoria_pico": memoria_pico
+    }
+
+
+def entorno():
+    """Versiones y máquina en que se corrieron los benchmarks"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sympy": sympy.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def correr(perfil='rapido', repeticiones=5, filtro=None, salida=None):
+    """Corre los casos del perfil (los que contienen 'filtro' en su id) y guarda los resultados"""
+    casos = [caso for caso in obtener_casos(perfil) if not filtro or filtro in caso.id]
+    print(f"Perfil '{perfil}': {len(casos)} casos, {repeticiones} repeticiones")
+
+    resultados = []
+    for numero, caso in enumerate(casos, 1):
+        medicion = medir(caso, repeticiones)
+        resultados.append(medicion)
+        iteraciones = medicion['iteraciones'] if medicion['iteraciones'] is not None else '-'
+        falla = f"  [FALLA VERIFICACION: {medicion['falla_verificacion']}]" if medicion['verificado'] is False else ""
+        print(f"[{numero}/{len(casos)}] {caso.id:<55} {medicion['tiempo_min'] * 1e3:10.3f} ms"
+              f"  iter: {iteraciones:<8} memoria: {medicion['memoria_pico'] / 1024:10.1f} KiB{falla}")
+
+    datos = {
+        "version": VERSION_FORMATO,
+        "fecha": datetime.now().isoformat(timespec='seconds'),
+        "perfil": perfil,
+        "repeticiones": repeticiones,
+        "entorno": entorno(),
+        "resultados": resultados
+    }
+
+    if salida is None:
+        salida = f"benchmarks/resultados/{datetime.now():%Y%m%d-%H%M%S}-{perfil}.json"
+    directorio = os.path.dirname(salida)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as archivo:
+        json.dump(datos, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {salida}")
+
+    fallas = [medicion['id'] for medicion in resultados if medicion['verificado'] is False]
+    if fallas:
+        print(f"{len(fallas)} casos fallaron la verificación: {', '.join(fallas)}")
+    return datos
+
+
+# ===== COMPARACIÓN =====
+
+def comparar(base, nuevo, umbral=0.10):
+    """
+    Compara dos conjuntos de resultados (dicts como los que guarda 'correr')
+
+    Retorna: lista de dicts por caso común con 'id', 'razon_tiempo',
+    'razon_memoria', 'iteraciones' (base, nuevo) y 'regresion' (lista de
+    motivos; vacía si no hay regresión)
+    """
+    por_id = {medicion['id']: medicion for medicion in base['resultados']}
+    comparacion = []
+
+    for medicion in nuevo['resultados']:
+        anterior = por_id.get(medicion['id'])
+        if anterior is None:
+            continue
+
+        razon_tiempo = medicion['tiempo_min'] / anterior['tiempo_min'] if anterior['tiempo_min'] > 0 else None
+        razon_memoria = (medicion['memoria_pico'] / anterior['memoria_pico']
+                         if anterior['memoria_pico'] > 0 else None)
+
+        regresion = []
+        if (razon_tiempo is not None and razon_tiempo > 1 + umbral
+                and medicion['tiempo_min'] - anterior['tiempo_min'] > TIEMPO_MINIMO_REGRESION):
+            regresion.append('tiempo')
+        if razon_memoria is not None and razon_memoria > 1 + umbral:
+            regresion.append('memoria')
+        if anterior['exito'] and not medicion['exito']:
+            regresion.append('exito')
+        if medicion.get('verificado') is False:
+            regresion.append('verificacion')
+
+        comparacion.append({
+            "id": medicion['id'],
+            "tiempo_base": anterior['tiempo_min'],
+            "tiempo_nuevo": medicion['tiempo_min'],
+            "razon_tiempo": razon_tiempo,
+            "razon_memoria": razon_memoria,
+            "iteraciones": (anterior['iteraciones'], medicion['iteraciones']),
+            "regresion": regresion
+        })
+
+    return comparacion
+
+
+def _cargar(ruta):
+    with open(ruta, encoding='utf-8') as archivo:
+        datos = json.load(archivo)
+    if datos.get('version') != VERSION_FORMATO:
+        raise ValueError(f"{ruta}: versión de formato {datos.get('version')} no soportada")
+    return datos
+
+
+def imprimir_comparacion(comparacion, umbral):
+    print(f"{'caso':<55} {'base (ms)':>10} {'nuevo (ms)':>10} {'tiempo':>8} {'memoria':>8}  iteraciones")
+    for fila in comparacion:
+        razon_tiempo = f"{fila['razon_tiempo']:.2f}x" if fila['razon_tiempo'] is not None else '-'
+        razon_memoria = f"{fila['razon_memoria']:.2f}x" if fila['razon_memoria'] is not None else '-'
+        base_iter, nuevo_iter = fila['iteraciones']
+        iteraciones = str(nuevo_iter) if base_iter == nuevo_iter else f"{base_iter} -> {nuevo_iter}"
+        marca = f"  [REGRESION: {', '.join(fila['regresion'])}]" if fila['regresion'] else ""
+        print(f"{fila['id']:<55} {fila['tiempo_base'] * 1e3:10.3f} {fila['tiempo_nuevo'] * 1e3:10.3f} "
+              f"{razon_tiempo:>8} {razon_memoria:>8}  {iteraciones}{marca}")
+
+    regresiones = [fila for fila in comparacion if fila['regresion']]
+    print(f"\n{len(comparacion)} casos comparados, {len(regresiones)} con regresión (umbral {umbral:.0%})")
+    return regresiones
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los métodos numéricos")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    parser_correr = subcomandos.add_parser('correr', help="Mide los casos y guarda los resultados en JSON")
+    parser_correr.add_argument('--perfil', choices=PERFILES, default='rapido')
+    parser_correr.add_argument('--repeticiones', type=int, default=5)
+    parser_correr.add_argument('--filtro', help="Solo los casos cuyo id contiene este texto")
+    parser_correr.add_argument('--salida', help="Archivo JSON de resultados")
+
+    parser_comparar = subcomandos.add_parser('comparar', help="Compara dos archivos de resultados")
+    parser_comparar.add_argument('base')
+    parser_comparar.add_argument('nuevo')
+    parser_comparar.add_argument('--umbral', type=float, default=0.10,
+                                 help="Aumento relativo que cuenta como regresión (0.10 = 10%%)")
+
+    args = parser.parse_args(argumentos)
+
+    if args.comando == 'correr':
+        if args.repeticiones < 1:
+            parser.error("--repeticiones debe ser al menos 1")
+        datos = correr(args.perfil, args.repeticiones, args.filtro, args.salida)
+        return 1 if any(medicion['verificado'] is False for medicion in datos['resultados']) else 0
+
+    comparacion = comparar(_cargar(args.base), _cargar(args.nuevo), args.umbral)
+    regresiones = imprimir_comparacion(comparacion, args.umbral)
+    return 1 if regresiones else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())